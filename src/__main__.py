@@ -0,0 +1,171 @@
+"""
+One entry point for the whole pipeline:
+
+    python -m src <command> [options]
+    python -m src --profile-imports features
+
+Only the command's own modules are imported (pandas, xgboost, mlflow, ...
+load when a command needs them), so `--help` or an ingest never pays for
+the model stack.
+"""
+import os
+import sys
+import time
+import argparse
+import builtins
+import importlib
+
+# Path magic (python -m src from anywhere inside the repo)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+CLI_START = time.perf_counter()
+
+class ImportProfiler:
+    """
+    Times every import while active, charged to its top-level package.
+    Each package gets its SELF time (nested imports of other packages are
+    charged to those), so the numbers add up to the total import time.
+    """
+    def __init__(self):
+        self.times = {}
+        self.stack = []  # [package, nested time of other packages]
+        self.original = None
+
+    def __enter__(self):
+        self.original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self.original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        package = name.partition('.')[0]
+        # Cached, relative, or inside the same package: nothing new to charge
+        if level or name in sys.modules or (self.stack and self.stack[-1][0] == package):
+            return self.original(name, globals, locals, fromlist, level)
+
+        self.stack.append([package, 0.0])
+        start = time.perf_counter()
+        try:
+            return self.original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            _, nested = self.stack.pop()
+            self.times[package] = self.times.get(package, 0.0) + elapsed - nested
+            if self.stack:
+                self.stack[-1][1] += elapsed
+
+    def report(self, command, total, top=12):
+        # importlib.import_module bypasses __import__: the command modules' own code is what's left
+        self.times['src'] = self.times.get('src', 0.0) + max(0.0, total - sum(self.times.values()))
+        print(f"⏱️  Import profile for '{command}': {total:.3f}s importing, "
+              f"ready {time.perf_counter() - CLI_START:.3f}s after the CLI started")
+        for package, seconds in sorted(self.times.items(), key=lambda item: -item[1])[:top]:
+            print(f"   {seconds:8.3f}s  {package}")
+
+# --- COMMANDS ---
+# name -> (modules to import, runner(args, *modules), help). Modules are imported
+# only for the chosen command, in this order.
+
+def _ingest(args, wnba_loader, unrivaled_loader):
+    if args.source in ('all', 'wnba'):
+        wnba_loader.main()
+    if args.source in ('all', 'unrivaled'):
+        unrivaled_loader.fetch_unrivaled_stats()
+
+def _features(args, build_features):
+    build_features.engineer_features(incremental=False if args.full else None,
+                                     streaming=True if args.streaming else None)
+
+def _train(args, config, train):
+    if args.components:
+        config.COMPONENT_MODELS = True
+    if config.COMPONENT_MODELS:
+        train.train_component_models()
+    else:
+        train.train_model()
+
+def _tune(args, config, tune):
+    if args.strategy:
+        config.TUNE_STRATEGY = args.strategy
+    tune.tune_hyperparameters()
+
+# Scripts with their own argparse: everything after the command is theirs
+PASSTHROUGH = ['pipeline', 'bench']
+
+def _passthrough(main):
+    def run(args, module):
+        sys.argv = [f"python -m src {args.command}"] + args.args
+        getattr(module, main)()
+    return run
+
+COMMANDS = {
+    'ingest': (['src.data.wnba_loader', 'src.data.unrivaled_loader'], _ingest,
+               "Download WNBA gamelogs and scrape Unrivaled stats"),
+    'process': (['src.data.process_unrivaled'], lambda args, m: m.process_unrivaled(),
+                "Clean the raw Unrivaled stats"),
+    'merge': (['src.data.merge_players'], lambda args, m: m.create_player_map(),
+              "Resolve Unrivaled players to WNBA player IDs"),
+    'features': (['src.features.build_features'], _features,
+                 "Build the Golden Table (incremental when possible)"),
+    'baseline': (['src.models.evaluate_baseline'], lambda args, m: m.evaluate_baselines(),
+                 "Score the naive baselines"),
+    'train': (['src.config', 'src.models.train'], _train,
+              "Train the production model (or the per-stat component models)"),
+    'tune': (['src.config', 'src.models.tune'], _tune,
+             "Hyperparameter search"),
+    'backtest': (['src.models.backtest'], lambda args, m: m.backtest(),
+                 "Walk-forward backtest"),
+    'serve': (['src.models.serve'], lambda args, m: m.serve(args.host, args.port),
+              "Start the prediction server"),
+    'pipeline': (['src.pipeline'], _passthrough('main'),
+                 "Run the cached stage DAG (options after the command go to src/pipeline.py)"),
+    'bench': (['src.benchmarks.run_benchmarks'], _passthrough('main'),
+              "Benchmarks on synthetic data (options go to run_benchmarks.py)"),
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src", description="WNBA fantasy pipeline.")
+    parser.add_argument('--profile-imports', action='store_true',
+                        help="Report how long the command's imports take (per package) before it runs")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+    subparsers = {
+        name: commands.add_parser(name, help=help_text, add_help=name not in PASSTHROUGH)
+        for name, (_, _, help_text) in COMMANDS.items()
+    }
+
+    subparsers['ingest'].add_argument('--source', choices=['all', 'wnba', 'unrivaled'], default='all')
+    subparsers['features'].add_argument('--full', action='store_true', help="Force a full rebuild")
+    subparsers['features'].add_argument('--streaming', action='store_true',
+                                        help="Out-of-core full rebuild (same as WNBA_STREAMING_FEATURES=1)")
+    subparsers['train'].add_argument('--components', action='store_true',
+                                     help="Per-stat component models (same as WNBA_COMPONENT_MODELS=1)")
+    subparsers['tune'].add_argument('--strategy', choices=['grid', 'halving', 'tpe'], help="Overrides TUNE_STRATEGY")
+    subparsers['serve'].add_argument('--host', default=None)
+    subparsers['serve'].add_argument('--port', type=int, default=None)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command in PASSTHROUGH:
+        args.args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    module_names, run, _ = COMMANDS[args.command]
+
+    start_time = time.perf_counter()
+    if args.profile_imports:
+        with ImportProfiler() as profiler:
+            modules = [importlib.import_module(name) for name in module_names]
+        profiler.report(args.command, time.perf_counter() - start_time)
+    else:
+        modules = [importlib.import_module(name) for name in module_names]
+
+    run(args, *modules)
+
+if __name__ == "__main__":
+    main()
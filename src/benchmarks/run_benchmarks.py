@@ -0,0 +1,261 @@
+import os
+import sys
+import io
+import gc
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+from datetime import datetime
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.benchmarks.synthetic import write_synthetic_data, league_shape
+
+# Stages in pipeline order. Each one is timed on its own.
+STAGES = ['features', 'player_map', 'baselines', 'fit', 'predict']
+
+# Differences below this are timer noise, never a regression
+NOISE_FLOOR_S = 0.05
+
+def point_config_at(workdir):
+    """Sends every path the pipeline reads or writes into `workdir`, so a run never touches real data."""
+    workdir = Path(workdir)
+    config.RAW_DATA_DIR = workdir / "raw"
+    config.PROCESSED_DATA_DIR = workdir / "processed"
+    config.MODEL_DIR = workdir / "models"
+    config.SERVE_MODEL_PATH = config.MODEL_DIR / "xgb_latest.ubj"
+    config.MERGE_UNRIVALED_SOURCE = config.PROCESSED_DATA_DIR / "unrivaled_processed.parquet"
+    config.PLAYER_MAP_OUTPUT = config.PROCESSED_DATA_DIR / "player_mapping.parquet"
+    config.PLAYER_RESOLUTION_STORE = config.PROCESSED_DATA_DIR / "player_resolution_store.json"
+    # No hand overrides: the synthetic names would only produce lookup errors
+    config.MANUAL_OVERRIDES_PATH = workdir / "manual_overrides.yml"
+    config.STAGE_LOG_PATH = workdir / "logs" / "stages.jsonl"
+
+def measure(fn, repeats=1, memory=True):
+    """
+    Runs fn() `repeats` times and keeps the fastest run's wall/CPU time.
+    With memory=True, one extra run under tracemalloc records the peak of
+    Python + NumPy allocations (native XGBoost buffers aren't traced).
+    Returns (stats, result of the last timed run).
+    """
+    walls, cpus = [], []
+    for _ in range(repeats):
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = fn()
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.process_time() - cpu_start)
+
+    best = walls.index(min(walls))
+    stats = {'wall_s': walls[best], 'cpu_s': cpus[best], 'wall_runs_s': walls}
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            stats['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return stats, result
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _quiet(fn, verbose):
+    """fn with the pipeline's own status lines silenced (they'd drown the benchmark table)."""
+    if verbose:
+        return fn
+    def run():
+        with redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+def run_benchmarks(seasons=None, scale=None, repeats=None, stages=None, memory=True, seed=42, verbose=False):
+    """
+    Generates a synthetic league in a temp dir and benchmarks each pipeline
+    stage on it. Returns the results dict (meta + one entry per stage).
+    """
+    # Imported after the config is redirected, like a fresh pipeline process
+    from src.features.build_features import engineer_features
+    from src.data.merge_players import create_player_map
+    from src.models.evaluate_baseline import baseline_test_set, score_baselines
+    from src.models.dataset import load_training_data, native_params
+    import xgboost as xgb
+
+    seasons = seasons or config.BENCHMARK_SEASONS
+    scale = scale or config.BENCHMARK_SCALE
+    repeats = repeats or config.BENCHMARK_REPEATS
+    stages = stages or STAGES
+
+    workdir = tempfile.mkdtemp(prefix="wnba_bench_")
+    point_config_at(workdir)
+    try:
+        # 1. Synthetic data (not timed)
+        print(f"🧪 Generating {seasons} season(s) of a {league_shape(scale)}-team league (scale {scale:g}x)...")
+        gamelogs = write_synthetic_data(seasons, scale, seed)
+        print(f"   -> {len(gamelogs)} gamelog rows in {workdir}")
+
+        results = {
+            'meta': {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'git_commit': _git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'seasons': seasons,
+                'scale': scale,
+                'seed': seed,
+                'repeats': repeats,
+                'gamelog_rows': len(gamelogs),
+            },
+            'stages': {},
+        }
+
+        def record(name, fn, rows):
+            if name not in stages:
+                return None
+            print(f"⏱️ {name}...")
+            stats, result = measure(_quiet(fn, verbose), repeats, memory)
+            stats['rows'] = rows
+            stats['rows_per_s'] = rows / stats['wall_s'] if stats['wall_s'] else None
+            results['stages'][name] = stats
+            return result
+
+        # 2. Feature build (always a full rebuild, so every repeat does the same work)
+        build = lambda: engineer_features(incremental=False)
+        if 'features' in stages:
+            record('features', build, len(gamelogs))
+        elif {'baselines', 'fit', 'predict'} & set(stages):
+            _quiet(build, verbose)()
+
+        # 3. Entity resolution, cold: the decision store is wiped before every run
+        def player_map():
+            if os.path.exists(config.PLAYER_RESOLUTION_STORE):
+                os.remove(config.PLAYER_RESOLUTION_STORE)
+            create_player_map()
+        config.MERGE_WNBA_SEASON = gamelogs['season_id'].max()
+        record('player_map', player_map, int(len(gamelogs[gamelogs['season_id'] == config.MERGE_WNBA_SEASON])))
+
+        # 4. Baselines (feature store load + baseline predictions + scoring, no MLflow)
+        record('baselines', lambda: score_baselines(baseline_test_set()), len(gamelogs))
+
+        # 5. Model fit + predict on the same matrix and split train.py uses (no MLflow)
+        if {'fit', 'predict'} & set(stages):
+            data = _quiet(load_training_data, verbose)()
+            params = config.MODEL_PARAMS
+            fit = lambda: xgb.train(native_params(params), data.dmatrix(0, data.split_idx, label=data.y),
+                                    num_boost_round=params['n_estimators'])
+            model = record('fit', fit, data.split_idx) if 'fit' in stages else fit()
+            record('predict', lambda: model.inplace_predict(data.X_test), len(data.X_test))
+
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def compare_to_baseline(results, baseline, tolerance=None):
+    """
+    Stage-by-stage ratios against a stored run. A stage regresses when its
+    wall time or traced peak memory grows by more than `tolerance`.
+    Returns a list of {'stage', 'metric', 'baseline', 'current', 'ratio', 'regressed'}.
+    """
+    tolerance = config.BENCHMARK_REGRESSION_TOLERANCE if tolerance is None else tolerance
+    rows = []
+    for stage, current in results['stages'].items():
+        reference = baseline['stages'].get(stage)
+        if reference is None:
+            continue
+        for metric, noise in (('wall_s', NOISE_FLOOR_S), ('peak_mb', 1.0)):
+            if metric not in current or metric not in reference:
+                continue
+            ratio = current[metric] / reference[metric] if reference[metric] else float('inf')
+            regressed = ratio > 1 + tolerance and current[metric] - reference[metric] > noise
+            rows.append({
+                'stage': stage, 'metric': metric,
+                'baseline': reference[metric], 'current': current[metric],
+                'ratio': ratio, 'regressed': regressed,
+            })
+    return rows
+
+def baseline_path(seasons, scale):
+    return config.BENCHMARK_DIR / f"baseline_{seasons}s_{scale:g}x.json"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic gamelogs.")
+    parser.add_argument('--seasons', type=int, default=config.BENCHMARK_SEASONS)
+    parser.add_argument('--scale', type=float, default=config.BENCHMARK_SCALE,
+                        help="League size as a multiple of the WNBA's (1 = 12 teams, 100 = 1200)")
+    parser.add_argument('--repeats', type=int, default=config.BENCHMARK_REPEATS)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, help="Results JSON (default: BENCHMARK_DIR/results_<seasons>s_<scale>x.json)")
+    parser.add_argument('--baseline', type=Path, help="Baseline JSON to compare against (default: the matching stored baseline)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline for its size")
+    parser.add_argument('--tolerance', type=float, default=config.BENCHMARK_REGRESSION_TOLERANCE)
+    parser.add_argument('--verbose', action='store_true', help="Keep the pipeline's own output")
+    args = parser.parse_args()
+
+    print("🏁 Starting WNBA Pipeline Benchmarks...")
+    benchmark_dir = config.BENCHMARK_DIR
+    results = run_benchmarks(args.seasons, args.scale, args.repeats, args.stages,
+                             memory=not args.no_memory, seed=args.seed, verbose=args.verbose)
+
+    # 1. Results table + JSON
+    print("-" * 30)
+    for stage, stats in results['stages'].items():
+        peak = f" | peak {stats['peak_mb']:.1f} MB" if 'peak_mb' in stats else ""
+        print(f"📊 {stage:<11} {stats['wall_s']:8.3f}s wall | {stats['cpu_s']:8.3f}s CPU | "
+              f"{stats['rows_per_s'] or 0:,.0f} rows/s{peak}")
+
+    os.makedirs(benchmark_dir, exist_ok=True)
+    output = args.output or benchmark_dir / f"results_{args.seasons}s_{args.scale:g}x.json"
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    stored = baseline_path(args.seasons, args.scale)
+    if args.save_baseline:
+        with open(stored, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"📌 Saved as the baseline: {stored}")
+        return
+
+    # 2. Compare against the stored baseline for this size
+    reference = args.baseline or stored
+    if not os.path.exists(reference):
+        print(f"ℹ️ No baseline at {reference}. Run with --save-baseline to store one.")
+        return
+    with open(reference, 'r') as file:
+        baseline = json.load(file)
+
+    print("-" * 30)
+    comparison = compare_to_baseline(results, baseline, args.tolerance)
+    for row in comparison:
+        flag = "❌" if row['regressed'] else "✅"
+        print(f"{flag} {row['stage']:<11} {row['metric']:<8} {row['baseline']:10.3f} -> {row['current']:10.3f} ({row['ratio']:.2f}x)")
+
+    regressions = [row for row in comparison if row['regressed']]
+    if regressions:
+        print(f"🚨 {len(regressions)} regression(s) beyond {args.tolerance:.0%} vs {reference} "
+              f"(baseline commit {baseline['meta'].get('git_commit')}).")
+        sys.exit(1)
+    print(f"✅ No regressions vs {reference}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import os
+import sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+
+# One "league" = today's WNBA shape: 12 teams, ~40 games each, 12-player rosters
+LEAGUE_TEAMS = 12
+GAMES_PER_SEASON = 40
+ROSTER_SIZE = 12
+DNP_RATE = 0.12          # Share of rostered players sitting out any given game
+ROSTER_TURNOVER = 2      # Roster slots that go to a new player every season
+
+FIRST_NAMES = [
+    'Aja', 'Breanna', 'Caitlin', 'Diana', 'Elena', 'Fran', 'Gabby', 'Haley', 'Isabelle', 'Jackie',
+    'Kelsey', 'Layshia', 'Maya', 'Napheesa', 'Odyssey', 'Paige', 'Queen', 'Rhyne', 'Sabrina', 'Tina',
+    'Ubah', 'Veronica', 'Whitney', 'Xia', 'Yvonne', 'Zia', 'Alyssa', 'Brittney', 'Chelsea', 'DeWanna',
+]
+SURNAME_SYLLABLES = [
+    'al', 'bar', 'cor', 'dan', 'el', 'fer', 'gor', 'han', 'is', 'jen', 'kal', 'lor', 'man', 'nel',
+    'or', 'per', 'quin', 'ros', 'sal', 'ter', 'ul', 'van', 'wil', 'yor', 'zan', 'ber', 'cas', 'don',
+]
+ACCENTS = {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú'}
+
+def player_name(index):
+    """Deterministic, unique 'First Surname' for a player index (mixed-radix over the name parts)."""
+    n_syl = len(SURNAME_SYLLABLES)
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    index //= len(FIRST_NAMES)
+    syllables = [SURNAME_SYLLABLES[index % n_syl], SURNAME_SYLLABLES[(index // n_syl) % n_syl]]
+    index //= n_syl * n_syl
+    while index:
+        syllables.append(SURNAME_SYLLABLES[index % n_syl])
+        index //= n_syl
+    return f"{first} {''.join(syllables).capitalize()}"
+
+def league_shape(scale=1):
+    """Teams in a league `scale` times the WNBA's size (always even, so every team plays each game-day)."""
+    n_teams = max(2, int(round(LEAGUE_TEAMS * scale)))
+    return n_teams + n_teams % 2
+
+def _season_schedule(rng, n_teams, games):
+    """
+    Every team plays once per game-day: a random pairing per day.
+    Returns (day, home team, away team) arrays, one entry per game.
+    """
+    pairings = np.argsort(rng.random((games, n_teams)), axis=1)
+    home = pairings[:, 0::2].ravel()
+    away = pairings[:, 1::2].ravel()
+    day = np.repeat(np.arange(games), n_teams // 2)
+    return day, home, away
+
+def generate_gamelogs(seasons=1, scale=1, seed=42, first_season=2021):
+    """
+    Synthetic gamelogs with the LeagueGameLog schema (plus the loader's
+    scraped_at/season_id columns): `seasons` seasons of a league `scale`
+    times the WNBA's size. Box scores are internally consistent
+    (PTS = 2*FGM + FG3M + FTM, REB = OREB + DREB) and players carry their
+    own skill level across games, so the rolling features have signal.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = league_shape(scale)
+    team_ids = 1611661300 + np.arange(n_teams)
+    abbreviations = np.array([f"T{i:0{len(str(n_teams))}d}" for i in range(n_teams)])
+
+    # Player index per (season, team, slot): most of a roster carries over,
+    # the last ROSTER_TURNOVER slots get new players every season
+    slots = np.arange(ROSTER_SIZE)
+    veteran = slots < ROSTER_SIZE - ROSTER_TURNOVER
+    n_players = n_teams * ROSTER_SIZE + seasons * n_teams * ROSTER_TURNOVER
+    skill = rng.gamma(4.0, 2.5, n_players)            # ~10 points per 30 minutes on average
+    minutes = rng.uniform(8, 34, n_players)
+    names = np.array([player_name(p) for p in range(n_players)])
+
+    frames = []
+    game_counter = 0
+    for s in range(seasons):
+        year = first_season + s
+        day, home, away = _season_schedule(rng, n_teams, GAMES_PER_SEASON)
+        n_games = len(day)
+        season_start = np.datetime64(f"{year}-05-15")
+        game_dates = season_start + (day * 3 + rng.integers(0, 2, n_games)).astype('timedelta64[D]')
+        game_ids = np.array([f"10{year % 100:02d}{game_counter + g:06d}" for g in range(n_games)])
+        game_counter += n_games
+        home_wins = rng.random(n_games) < 0.55
+
+        # Two team-games per game, then ROSTER_SIZE player rows per team-game
+        team = np.concatenate([home, away])
+        opp = np.concatenate([away, home])
+        is_home = np.repeat([True, False], n_games)
+        win = np.concatenate([home_wins, ~home_wins])
+        game = np.tile(np.arange(n_games), 2)
+
+        team = np.repeat(team, ROSTER_SIZE)
+        opp = np.repeat(opp, ROSTER_SIZE)
+        is_home = np.repeat(is_home, ROSTER_SIZE)
+        win = np.repeat(win, ROSTER_SIZE)
+        game = np.repeat(game, ROSTER_SIZE)
+        slot = np.tile(slots, 2 * n_games)
+        rookie_base = n_teams * ROSTER_SIZE + s * n_teams * ROSTER_TURNOVER
+        player = np.where(veteran[slot], team * ROSTER_SIZE + slot,
+                          rookie_base + team * ROSTER_TURNOVER + (slot - (ROSTER_SIZE - ROSTER_TURNOVER)))
+
+        played = rng.random(len(player)) >= DNP_RATE
+        team, opp, is_home, win, game, player = (a[played] for a in (team, opp, is_home, win, game, player))
+        n = len(player)
+
+        # Box score, scaled by minutes and skill
+        mins = np.clip(rng.normal(minutes[player], 4.0), 1, 40).round().astype(np.int64)
+        usage = skill[player] * mins / 30.0
+        fga = rng.poisson(usage * 0.8 + 0.5)
+        fg3a = rng.binomial(fga, 0.35)
+        fgm = rng.binomial(fga, 0.45)
+        fg3m = np.minimum(rng.binomial(fg3a, 0.34), fgm)
+        fta = rng.poisson(usage * 0.25)
+        ftm = rng.binomial(fta, 0.8)
+        oreb = rng.poisson(mins * 0.04)
+        dreb = rng.poisson(mins * 0.12)
+        pts = 2 * fgm + fg3m + ftm
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fg_pct = np.where(fga > 0, np.round(fgm / fga, 3), np.nan)
+            fg3_pct = np.where(fg3a > 0, np.round(fg3m / fg3a, 3), np.nan)
+            ft_pct = np.where(fta > 0, np.round(ftm / fta, 3), np.nan)
+
+        abbr = abbreviations[team]
+        frames.append(pd.DataFrame({
+            'SEASON_ID': f"2{year}",
+            'PLAYER_ID': 1000000 + player,
+            'PLAYER_NAME': names[player],
+            'TEAM_ID': team_ids[team],
+            'TEAM_ABBREVIATION': abbr,
+            'TEAM_NAME': np.char.add(abbr, ' Synthetics'),
+            'GAME_ID': game_ids[game],
+            'GAME_DATE': pd.to_datetime(game_dates[game]).strftime('%Y-%m-%d'),
+            'MATCHUP': np.where(is_home, np.char.add(np.char.add(abbr, ' vs. '), abbreviations[opp]),
+                                np.char.add(np.char.add(abbr, ' @ '), abbreviations[opp])),
+            'WL': np.where(win, 'W', 'L'),
+            'MIN': mins,
+            'FGM': fgm, 'FGA': fga, 'FG_PCT': fg_pct,
+            'FG3M': fg3m, 'FG3A': fg3a, 'FG3_PCT': fg3_pct,
+            'FTM': ftm, 'FTA': fta, 'FT_PCT': ft_pct,
+            'OREB': oreb, 'DREB': dreb, 'REB': oreb + dreb,
+            'AST': rng.poisson(mins * 0.08),
+            'STL': rng.poisson(mins * 0.03),
+            'BLK': rng.poisson(mins * 0.02),
+            'TOV': rng.poisson(mins * 0.05),
+            'PF': rng.poisson(mins * 0.06),
+            'PTS': pts,
+            'PLUS_MINUS': rng.integers(-15, 16, n),
+            'FANTASY_PTS': np.nan,
+            'VIDEO_AVAILABLE': 0,
+            'scraped_at': datetime(year, 10, 1).isoformat(),
+            'season_id': str(year),
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+def _perturb(name, rng):
+    """A spelling of `name` an Unrivaled box score might use."""
+    first, last = name.split(' ', 1)
+    kind = rng.integers(0, 4)
+    if kind == 0:
+        return f"{last}, {first}".upper()
+    if kind == 1:
+        return ''.join(ACCENTS.get(ch, ch) if i == 1 else ch for i, ch in enumerate(name))
+    if kind == 2:
+        # Drop one letter of the surname
+        i = 1 + rng.integers(0, max(1, len(last) - 1))
+        return f"{first} {last[:i]}{last[i + 1:]}"
+    return name
+
+def generate_unrivaled(gamelogs, n_players=36, unknown_rate=0.15, seed=42):
+    """
+    A processed-Unrivaled-style frame (player_name + season totals) drawn from
+    the latest season's WNBA roster: mostly exact or slightly misspelled names,
+    plus `unknown_rate` names that match nobody.
+    """
+    rng = np.random.default_rng(seed)
+    latest = gamelogs[gamelogs['season_id'] == gamelogs['season_id'].max()]
+    roster = latest['PLAYER_NAME'].drop_duplicates().to_numpy()
+
+    n_known = min(len(roster), int(round(n_players * (1 - unknown_rate))))
+    names = [_perturb(name, rng) for name in rng.choice(roster, n_known, replace=False)]
+    # Step by len(FIRST_NAMES) so every unknown gets its own surname
+    names += [f"Unsigned {player_name(i * len(FIRST_NAMES)).split(' ')[1]}" for i in range(n_players - n_known)]
+
+    return pd.DataFrame({
+        'player_name': names,
+        'games_played': rng.integers(5, 15, len(names)),
+        'PTS': rng.integers(20, 300, len(names)),
+        'REB': rng.integers(10, 150, len(names)),
+        'AST': rng.integers(5, 100, len(names)),
+    })
+
+def write_synthetic_data(seasons=1, scale=1, seed=42):
+    """Writes synthetic gamelogs + Unrivaled stats wherever config points (the benchmark's temp dirs)."""
+    from src.data import storage
+
+    gamelogs = generate_gamelogs(seasons, scale, seed)
+    for season, part in gamelogs.groupby('season_id', sort=True):
+        if storage.use_columnar():
+            storage.write_partition(part, storage.gamelog_table(), 'season_id', season)
+        else:
+            os.makedirs(config.RAW_DATA_DIR, exist_ok=True)
+            part.to_csv(config.RAW_DATA_DIR / f"wnba_{season}_gamelogs.csv", index=False)
+
+    storage.save_frame(generate_unrivaled(gamelogs, n_players=max(36, int(36 * scale)), seed=seed),
+                       config.MERGE_UNRIVALED_SOURCE)
+    return gamelogs
@@ -19,31 +19,195 @@ WNBA_LEAGUE_ID = '10'
 SEASONS_TO_FETCH = ['2021', '2022'] #, '2023', '2024', '2025']
 
 # --- PIPELINE CONTROL ---
-# Set to True if you want to force a re-download of existing data
+# 'delta': only request games after the last ingested GAME_DATE of each season
+#          and merge them into the existing season (full download if none yet)
+# 'full':  re-download whole seasons (honours OVERWRITE below)
+INGEST_MODE = 'delta'
+
+# Seasons that are over. Delta mode never hits the API for these once saved.
+FINAL_SEASONS = ['2021', '2022', '2023', '2024']
+
+# Set to True if you want to force a re-download of existing data ('full' mode)
 OVERWRITE = True
 
+# --- STORAGE ---
+# 'parquet': season-partitioned columnar tables (default read path)
+# 'csv': legacy flat files only
+STORAGE_FORMAT = 'parquet'
+
+# Keep writing the CSV copies alongside Parquet (handy for notebooks and diffs)
+EXPORT_CSV = True
+
+# Table directories (season-partitioned Parquet)
+GAMELOG_TABLE_NAME = "wnba_gamelogs"          # under RAW_DATA_DIR
+GOLDEN_TABLE_NAME = "training_features"       # under PROCESSED_DATA_DIR
+FEATURE_STORE_NAME = "feature_store"          # memory-mapped as-of index, under PROCESSED_DATA_DIR
+TRAINING_MATRIX_NAME = "training_matrix"      # memory-mapped float32 X/y for train/tune/backtest, under PROCESSED_DATA_DIR
+
 # API Retry Settings
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # Seconds
+RETRY_DELAY = 5  # Seconds (base of the exponential backoff)
+BACKOFF_MAX_DELAY = 60  # Seconds (backoff ceiling before jitter)
+
+# --- FETCH SCHEDULER ---
+# Override the base URL (e.g. a local stub server) to run ingestion offline
+STATS_API_BASE_URL = os.getenv("WNBA_STATS_BASE_URL", "https://stats.nba.com/stats")
+FETCH_WORKERS = 4           # Seasons fetched in parallel
+RATE_LIMIT_PER_SECOND = 0.5 # Shared token bucket across all workers
+RATE_LIMIT_BURST = 2
+HTTP_TIMEOUT = 30           # Seconds
+
+# Raw API responses, keyed by request parameters
+HTTP_CACHE_DIR = DATA_DIR / "cache" / "http"
+HTTP_CACHE_TTL = 6 * 60 * 60  # Seconds a cached in-progress season response stays fresh
 
 # --- ENTITY RESOLUTION CONFIG ---
 # The specific files we compare to create the Master Player Map
 # We use 2025 because it contains the most recent active roster including 2025 rookies
-MERGE_WNBA_SOURCE = RAW_DATA_DIR / "wnba_2025_gamelogs.csv"
-MERGE_UNRIVALED_SOURCE = PROCESSED_DATA_DIR / "unrivaled_2025_processed.csv"
-PLAYER_MAP_OUTPUT = PROCESSED_DATA_DIR / "player_mapping.csv"
+MERGE_WNBA_SEASON = '2025'  # None = match against every WNBA season on record
+MERGE_WNBA_SOURCE = RAW_DATA_DIR / "wnba_2025_gamelogs.csv"  # legacy CSV fallback
+MERGE_UNRIVALED_SOURCE = PROCESSED_DATA_DIR / "unrivaled_2025_processed.parquet"
+PLAYER_MAP_OUTPUT = PROCESSED_DATA_DIR / "player_mapping.parquet"
+
+# Fuzzy matches scoring below this (token_sort_ratio, 0-100) are rejected
+MATCH_SCORE_THRESHOLD = 85
+
+# Accepted/rejected decisions from earlier runs, keyed by normalized name.
+# Only names not seen before go through fuzzy scoring.
+PLAYER_RESOLUTION_STORE = PROCESSED_DATA_DIR / "player_resolution_store.json"
+
+# Hand-checked Unrivaled -> WNBA pairs (always win over fuzzy matching)
+MANUAL_OVERRIDES_PATH = PROJECT_ROOT / "config" / "entity_resolution" / "manual_overrides.yml"
 
 # --- MODELING & FEATURE ENGINEERING PARAMETERS ---
 # Minimum number of games a player must play to be included
 MIN_GAMES_THRESHOLD = 10 
 
-# Feature Engineering: Rolling Average Windows
-ROLLING_WINDOW_SHORT = 3
-ROLLING_WINDOW_LONG = 10
+# Feature Engineering: Rolling Form Features (src/features/rolling.py)
+# Every stat gets <STAT>_<N>G_AVG per window, <STAT>_EWM<S> per span and <STAT>_SEASON_AVG.
+# FANTASY_PTS (prefix FPTS) must stay in the list: the baselines and row filter use it.
+ROLLING_STATS = ['FANTASY_PTS']   # e.g. add 'PTS', 'REB', 'AST', 'MIN'
+ROLLING_WINDOWS = [3, 10]         # trailing N-game means (the smallest one also gates rows)
+ROLLING_EWMA_SPANS = []           # exponentially weighted means, e.g. [5]
+
+# Incremental Builds: only featurize games newer than the saved per-player state
+# (falls back to a full rebuild whenever the state can't vouch for the result; appended rows
+# match a rebuild up to row order and floating-point rounding, see update_features())
+INCREMENTAL_FEATURES = True
+
+# Streaming Builds (src/features/streaming.py): full rebuilds read the gamelogs in chunks
+# and process players in on-disk buckets, so peak memory follows the bucket size, not the
+# history. Same Golden Table as the in-memory build.
+STREAMING_FEATURES = os.getenv("WNBA_STREAMING_FEATURES", "0") == "1"
+STREAMING_CHUNK_ROWS = 250_000    # gamelog rows read at a time
+STREAMING_BUCKET_ROWS = 500_000   # player rows per bucket (whole players, so buckets may run over)
+
+# Production XGBoost hyperparameters (train.py and the backtester)
+MODEL_PARAMS = {
+    'objective': 'reg:squarederror',
+    'learning_rate': 0.05,
+    'max_depth': 5,
+    'n_estimators': 100,
+    'random_state': 42
+}
+
+# Component Models: one model per box score stat (PTS, REB, AST, STL, BLK, TOV, FG3M)
+# instead of one FANTASY_PTS model. Any scoring system's projection is then the predicted
+# components @ its YAML weights, so a new config/scoring file needs no retraining.
+COMPONENT_MODELS = os.getenv("WNBA_COMPONENT_MODELS", "0") == "1"
+
+# --- WALK-FORWARD BACKTEST ---
+BACKTEST_FREQ = 'W'              # Step size: 'W' (calendar week) or 'D' (game-day)
+BACKTEST_MIN_TRAIN_ROWS = 2000   # First window starts once the expanding train set is this big
+# 'retrain': refit from scratch on the expanding window every step
+# 'update': keep boosting the previous model on just the newest window
+#           (full refit every BACKTEST_RETRAIN_EVERY steps)
+BACKTEST_REFIT = 'retrain'
+BACKTEST_UPDATE_ROUNDS = 10
+BACKTEST_RETRAIN_EVERY = 8
+
+# --- HYPERPARAMETER TUNING ---
+# 'cpu' runs trials in a process pool; 'cuda' runs them one at a time on the GPU
+TUNE_DEVICE = 'cpu'
+TUNE_N_JOBS = None              # Cores to use (None = all)
+TUNE_THREADS_PER_TRIAL = None   # XGBoost threads per trial (None = split automatically)
+TUNE_SEED = 42                  # random_state for every trial
+
+# 'grid': the exhaustive 27-point grid
+# 'halving': successive halving on boosting rounds over TUNE_SEARCH_SPACE
+# 'tpe': Bayesian/TPE sampling with Hyperband pruning (needs optuna)
+TUNE_STRATEGY = 'grid'
+
+# Adaptive search space: (kind, low, high), kind in 'int' | 'float' | 'log'
+TUNE_SEARCH_SPACE = {
+    'learning_rate': ('log', 0.005, 0.3),
+    'max_depth': ('int', 2, 10),
+    'min_child_weight': ('log', 1.0, 50.0),
+    'subsample': ('float', 0.5, 1.0),
+    'colsample_bytree': ('float', 0.5, 1.0),
+    'reg_alpha': ('log', 1e-3, 10.0),
+    'reg_lambda': ('log', 1e-3, 10.0),
+}
+TUNE_N_CANDIDATES = 81            # Configs entering successive halving
+TUNE_TPE_TRIALS = 100             # Trials for the TPE sampler
+TUNE_MIN_ROUNDS = 25              # First rung's boosting rounds
+TUNE_MAX_ROUNDS = 1000            # Upper bound on n_estimators
+TUNE_HALVING_ETA = 3              # Keep the best 1/eta per rung
+TUNE_EARLY_STOPPING_ROUNDS = 50
+TUNE_VALIDATION_FRACTION = 0.2    # Chronological tail of the train split
+TUNE_LOG_TOP_K = 1                # Best trials (by MAE) that upload a full model artifact; the rest log params/metrics only
 
 # Default rulebook to use if none is specified
 DEFAULT_SCORING_SYSTEM = 'wnba_default'
 
+# --- PREDICTION SERVER ---
+MODEL_DIR = PROJECT_ROOT / "models"
+# train.py drops a local copy of the booster here for the server to load
+SERVE_MODEL_PATH = MODEL_DIR / "xgb_latest.ubj"
+# ... and one <STAT>.ubj per component when COMPONENT_MODELS is on
+COMPONENT_MODEL_DIR = MODEL_DIR / "components"
+# Serve the NumPy-compiled copy (<model>.npz, src/models/compiled.py) when one exists:
+# no xgboost/mlflow import, no DMatrix per request
+SERVE_COMPILED = True
+COMPILED_MAX_DEPTH = 14   # Deeper trees stay on xgboost (the flat layout grows as 2^depth)
+# Local model cache (src/models/model_cache.py): content-addressed by artifact hash, indexed
+# by MLflow run ID, with a champion pointer the server loads (memory-mapped, no download)
+MODEL_CACHE_DIR = MODEL_DIR / "cache"
+MODEL_CACHE_MAX_MB = 512          # Least recently used entries are evicted past this (never the champion)
+MODEL_CACHE_AUTO_PROMOTE = True   # train.py makes every newly trained model the champion
+# Optional MLflow model URI (e.g. 'runs:/<run_id>/model') that wins over the champion and
+# SERVE_MODEL_PATH; runs:/ URIs are downloaded into the model cache once
+SERVE_MODEL_URI = os.getenv("WNBA_MODEL_URI")
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8765
+
+# --- EXPERIMENT TRACKING (src/models/tracking.py) ---
+# Params/metrics/tags are buffered and sent as log_batch calls from a background thread
+TRACKING_ASYNC = True             # False = send every batch inline (debugging)
+TRACKING_BATCH_SIZE = 500         # Buffered metrics per run before a batch is queued
+
+# --- PIPELINE RUNNER (src/pipeline.py) ---
+# Fingerprint of every stage's last successful run (code + config + input contents)
+PIPELINE_STATE_PATH = DATA_DIR / "pipeline_state.json"
+PIPELINE_WORKERS = 2              # Independent stages (e.g. WNBA vs Unrivaled) run side by side
+PIPELINE_LOG_DIR = DATA_DIR / "logs" / "pipeline"  # One captured log per stage
+
+# --- STAGE INSTRUMENTATION (src/instrumentation.py) ---
+# One JSON line per timed stage (wall/CPU time, peak RSS, rows/s); None disables the file
+STAGE_LOG_PATH = DATA_DIR / "logs" / "stages.jsonl"
+# Run stages under cProfile and keep the .prof dump of any stage slower than the threshold
+PROFILE_STAGES = os.getenv("WNBA_PROFILE_STAGES", "0") == "1"
+PROFILE_THRESHOLD_S = float(os.getenv("WNBA_PROFILE_THRESHOLD_S", "30"))
+PROFILE_DIR = DATA_DIR / "logs" / "profiles"
+
+# --- BENCHMARKS (src/benchmarks/run_benchmarks.py) ---
+# Results land here; baseline_<seasons>s_<scale>x.json files are the stored reference runs
+BENCHMARK_DIR = DATA_DIR / "benchmarks"
+BENCHMARK_SEASONS = 3                 # Synthetic seasons to generate
+BENCHMARK_SCALE = 1                   # League size as a multiple of the WNBA's (up to 100)
+BENCHMARK_REPEATS = 3                 # Timed runs per stage (the fastest one counts)
+BENCHMARK_REGRESSION_TOLERANCE = 0.25 # Flag stages >25% slower (or hungrier) than the baseline
+
 # --- SCORING CONFIGURATION --
 
 SCORING_DIR = Path(__file__).resolve().parent.parent / "config" / "scoring"
@@ -63,3 +227,10 @@ def load_scoring_system(system_name=DEFAULT_SCORING_SYSTEM):
         
     print(f"Loaded Scoring System: {config_data['name']}")
     return config_data['weights']
+
+def list_scoring_systems():
+    """
+    Returns the names of every scoring system in config/scoring (file stems, sorted).
+    Usage: for name in list_scoring_systems(): load_scoring_system(name)
+    """
+    return sorted(path.stem for path in SCORING_DIR.glob("*.yml"))
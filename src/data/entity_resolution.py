@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import unicodedata
+import yaml
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+# Character n-gram size used for blocking
+NGRAM_SIZE = 3
+
+# Candidates kept per query after blocking (ranked by shared n-grams)
+BLOCK_TOP_K = 25
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace: 'Aja Wilson' == 'aja  wilson'."""
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^a-z0-9 ]+", ' ', name.lower())
+    return ' '.join(name.split())
+
+def name_ngrams(normalized):
+    """Padded character n-grams of a normalized name (order-free, so 'Gray Chelsea' still blocks with 'Chelsea Gray')."""
+    grams = set()
+    for token in normalized.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + NGRAM_SIZE] for i in range(max(1, len(padded) - NGRAM_SIZE + 1)))
+    return grams
+
+class NameIndex:
+    """
+    Blocking index over a reference roster (e.g. every WNBA player).
+    Names are normalized once, candidates are narrowed through an inverted
+    n-gram index, and the surviving (query, candidate) pairs are scored in
+    one vectorized rapidfuzz call. IDs resolve through a dict.
+    """
+    def __init__(self, names, ids):
+        self.name_to_id = {}
+        self.display_names = []
+        self.normalized = []
+
+        for name, player_id in zip(names, ids):
+            key = normalize_name(name)
+            # First ID wins for duplicate names, like the old lookup's .values[0]
+            if key in self.name_to_id:
+                continue
+            self.name_to_id[key] = player_id
+            self.display_names.append(name)
+            self.normalized.append(key)
+
+        postings = defaultdict(list)
+        for i, key in enumerate(self.normalized):
+            for gram in name_ngrams(key):
+                postings[gram].append(i)
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+        self.key_to_display = dict(zip(self.normalized, self.display_names))
+
+    def __len__(self):
+        return len(self.normalized)
+
+    def candidates(self, normalized_query, top_k=BLOCK_TOP_K):
+        """Reference rows sharing the most n-grams with the query (at most top_k)."""
+        hits = [self.postings[g] for g in name_ngrams(normalized_query) if g in self.postings]
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        shared = np.bincount(np.concatenate(hits), minlength=len(self))
+        found = np.flatnonzero(shared)
+        if len(found) > top_k:
+            found = found[np.argpartition(-shared[found], top_k - 1)[:top_k]]
+        return found
+
+    def match(self, queries, top_k=BLOCK_TOP_K):
+        """
+        Best reference match for every query name.
+        Returns a DataFrame: query, match_name, match_id, score (token_sort_ratio, 0-100).
+        Exact normalized hits skip scoring entirely.
+        """
+        query_keys = [normalize_name(name) for name in queries]
+        best = {}  # query position -> (reference key, score)
+        pair_query, pair_ref = [], []
+
+        for q, key in enumerate(query_keys):
+            if key in self.name_to_id:
+                best[q] = (key, 100.0)
+                continue
+            for ref in self.candidates(key, top_k):
+                pair_query.append(q)
+                pair_ref.append(ref)
+
+        # Score every surviving pair in one vectorized call
+        if pair_query:
+            scores = process.cpdist(
+                [query_keys[q] for q in pair_query],
+                [self.normalized[r] for r in pair_ref],
+                scorer=fuzz.token_sort_ratio,
+                workers=-1
+            )
+            pairs = pd.DataFrame({'q': pair_query, 'ref': pair_ref, 'score': scores})
+            top = pairs.sort_values(['q', 'score'], ascending=[True, False]).drop_duplicates('q')
+            for q, ref, score in top.itertuples(index=False):
+                best[q] = (self.normalized[ref], float(score))
+
+        rows = []
+        for q, name in enumerate(queries):
+            key, score = best.get(q, (None, 0.0))
+            rows.append({
+                'query': name,
+                'match_name': self.key_to_display.get(key),
+                'match_id': self.name_to_id.get(key),
+                'score': score,
+            })
+        return pd.DataFrame(rows, columns=['query', 'match_name', 'match_id', 'score'])
+
+# --- PERSISTENT RESOLUTION STORE ---
+# Bump whenever normalize_name or the scorer changes (old decisions become invalid)
+STORE_VERSION = 1
+
+def empty_store(threshold):
+    return {
+        'version': STORE_VERSION,
+        'threshold': threshold,
+        'reference': [],   # normalized reference names already scored against
+        'accepted': {},    # normalized query -> {query, match_name, match_id, score, method}
+        'rejected': {},    # normalized query -> {query, match_name, match_id, score}
+    }
+
+def load_resolution_store(path, threshold):
+    """Loads the store, or a fresh one if it's missing or was built under other rules."""
+    if not os.path.exists(path):
+        return empty_store(threshold)
+    with open(path, 'r') as file:
+        store = json.load(file)
+    if store.get('version') != STORE_VERSION or store.get('threshold') != threshold:
+        print("   ℹ️ Resolution store was built under different rules. Starting fresh.")
+        return empty_store(threshold)
+    return store
+
+def save_resolution_store(store, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(store, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def load_manual_overrides(path):
+    """Reads the hand-checked overrides YAML, keyed by normalized query name."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file:
+        overrides = (yaml.safe_load(file) or {}).get('overrides') or {}
+    return {normalize_name(query): target for query, target in overrides.items()}
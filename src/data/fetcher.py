@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import requests
+from requests.exceptions import ReadTimeout, ConnectionError
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import src.config as config
+
+# HTTP statuses worth retrying (throttled or a server hiccup)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class FetchError(Exception):
+    """Raised when a request still fails after every retry."""
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, with
+    bursts of up to `capacity`. acquire() blocks until a token is free.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class ResponseCache:
+    """
+    On-disk JSON cache of raw responses, keyed by endpoint + request parameters.
+    Each entry records whether its data was final (could no longer change) when fetched.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def key(self, endpoint, params):
+        raw = json.dumps({'endpoint': endpoint, 'params': params}, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, endpoint, params, max_age=None, final=False):
+        """
+        Returns the cached payload, or None if missing or older than max_age seconds.
+        With final=True, entries that were already final when fetched never expire.
+        """
+        path = self._path(self.key(endpoint, params))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as file:
+            entry = json.load(file)
+        if final and entry.get('final'):
+            return entry['payload']
+        if max_age is not None and time.time() - entry['fetched_at'] > max_age:
+            return None
+        return entry['payload']
+
+    def put(self, endpoint, params, payload, final=False):
+        path = self._path(self.key(endpoint, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({'endpoint': endpoint, 'params': params, 'fetched_at': time.time(),
+                       'final': final, 'payload': payload}, file)
+        os.replace(tmp_path, path)
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))."""
+    base = config.RETRY_DELAY if base is None else base
+    cap = config.BACKOFF_MAX_DELAY if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class FetchScheduler:
+    """
+    Runs stats API requests in parallel behind one shared rate limit.
+    Every response is cached on disk, so re-runs and crash recovery replay
+    from the cache instead of the network. Point base_url at a local stub
+    server to run everything offline.
+    """
+    def __init__(self, base_url=None, headers=None, max_workers=None, rate=None,
+                 burst=None, cache_dir=None, timeout=None, max_retries=None):
+        self.base_url = (base_url or config.STATS_API_BASE_URL).rstrip('/')
+        self.headers = headers or {}
+        self.max_workers = max_workers or config.FETCH_WORKERS
+        self.bucket = TokenBucket(rate or config.RATE_LIMIT_PER_SECOND, burst or config.RATE_LIMIT_BURST)
+        self.cache = ResponseCache(cache_dir or config.HTTP_CACHE_DIR)
+        self.timeout = timeout or config.HTTP_TIMEOUT
+        self.max_retries = max_retries or config.MAX_RETRIES
+        self.session = requests.Session()
+
+    def fetch_json(self, endpoint, params, max_age=None, final=False):
+        """
+        GETs <base_url>/<endpoint> with params, through the cache and the rate limit.
+        max_age (seconds) bounds how old a cached response may be; None = forever.
+        final=True marks data that can't change any more: its response is then
+        cached forever, but one cached before it was final still expires.
+        """
+        cached = self.cache.get(endpoint, params, max_age=max_age, final=final)
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.max_retries):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
+                if response.status_code in RETRYABLE_STATUS:
+                    raise ConnectionError(f"HTTP {response.status_code} from {endpoint}")
+                response.raise_for_status()
+                payload = response.json()
+            except (ReadTimeout, ConnectionError) as e:
+                if attempt == self.max_retries - 1:
+                    raise FetchError(f"{endpoint} failed after {self.max_retries} attempts: {e}") from e
+                delay = backoff_delay(attempt)
+                print(f"      ❌ Network Error: {e}")
+                print(f"      ...Backing off {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})...")
+                time.sleep(delay)
+                continue
+            except (requests.RequestException, ValueError) as e:
+                # 4xx or a garbled body: retrying won't help
+                raise FetchError(f"{endpoint} failed: {e}") from e
+
+            self.cache.put(endpoint, params, payload, final=final)
+            return payload
+
+    def map(self, func, items):
+        """Runs func(item) for every item on the worker pool. Returns results in input order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(func, items))
+
+def result_set_frame(payload, index=0):
+    """Turns a stats API resultSets entry (headers + rowSet) into a DataFrame."""
+    result_set = payload['resultSets'][index]
+    return pd.DataFrame(result_set['rowSet'], columns=result_set['headers'])
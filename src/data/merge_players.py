@@ -1,30 +1,46 @@
 import pandas as pd
 import os
 import sys
-from thefuzz import process, fuzz
+import glob
 
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 import src.config as config
-
-
-MANUAL_CORRECTIONS = {}
+from src.data import storage
+from src.data.schema import GAMELOG_SCHEMA, UNRIVALED_SCHEMA, apply_schema, concat_typed, read_csv_dtypes
+from src.data.entity_resolution import (
+    NameIndex, normalize_name, load_resolution_store, save_resolution_store, load_manual_overrides
+)
 
 def create_player_map():
     print("🔗 Starting Entity Resolution (WNBA <-> Unrivaled)...")
-    print(f"   LEFT SIDE (WNBA):      {config.MERGE_WNBA_SOURCE}")
+    print(f"   LEFT SIDE (WNBA):      {config.MERGE_WNBA_SEASON} season gamelogs")
     print(f"   RIGHT SIDE (UNRIVALED): {config.MERGE_UNRIVALED_SOURCE}")
 
     # 1. Load Data using Config Paths
-    if not os.path.exists(config.MERGE_WNBA_SOURCE):
-        print(f"❌ CRITICAL ERROR: WNBA 2025 file not found at: {config.MERGE_WNBA_SOURCE}")
-        print("   Did you run 'wnba_loader.py' for the 2025 season?")
+    # Only the merge season's partition(s) and the name/ID columns are read
+    # (MERGE_WNBA_SEASON = None matches against every season on record)
+    seasons = None if config.MERGE_WNBA_SEASON is None else [config.MERGE_WNBA_SEASON]
+    season_files = storage.partition_files(storage.gamelog_table(), seasons)
+    name_cols = ['PLAYER_NAME', 'PLAYER_ID']
+    if storage.use_columnar() and season_files:
+        df_wnba = storage.read_files(season_files, columns=name_cols, dtypes=GAMELOG_SCHEMA)
+    elif seasons is None and glob.glob(str(config.RAW_DATA_DIR / "wnba_*_gamelogs.csv")):
+        csv_files = sorted(glob.glob(str(config.RAW_DATA_DIR / "wnba_*_gamelogs.csv")))
+        df_wnba = concat_typed([
+            pd.read_csv(f, usecols=name_cols, dtype=read_csv_dtypes(GAMELOG_SCHEMA, name_cols)) for f in csv_files
+        ], GAMELOG_SCHEMA)
+    elif os.path.exists(config.MERGE_WNBA_SOURCE):
+        df_wnba = pd.read_csv(config.MERGE_WNBA_SOURCE, dtype=read_csv_dtypes(GAMELOG_SCHEMA))
+        df_wnba = apply_schema(df_wnba, GAMELOG_SCHEMA)
+    else:
+        print(f"❌ CRITICAL ERROR: WNBA {config.MERGE_WNBA_SEASON} gamelogs not found at: {config.MERGE_WNBA_SOURCE}")
+        print(f"   Did you run 'wnba_loader.py' for the {config.MERGE_WNBA_SEASON} season?")
         return
 
-    df_wnba = pd.read_csv(config.MERGE_WNBA_SOURCE)
-    df_unrivaled = pd.read_csv(config.MERGE_UNRIVALED_SOURCE)
+    df_unrivaled = storage.load_frame(config.MERGE_UNRIVALED_SOURCE, dtypes=UNRIVALED_SCHEMA)
 
-    # 2. Robust Column Selection (Unchanged)
+    # 2. Robust Column Selection
     # We look for PLAYER_NAME (API) or Player_Name (CSV)
     if 'PLAYER_NAME' in df_wnba.columns:
         wnba_lookup = df_wnba[['PLAYER_NAME', 'PLAYER_ID']].drop_duplicates()
@@ -37,49 +53,108 @@ def create_player_map():
         raise KeyError(f"❌ Could not find Player Name column. Candidates: {possible}")
 
     unrivaled_names = df_unrivaled['player_name'].unique()
-    valid_wnba_names = wnba_lookup['Player_Name'].tolist()
-
-    print(f"   -> WNBA 2025 Roster Size: {len(valid_wnba_names)}")
+    print(f"   -> WNBA {config.MERGE_WNBA_SEASON or 'All-Seasons'} Roster Size: {wnba_lookup['Player_Name'].nunique()}")
     print(f"   -> Unrivaled Roster Size: {len(unrivaled_names)}")
 
-    # 3. The Matching Engine (Unchanged logic)
+    # 3. The Matching Engine
+    threshold = config.MATCH_SCORE_THRESHOLD
+    store = load_resolution_store(config.PLAYER_RESOLUTION_STORE, threshold)
+    manual = load_manual_overrides(config.MANUAL_OVERRIDES_PATH)
+
+    # A. Normalize the WNBA roster once (first ID wins for duplicate names)
+    roster = {}
+    for name, player_id in zip(wnba_lookup['Player_Name'], wnba_lookup['Player_ID']):
+        roster.setdefault(normalize_name(name), (name, int(player_id)))
+    new_refs = [key for key in roster if key not in set(store['reference'])]
+
+    # B. Sort Unrivaled names into: manual, cached, cached-but-recheck, never seen
+    to_score, to_recheck = [], []
+    for u_name in unrivaled_names:
+        key = normalize_name(u_name)
+        if key in manual:
+            continue
+        cached = store['accepted'].get(key) or store['rejected'].get(key)
+        if cached is None or (cached['match_name'] is not None and normalize_name(cached['match_name']) not in roster):
+            # Never seen, or the matched player left the roster: score against everyone
+            to_score.append(u_name)
+        elif new_refs and cached['score'] < 100:
+            # Only the WNBA names added since the last run could beat the cached best
+            to_recheck.append(u_name)
+
+    cached_count = len(unrivaled_names) - len(to_score) - len(to_recheck)
+    print(f"   -> ♻️  Reusing {cached_count} stored decisions. Scoring {len(to_score)} new names, "
+          f"re-checking {len(to_recheck)} against {len(new_refs)} new WNBA names.")
+
+    decisions = {}
+    if to_score:
+        index = NameIndex([roster[k][0] for k in roster], [roster[k][1] for k in roster])
+        for row in index.match(to_score).itertuples(index=False):
+            decisions[normalize_name(row.query)] = row
+    if to_recheck:
+        delta_index = NameIndex([roster[k][0] for k in new_refs], [roster[k][1] for k in new_refs])
+        for row in delta_index.match(to_recheck).itertuples(index=False):
+            key = normalize_name(row.query)
+            cached = store['accepted'].get(key) or store['rejected'].get(key)
+            if row.score > cached['score']:
+                decisions[key] = row
+
+    # C. Persist every fresh decision, accepted or rejected
+    for key, row in decisions.items():
+        store['accepted'].pop(key, None)
+        store['rejected'].pop(key, None)
+        entry = {
+            'query': row.query,
+            'match_name': None if pd.isna(row.match_name) else row.match_name,
+            'match_id': None if row.match_id is None or pd.isna(row.match_id) else int(row.match_id),
+            'score': int(round(row.score)),
+        }
+        if entry['score'] >= threshold:
+            store['accepted'][key] = {**entry, 'method': "Fuzzy"}
+        else:
+            store['rejected'][key] = entry
+    store['reference'] = sorted(roster)
+    save_resolution_store(store, config.PLAYER_RESOLUTION_STORE)
+
+    # D. Build the map from manual overrides + the store
     matches = []
     
     for u_name in unrivaled_names:
+        key = normalize_name(u_name)
         
-        # A. Manual Override
-        if u_name in MANUAL_CORRECTIONS:
-            target_name = MANUAL_CORRECTIONS[u_name]
-            score = 100
-            method = "Manual"
-        else:
-            # B. Fuzzy Match
-            best_match = process.extractOne(u_name, valid_wnba_names, scorer=fuzz.token_sort_ratio)
-            target_name = best_match[0]
-            score = best_match[1]
-            method = "Fuzzy"
-
-        # C. Confidence Gate
-        if score < 85:
-            print(f"      ⚠️  Dropping '{u_name}' (Best match: '{target_name}' - Score: {score})")
-            continue 
-
-        # D. Retrieve ID
-        try:
-            w_id = wnba_lookup[wnba_lookup['Player_Name'] == target_name]['Player_ID'].values[0]
+        if key in manual:
+            # Manual Override
+            target_name = manual[key]
+            target = roster.get(normalize_name(target_name))
+            if target is None:
+                print(f"      ❌ Error looking up ID for {target_name}")
+                continue
             matches.append({
                 'unrivaled_name': u_name,
-                'wnba_name': target_name,
-                'wnba_id': w_id,
-                'match_score': score,
-                'method': method
+                'wnba_name': target[0],
+                'wnba_id': target[1],
+                'match_score': 100,
+                'method': "Manual"
             })
-        except IndexError:
-            print(f"      ❌ Error looking up ID for {target_name}")
+            continue
+
+        # Confidence Gate (applied when the decision was stored)
+        if key in store['rejected']:
+            rejected = store['rejected'][key]
+            print(f"      ⚠️  Dropping '{u_name}' (Best match: '{rejected['match_name']}' - Score: {rejected['score']})")
+            continue
+
+        accepted = store['accepted'][key]
+        matches.append({
+            'unrivaled_name': u_name,
+            'wnba_name': accepted['match_name'],
+            'wnba_id': accepted['match_id'],
+            'match_score': accepted['score'],
+            'method': accepted['method']
+        })
 
     # 4. Save
     df_map = pd.DataFrame(matches)
-    df_map.to_csv(config.PLAYER_MAP_OUTPUT, index=False)
+    storage.save_frame(df_map, config.PLAYER_MAP_OUTPUT)
     
     print("-" * 30)
     print(f"✅ Mapping Complete. Saved to {config.PLAYER_MAP_OUTPUT}")
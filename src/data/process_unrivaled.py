@@ -5,6 +5,7 @@ import sys
 # Add project root to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 import src.config as config
+from src.data import storage
 
 def process_unrivaled():
     print("🧹 Starting Unrivaled Data Normalization...")
@@ -51,10 +52,8 @@ def process_unrivaled():
     # 4. Standardize Names (Remove special chars, trim spaces)
     df['player_name'] = df['player_name'].str.strip()
     
-    # 5. Save to Processed
-    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
-    output_path = os.path.join(config.PROCESSED_DATA_DIR, "unrivaled_2025_processed.csv")
-    df.to_csv(output_path, index=False)
+    # 5. Save to Processed (Parquet + CSV export)
+    output_path = storage.save_frame(df, config.MERGE_UNRIVALED_SOURCE)
     print(f"✅ Saved normalized data to: {output_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals, is_datetime64_any_dtype
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# --- SCHEMA REGISTRY ---
+# One dtype per column for every table the pipeline loads. Applied once, at
+# load time: IDs fit in int32, box score counts in float32 (NaN-safe, and every
+# count is exact), repeated strings become categoricals and GAME_DATE is parsed
+# here and nowhere else. Columns a schema doesn't list keep their dtype.
+
+DATE = 'datetime64'   # any resolution: pandas picks it on parse
+
+_BOX_SCORE = [
+    'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS',
+]
+
+# Raw LeagueGameLog rows (+ the loader's scraped_at / season_id)
+GAMELOG_SCHEMA = {
+    'SEASON_ID': 'category',
+    'PLAYER_ID': 'int32',
+    'PLAYER_NAME': 'category',
+    'TEAM_ID': 'int32',
+    'TEAM_ABBREVIATION': 'category',
+    'TEAM_NAME': 'category',
+    'GAME_ID': 'category',
+    'GAME_DATE': DATE,
+    'MATCHUP': 'category',
+    'WL': 'category',
+    **{col: 'float32' for col in _BOX_SCORE},
+    'FANTASY_PTS': 'float32',   # Always empty in the API response; we score our own
+    'VIDEO_AVAILABLE': 'int8',
+    'scraped_at': 'category',
+    'season_id': 'category',
+}
+
+# The Golden Table. Feature and target columns stay float64 (exact round trips
+# through the feature store); only keys, flags and labels are compacted.
+GOLDEN_SCHEMA = {
+    'SEASON_ID': 'category',
+    'PLAYER_ID': 'int32',
+    'PLAYER_NAME': 'category',
+    'TEAM_ID': 'int32',
+    'GAME_ID': 'category',
+    'GAME_DATE': DATE,
+    'SEASON': 'int16',
+    'season_id': 'category',
+    'IS_HOME': 'int8',
+    'IS_BACK_TO_BACK': 'int8',
+    'OPP_TEAM_ID': 'int32',
+}
+
+# Processed Unrivaled stats (src/data/process_unrivaled.py)
+UNRIVALED_SCHEMA = {
+    'player_name': 'str',
+    'games_played': 'float32',
+}
+
+def read_csv_dtypes(schema, columns=None):
+    """
+    The dtypes pd.read_csv can apply while parsing (categoricals, floats,
+    strings), so the wide object columns never materialize. Integers and
+    dates are left to apply_schema(): a missing value would break them mid-parse.
+    """
+    return {
+        col: dtype for col, dtype in schema.items()
+        if (columns is None or col in columns) and dtype != DATE and not dtype.startswith('int')
+    }
+
+def apply_schema(df, schema):
+    """Casts every schema column present in df. Integer columns holding NaN fall back to float64."""
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype == DATE:
+            if not is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col])
+        elif dtype.startswith('int') and df[col].isna().any():
+            df[col] = df[col].astype('float64')
+        elif dtype.startswith('int'):
+            df[col] = pd.to_numeric(df[col]).astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def concat_typed(frames, schema):
+    """
+    pd.concat that keeps categoricals categorical: each frame's categories
+    are unioned first (plain pd.concat falls back to object columns).
+    """
+    frames = [apply_schema(frame, schema) for frame in frames]
+    if len(frames) == 1:
+        return frames[0]
+
+    for col, dtype in schema.items():
+        if dtype != 'category' or not all(col in frame.columns for frame in frames):
+            continue
+        categories = union_categoricals([frame[col] for frame in frames]).categories
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def storage_frame(df):
+    """
+    Categoricals back to their plain value dtype before writing Parquet, so
+    every part file shares one schema (Parquet dictionary-encodes repeated
+    strings on its own).
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    df = df.copy(deep=False)
+    for col in categorical:
+        df[col] = np.asarray(df[col].astype(df[col].cat.categories.dtype))
+    return df
@@ -0,0 +1,310 @@
+import os
+import sys
+import glob
+import shutil
+import hashlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import src.config as config
+from src.data.schema import GAMELOG_SCHEMA, GOLDEN_SCHEMA, apply_schema, read_csv_dtypes, storage_frame
+
+# Comparison operators accepted in read_table(filters=[(column, op, value), ...])
+_FILTER_OPS = {
+    '==': lambda field, value: field == value,
+    '!=': lambda field, value: field != value,
+    '<': lambda field, value: field < value,
+    '<=': lambda field, value: field <= value,
+    '>': lambda field, value: field > value,
+    '>=': lambda field, value: field >= value,
+    'in': lambda field, value: field.isin(list(value)),
+}
+
+# --- TABLE LOCATIONS ---
+# Resolved at call time so they always follow config.RAW_DATA_DIR / PROCESSED_DATA_DIR
+
+def gamelog_table():
+    """Raw WNBA gamelogs, one season_id=<season> partition per season."""
+    return config.RAW_DATA_DIR / config.GAMELOG_TABLE_NAME
+
+def golden_table():
+    """The Golden Table (training_features), one SEASON=<year> partition per season."""
+    return config.PROCESSED_DATA_DIR / config.GOLDEN_TABLE_NAME
+
+def use_columnar():
+    return config.STORAGE_FORMAT == 'parquet'
+
+# --- PARTITIONED TABLES ---
+
+def partition_files(table_path, partitions=None):
+    """
+    Lists the Parquet part files of a table, optionally only for some partitions.
+    Partition pruning happens here: pruned seasons are never opened.
+    """
+    if partitions is not None:
+        wanted = {str(p) for p in partitions}
+        part_dirs = [
+            d for d in sorted(glob.glob(os.path.join(table_path, "*=*")))
+            if d.split('=', 1)[1] in wanted
+        ]
+    else:
+        part_dirs = sorted(glob.glob(os.path.join(table_path, "*=*")))
+
+    # Numeric part order: appended parts read back in the order they were written,
+    # including tables from before the names were zero-padded (part-2 before part-10)
+    return [f for d in part_dirs for f in sorted(glob.glob(os.path.join(d, "part-*.parquet")), key=_part_number)]
+
+def _part_number(path):
+    return int(os.path.basename(path)[len("part-"):-len(".parquet")])
+
+def table_exists(table_path):
+    return bool(partition_files(table_path))
+
+def table_schema(table_path, partitions=None):
+    """Unified schema of every part file (read from the Parquet footers only)."""
+    files = partition_files(table_path, partitions)
+    if not files:
+        raise FileNotFoundError(f"❌ No Parquet partitions found under: {table_path}")
+    return pa.unify_schemas([pq.read_schema(f) for f in files], promote_options='permissive')
+
+def _filter_expression(filters):
+    expression = None
+    for column, op, value in filters:
+        if op not in _FILTER_OPS:
+            raise ValueError(f"❌ Unsupported filter operator '{op}'. Use one of {list(_FILTER_OPS)}")
+        term = _FILTER_OPS[op](ds.field(column), value)
+        expression = term if expression is None else expression & term
+    return expression
+
+def _apply_filters(df, filters):
+    """Same filters as _filter_expression, applied in pandas (CSV fallback path)."""
+    for column, op, value in filters:
+        if op not in _FILTER_OPS:
+            raise ValueError(f"❌ Unsupported filter operator '{op}'. Use one of {list(_FILTER_OPS)}")
+        df = df[_FILTER_OPS[op](df[column], value)]
+    return df
+
+def read_files(files, columns=None, filters=None, dtypes=None):
+    """Reads specific part files (see read_table) into one DataFrame, typed by `dtypes` (a src/data/schema.py schema)."""
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options='permissive')
+    dataset = ds.dataset(files, schema=schema, format='parquet')
+    expression = _filter_expression(filters) if filters else None
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    return apply_schema(df, dtypes) if dtypes else df
+
+def read_table(table_path, columns=None, partitions=None, filters=None, dtypes=None):
+    """
+    Reads a partitioned Parquet table.
+    - columns: only these columns are decoded (column pruning)
+    - partitions: only these partition values are opened (e.g. seasons)
+    - filters: [(column, op, value), ...] pushed down to the Parquet row groups,
+      e.g. [('GAME_DATE', '>', pd.Timestamp('2025-06-01'))]
+    - dtypes: the schema to load it with (see src/data/schema.py)
+    """
+    files = partition_files(table_path, partitions)
+    if not files:
+        raise FileNotFoundError(f"❌ No Parquet partitions found under: {table_path}")
+    return read_files(files, columns=columns, filters=filters, dtypes=dtypes)
+
+def _write_part(df, part_dir, schema=None):
+    os.makedirs(part_dir, exist_ok=True)
+    # On disk, categoricals are plain strings: appended parts must match the existing ones
+    df = storage_frame(df)
+    n_existing = len(glob.glob(os.path.join(part_dir, "part-*.parquet")))
+    # Zero-padded, so the names sort in write order for any reader (not just partition_files)
+    final_path = os.path.join(part_dir, f"part-{n_existing:05d}.parquet")
+    tmp_path = final_path + ".tmp"
+
+    if schema is not None:
+        table = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+    pq.write_table(table, tmp_path)
+    # Atomic rename so readers never see a half-written part
+    os.replace(tmp_path, final_path)
+    return final_path
+
+def write_partition(df, table_path, partition_col, value, append=False):
+    """
+    Writes the rows of one partition (e.g. one season).
+    Overwrites the partition unless append=True, which adds a new part file
+    cast to the schema already on disk.
+    """
+    part_dir = os.path.join(table_path, f"{partition_col}={value}")
+
+    if append and table_exists(table_path):
+        return _write_part(df, part_dir, schema=table_schema(table_path))
+
+    if os.path.exists(part_dir):
+        shutil.rmtree(part_dir)
+    return _write_part(df, part_dir)
+
+def add_parts(df, table_path, partition_col):
+    """
+    Adds df to a table as-is: one new part file per value of partition_col,
+    after the parts already there. No cast to the existing schema (readers
+    unify them), so it suits tables written piece by piece.
+    """
+    for value, part in df.groupby(partition_col, sort=True):
+        _write_part(part, os.path.join(table_path, f"{partition_col}={value}"))
+
+def _swap_in(tmp_path, table_path):
+    # Swap the finished table in, so a crash mid-write leaves the old one intact
+    if os.path.exists(table_path):
+        shutil.rmtree(table_path)
+    os.replace(tmp_path, table_path)
+
+def write_table(df, table_path, partition_col):
+    """Replaces a whole table, writing one partition per value of partition_col."""
+    table_path = str(table_path)
+    tmp_path = table_path + ".tmp"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+
+    add_parts(df, tmp_path, partition_col)
+    _swap_in(tmp_path, table_path)
+
+def append_table(df, table_path, partition_col):
+    """Appends rows to an existing table, one new part file per touched partition."""
+    for value, part in df.groupby(partition_col, sort=True):
+        write_partition(part, table_path, partition_col, value, append=True)
+
+# --- SINGLE-FILE FRAMES (Unrivaled, player map) ---
+
+def save_frame(df, path):
+    """Saves a small table as Parquet (plus the CSV export when EXPORT_CSV is on)."""
+    path = os.fspath(path)
+    base, _ = os.path.splitext(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    storage_frame(df).to_parquet(base + ".parquet", index=False)
+    if config.EXPORT_CSV:
+        df.to_csv(base + ".csv", index=False)
+    return base + ".parquet"
+
+def load_frame(path, columns=None, dtypes=None):
+    """Loads a small table, preferring its Parquet file and falling back to the CSV. `dtypes` types it on load."""
+    path = os.fspath(path)
+    base, _ = os.path.splitext(path)
+    dtypes = dtypes or {}
+
+    if use_columnar() and os.path.exists(base + ".parquet"):
+        return apply_schema(pd.read_parquet(base + ".parquet", columns=columns), dtypes)
+    if os.path.exists(base + ".csv"):
+        df = pd.read_csv(base + ".csv", usecols=columns, dtype=read_csv_dtypes(dtypes, columns))
+        return apply_schema(df, dtypes)
+    raise FileNotFoundError(f"❌ Neither {base}.parquet nor {base}.csv exists")
+
+# --- PIPELINE TABLES ---
+
+def load_golden_table(columns=None, seasons=None, filters=None):
+    """
+    Loads the Golden Table typed by GOLDEN_SCHEMA (GAME_DATE already parsed).
+    Reads the Parquet table by default; falls back to training_features.csv.
+    """
+    table_path = golden_table()
+    if use_columnar() and table_exists(table_path):
+        return read_table(table_path, columns=columns, partitions=seasons, filters=filters, dtypes=GOLDEN_SCHEMA)
+
+    csv_path = config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"
+    df = pd.read_csv(csv_path, usecols=columns, dtype=read_csv_dtypes(GOLDEN_SCHEMA, columns))
+    df = apply_schema(df, GOLDEN_SCHEMA)
+    if seasons is not None:
+        df = df[df['SEASON'].astype(str).isin({str(s) for s in seasons})]
+    if filters:
+        df = _apply_filters(df, filters)
+    return df
+
+def save_golden_table(df, append=False):
+    """Writes (or appends to) the Golden Table, plus the CSV export when EXPORT_CSV is on."""
+    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
+    csv_path = config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"
+
+    if use_columnar():
+        if append:
+            append_table(df, golden_table(), 'SEASON')
+        else:
+            write_table(df, golden_table(), 'SEASON')
+
+    if config.EXPORT_CSV or not use_columnar():
+        if append and csv_path.exists():
+            df.to_csv(csv_path, mode='a', header=False, index=False)
+        else:
+            df.to_csv(csv_path, index=False)
+    return golden_table() if use_columnar() else csv_path
+
+# Writing the Golden Table piece by piece (src/features/streaming.py): rows go to
+# temp copies in final row order, and finish_golden_table() swaps them in
+
+def _golden_tmp_paths():
+    csv_path = config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"
+    return str(golden_table()) + ".tmp", csv_path.with_suffix('.csv.tmp')
+
+def start_golden_table():
+    """Clears the temp copies a previous (crashed) piecewise write may have left."""
+    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
+    table_tmp, csv_tmp = _golden_tmp_paths()
+    if os.path.exists(table_tmp):
+        shutil.rmtree(table_tmp)
+    if csv_tmp.exists():
+        csv_tmp.unlink()
+
+def write_golden_rows(df):
+    """Appends the next rows of the Golden Table being replaced (one part per season, plus the CSV export)."""
+    table_tmp, csv_tmp = _golden_tmp_paths()
+    if use_columnar():
+        add_parts(df, table_tmp, 'SEASON')
+    if config.EXPORT_CSV or not use_columnar():
+        df.to_csv(csv_tmp, mode='a', header=not csv_tmp.exists(), index=False)
+
+def finish_golden_table():
+    """Swaps the piecewise-written Golden Table in. Returns its path like save_golden_table()."""
+    table_tmp, csv_tmp = _golden_tmp_paths()
+    if os.path.exists(table_tmp):
+        _swap_in(table_tmp, str(golden_table()))
+    if csv_tmp.exists():
+        os.replace(csv_tmp, csv_tmp.with_suffix(''))
+    return golden_table() if use_columnar() else csv_tmp.with_suffix('')
+
+def golden_table_columns():
+    """Column order of the saved Golden Table (schema only, no rows read)."""
+    if use_columnar() and table_exists(golden_table()):
+        return list(table_schema(golden_table()).names)
+    csv_path = config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"
+    return list(pd.read_csv(csv_path, nrows=0).columns)
+
+def golden_table_fingerprint():
+    """Cheap change detector for the Golden Table: md5 over each file's path, size and mtime."""
+    if use_columnar() and table_exists(golden_table()):
+        files = partition_files(golden_table())
+    else:
+        files = [config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"]
+
+    digest = hashlib.md5()
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.relpath(path, config.PROCESSED_DATA_DIR)}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+    return digest.hexdigest()
+
+def golden_table_exists():
+    if use_columnar():
+        return table_exists(golden_table())
+    return (config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv").exists()
+
+def migrate_csv_gamelogs():
+    """One-off: converts every legacy wnba_<season>_gamelogs.csv into the Parquet table."""
+    csv_files = sorted(glob.glob(str(config.RAW_DATA_DIR / "wnba_*_gamelogs.csv")))
+    for path in csv_files:
+        season = os.path.basename(path).split('_')[1]
+        df = apply_schema(pd.read_csv(path, dtype=read_csv_dtypes(GAMELOG_SCHEMA)), GAMELOG_SCHEMA)
+        df['season_id'] = season
+        write_partition(df, gamelog_table(), 'season_id', season)
+        print(f"✅ Migrated {os.path.basename(path)} -> {gamelog_table()}/season_id={season} ({len(df)} rows)")
+
+if __name__ == "__main__":
+    migrate_csv_gamelogs()
@@ -1,9 +1,7 @@
 import pandas as pd
 import os
-import time
-from datetime import datetime
-from nba_api.stats.endpoints import leaguegamelog
-from requests.exceptions import ReadTimeout, ConnectionError
+from datetime import datetime, timedelta
+from nba_api.stats.library.http import STATS_HEADERS
 
 # Import our new central config
 import sys
@@ -12,76 +10,177 @@ import os
 # Add the project root to python path so we can import src
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 import src.config as config
+from src.data import storage
+from src.data.schema import GAMELOG_SCHEMA, apply_schema, concat_typed, read_csv_dtypes
+from src.data.fetcher import FetchScheduler, FetchError, result_set_frame
 
-def fetch_season_data(season):
+# Key of one player-game row in LeagueGameLog
+GAMELOG_KEY = ['PLAYER_ID', 'GAME_ID']
+
+# Shared by every season so they all draw from one rate limit and one cache
+_scheduler = None
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FetchScheduler(headers=STATS_HEADERS)
+    return _scheduler
+
+def gamelog_params(season, date_from=None):
+    """The LeagueGameLog query nba_api would send (dates are MM/DD/YYYY, filtered server-side)."""
+    return {
+        'Counter': 0,
+        'DateFrom': date_from.strftime('%m/%d/%Y') if date_from is not None else '',
+        'DateTo': '',
+        'Direction': 'ASC',
+        'LeagueID': config.WNBA_LEAGUE_ID,
+        'PlayerOrTeam': 'P',
+        'Season': season,
+        'SeasonType': 'Regular Season',
+        'Sorter': 'DATE',
+    }
+
+def fetch_season_data(season, date_from=None):
     """
-    Fetches data for a single season with retry logic.
+    Fetches data for a single season through the shared fetch scheduler
+    (rate limit, exponential backoff with jitter, on-disk response cache).
+    With date_from (a date), only games on or after that day are requested.
     Returns a DataFrame or None if failed.
     """
-    print(f"   -> Fetching {season} season data...")
+    if date_from is None:
+        print(f"   -> Fetching {season} season data...")
+    else:
+        print(f"   -> Fetching {season} season games since {date_from:%Y-%m-%d}...")
+
+    # Final seasons never change, so responses fetched once they were final never expire;
+    # one cached while the season was still running ages out like any other
+    final = season in config.FINAL_SEASONS
+
+    try:
+        # 1. Fetch Data from the stats API
+        payload = get_scheduler().fetch_json('leaguegamelog', gamelog_params(season, date_from),
+                                             max_age=config.HTTP_CACHE_TTL, final=final)
+        df = result_set_frame(payload)
+    except FetchError as e:
+        print(f"      ❌ Max retries reached. {e}")
+        return None
+    except Exception as e:
+        print(f"      ❌ Unexpected Error: {e}")
+        return None
+
+    if df.empty:
+        if date_from is None:
+            print(f"      ⚠️  Warning: No data found for {season}.")
+        else:
+            print(f"      ℹ️  No new games for {season}.")
+        return None
+
+    # 2. Add Metadata
+    df['scraped_at'] = datetime.now().isoformat()
+    df['season_id'] = season
+
+    # 3. Type it once (dates parsed, compact IDs/stats); Parquet keeps the types for every later stage
+    return apply_schema(df, GAMELOG_SCHEMA)
+
+def load_saved_season(season, columns=None):
+    """Returns the already-ingested rows of a season (Parquet partition or legacy CSV) typed by GAMELOG_SCHEMA, or None."""
+    season_files = storage.partition_files(storage.gamelog_table(), [season])
+    if storage.use_columnar() and season_files:
+        return storage.read_files(season_files, columns=columns, dtypes=GAMELOG_SCHEMA)
+
+    csv_path = os.path.join(config.RAW_DATA_DIR, f"wnba_{season}_gamelogs.csv")
+    if os.path.exists(csv_path):
+        # GAME_ID stays text (categorical), as the API returns it, so dedupe keys line up
+        df = pd.read_csv(csv_path, usecols=columns, dtype=read_csv_dtypes(GAMELOG_SCHEMA, columns))
+        return apply_schema(df, GAMELOG_SCHEMA)
+    return None
+
+def save_season(df, season):
+    """Writes one season as its Parquet partition (and the CSV export)."""
+    if storage.use_columnar():
+        storage.write_partition(df, storage.gamelog_table(), 'season_id', season)
+        print(f"✅ Saved {season} data to {config.GAMELOG_TABLE_NAME}/season_id={season} ({len(df)} rows)")
+
+    if config.EXPORT_CSV or not storage.use_columnar():
+        output_filename = f"wnba_{season}_gamelogs.csv"
+        df.to_csv(os.path.join(config.RAW_DATA_DIR, output_filename), index=False)
+        print(f"✅ Saved {season} data to {output_filename} ({len(df)} rows)")
+
+def ingest_season_delta(season):
+    """
+    Delta ingest for one season: requests only games after the last saved
+    GAME_DATE, then merges them into the saved rows (deduped on PLAYER_ID/GAME_ID).
+    Seasons in FINAL_SEASONS that are already saved are skipped entirely.
+    """
+    # Only the date column is needed to find the watermark
+    saved_dates = load_saved_season(season, columns=['GAME_DATE'])
+
+    if saved_dates is None or saved_dates.empty:
+        df = fetch_season_data(season)
+        if df is not None:
+            save_season(df, season)
+        return
+
+    if season in config.FINAL_SEASONS:
+        print(f"⏭️  Skipping {season}: Season is final and already saved")
+        return
+
+    last_date = saved_dates['GAME_DATE'].max()
+    new_rows = fetch_season_data(season, date_from=last_date + timedelta(days=1))
+
+    # Nothing new -> leave the saved files untouched (keeps downstream fingerprints stable)
+    if new_rows is None:
+        return
+
+    saved = load_saved_season(season)
+    merged = concat_typed([saved, new_rows], GAMELOG_SCHEMA)
+    merged = merged.drop_duplicates(subset=GAMELOG_KEY, keep='first')
+    merged['season_id'] = season
+
+    added = len(merged) - len(saved)
+    if added == 0:
+        print(f"      ℹ️  All {len(new_rows)} fetched rows for {season} were already saved.")
+        return
+
+    print(f"      -> {added} new rows after {last_date:%Y-%m-%d}")
+    save_season(merged, season)
+
+def ingest_season_full(season):
+    """Full ingest for one season: re-downloads it unless saved and OVERWRITE is off."""
+    # Define the output paths for this specific season
+    output_path = os.path.join(config.RAW_DATA_DIR, f"wnba_{season}_gamelogs.csv")
+    partition_exists = bool(storage.partition_files(storage.gamelog_table(), [season]))
+
+    # CHECK: Does the season already exist?
+    already_saved = partition_exists if storage.use_columnar() else os.path.exists(output_path)
+    if already_saved and not config.OVERWRITE:
+        print(f"⏭️  Skipping {season}: Season already saved")
+        return
     
-    for attempt in range(config.MAX_RETRIES):
-        try:
-            # 1. Fetch Data using nba_api
-            log = leaguegamelog.LeagueGameLog(
-                league_id=config.WNBA_LEAGUE_ID, 
-                season=season,
-                player_or_team_abbreviation='P' 
-            )
-            
-            df = log.get_data_frames()[0]
-            
-            if df.empty:
-                print(f"      ⚠️  Warning: No data found for {season}.")
-                return None
-
-            # 2. Add Metadata
-            df['scraped_at'] = datetime.now().isoformat()
-            df['season_id'] = season
-            
-            return df
-
-        except (ReadTimeout, ConnectionError) as e:
-            print(f"      ❌ Network Error: {e}")
-            if attempt < config.MAX_RETRIES - 1:
-                print(f"      ...Waiting {config.RETRY_DELAY}s...")
-                time.sleep(config.RETRY_DELAY)
-            else:
-                print("      ❌ Max retries reached.")
-                return None
-        except Exception as e:
-            print(f"      ❌ Unexpected Error: {e}")
-            return None
+    # FETCH: Download the data
+    df = fetch_season_data(season)
+    
+    # SAVE: Write the season partition (and the CSV export)
+    if df is not None:
+        save_season(df, season)
 
 def main():
     """
     Main orchestration function.
-    Checks for existing files and loops through configured seasons.
+    Ingests every configured season, several at a time on the fetch scheduler.
     """
     print(f"🏀 Starting WNBA Data Pipeline")
     print(f"   Target Seasons: {config.SEASONS_TO_FETCH}")
-    print(f"   Overwrite Mode: {config.OVERWRITE}")
+    print(f"   Ingest Mode:    {config.INGEST_MODE}")
+    if config.INGEST_MODE == 'full':
+        print(f"   Overwrite Mode: {config.OVERWRITE}")
     
     # Ensure raw directory exists
     os.makedirs(config.RAW_DATA_DIR, exist_ok=True)
 
-    for season in config.SEASONS_TO_FETCH:
-        # Define the output path for this specific season
-        output_filename = f"wnba_{season}_gamelogs.csv"
-        output_path = os.path.join(config.RAW_DATA_DIR, output_filename)
-
-        # CHECK: Does file exist?
-        if os.path.exists(output_path) and not config.OVERWRITE:
-            print(f"⏭️  Skipping {season}: File exists at {output_filename}")
-            continue
-        
-        # FETCH: Download the data
-        df = fetch_season_data(season)
-        
-        # SAVE: Write to CSV
-        if df is not None:
-            df.to_csv(output_path, index=False)
-            print(f"✅ Saved {season} data to {output_filename} ({len(df)} rows)")
+    # Seasons write to separate partitions, so they can be ingested in parallel
+    ingest = ingest_season_delta if config.INGEST_MODE == 'delta' else ingest_season_full
+    get_scheduler().map(ingest, config.SEASONS_TO_FETCH)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -11,49 +11,62 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src import config
+from src.data import storage
+from src.data.schema import GAMELOG_SCHEMA, read_csv_dtypes, concat_typed
+from src.features.scoring import score_fantasy_points
+from src.features.rolling import rolling_features, window_feature, season_feature
+from src.features.team_context import build_team_games, add_team_context, join_team_context
+from src.features.feature_store import build_feature_store
+from src.instrumentation import stage, instrumented
+
+# Same-game box score stats: the model never gets to see these (Data Leakage)
+LEAKY_BOX_SCORE_STATS = [
+    'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FGM', 'FGA', 'FG_PCT',
+    'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'PF',
+    'PLUS_MINUS', 'MIN'
+]
+
+# Metadata that has no mathematical value to the algorithm
+USELESS_METADATA = ['TEAM_ABBREVIATION', 'TEAM_NAME', 'MATCHUP', 'WL', 'VIDEO_AVAILABLE', 'scraped_at', 'SCRAPED_AT']
+
+def gamelog_files():
+    """
+    Lists the gamelog files to build from (sorted by season): the Parquet
+    partitions by default, or every wnba_*_gamelogs.csv for legacy CSV storage.
+    """
+    if storage.use_columnar():
+        all_files = storage.partition_files(storage.gamelog_table())
+        if all_files:
+            return all_files
+        print("   ⚠️ No Parquet gamelog table yet. Reading legacy CSVs (run src/data/storage.py to migrate).")
 
-def calc_fp(row, w):
-    """Calculates Fantasy Points dynamically based on loaded weights."""
-    return (row['PTS'] * w['PTS']) + \
-           (row['REB'] * w['REB']) + \
-           (row['AST'] * w['AST']) + \
-           (row['STL'] * w['STL']) + \
-           (row['BLK'] * w['BLK']) + \
-           (row['TOV'] * w['TOV']) + \
-           (row.get('FG3M', 0) * w.get('FG3M', 0))
-
-def engineer_features():
-    print("🚀 Starting WNBA Feature Engineering Pipeline...")
-
-    # 1. Load ALL Available Historical Data
     search_pattern = str(config.RAW_DATA_DIR / "wnba_*_gamelogs.csv")
-    all_files = glob.glob(search_pattern)
-    
+    all_files = sorted(glob.glob(search_pattern))
+
     if not all_files:
         raise FileNotFoundError(f"❌ No WNBA gamelog CSVs found matching: {search_pattern}")
-        
-    print(f"📂 Found {len(all_files)} seasons of historical data. Merging...")
-    df_list = [pd.read_csv(file) for file in all_files]
-    df = pd.concat(df_list, ignore_index=True)
-
-    # 2. Apply Dynamic Scoring Rules (The Target)
-    scoring_weights = config.load_scoring_system(config.DEFAULT_SCORING_SYSTEM)
-    df['FANTASY_PTS'] = df.apply(lambda row: calc_fp(row, scoring_weights), axis=1)
-
-    # 3. Filter the Noise (Min Games Threshold)
+    return all_files
+
+def _read_gamelog_file(file):
+    if file.endswith('.parquet'):
+        return storage.read_files([file], dtypes=GAMELOG_SCHEMA)
+    return pd.read_csv(file, dtype=read_csv_dtypes(GAMELOG_SCHEMA))
+
+def read_gamelog_files(files):
+    """Reads and stacks the given gamelog files, typed by GAMELOG_SCHEMA. Returns (df, {file: row count})."""
+    print(f"📂 Found {len(files)} gamelog files of historical data. Merging...")
+    df_list = [_read_gamelog_file(file) for file in files]
+    file_rows = {file: len(part) for file, part in zip(files, df_list)}
+    return concat_typed(df_list, GAMELOG_SCHEMA), file_rows
+
+def filter_min_games(df):
+    """Drops players with fewer than MIN_GAMES_THRESHOLD games on record."""
     game_counts = df['PLAYER_ID'].value_counts()
     valid_players = game_counts[game_counts >= config.MIN_GAMES_THRESHOLD].index
-    df = df[df['PLAYER_ID'].isin(valid_players)].copy()
-
-    # 4. Sort chronologically to prevent data leakage
-    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-    df = df.sort_values(by=['PLAYER_ID', 'GAME_DATE'])
-
-    # ==========================================
-    # 5. FEATURE ENGINEERING BLOCK
-    # ==========================================
-    print("🧠 Engineering advanced predictive features...")
+    return df[df['PLAYER_ID'].isin(valid_players)].copy()
 
+def add_player_features(df):
+    """Venue, rest and form features. Expects rows sorted by PLAYER_ID, GAME_DATE."""
     # A. Venue Features (Home vs Away)
     # If the matchup contains ' vs. ', they are the home team. If '@', away.
     df['IS_HOME'] = np.where(df['MATCHUP'].str.contains(' vs. '), 1, 0)
@@ -62,70 +75,109 @@ def engineer_features():
     df['DAYS_REST'] = df.groupby('PLAYER_ID')['GAME_DATE'].diff().dt.days.fillna(7)
     df['IS_BACK_TO_BACK'] = np.where(df['DAYS_REST'] <= 1, 1, 0)
 
-    # C. Rolling Averages (Short and Long Term Form)
-    # MUST use .shift(1) so today's prediction only uses past data
-    df[f'FPTS_{config.ROLLING_WINDOW_SHORT}G_AVG'] = df.groupby('PLAYER_ID')['FANTASY_PTS'].transform(
-        lambda x: x.rolling(window=config.ROLLING_WINDOW_SHORT, min_periods=1).mean().shift(1)
-    )
-    
-    df[f'FPTS_{config.ROLLING_WINDOW_LONG}G_AVG'] = df.groupby('PLAYER_ID')['FANTASY_PTS'].transform(
-        lambda x: x.rolling(window=config.ROLLING_WINDOW_LONG, min_periods=1).mean().shift(1)
-    )
-
-    # D. Season-to-Date Anchor (Our best baseline!)
+    # C. Rolling Form (windows, EWMAs, season-to-date anchor) for every ROLLING_STATS column
+    # One vectorized kernel over the player-sorted rows; only past games count (the old .shift(1))
     df['SEASON'] = df['GAME_DATE'].dt.year
-    df['FPTS_SEASON_AVG'] = df.groupby(['PLAYER_ID', 'SEASON'])['FANTASY_PTS'].transform(
-        lambda x: x.expanding().mean().shift(1)
-    )
+    for column, values in rolling_features(df).items():
+        df[column] = values
+    return df
 
-    # E. Current Team Standing (Rolling Win Percentage)
-    print("📈 Calculating chronological team standings...")
-    
-    # 1. Isolate unique team games to avoid player-row duplication skewing the math
-    team_games = df[['TEAM_ABBREVIATION', 'GAME_DATE', 'WL', 'SEASON']].drop_duplicates().sort_values(by=['TEAM_ABBREVIATION', 'GAME_DATE'])
-    
-    # 2. Convert 'W'/'L' text to 1/0 integers for math
-    team_games['WIN_FLAG'] = np.where(team_games['WL'] == 'W', 1, 0)
-    
-    # 3. Calculate expanding season win percentage (MUST shift by 1 to prevent target leakage)
-    team_games['TEAM_WIN_PCT'] = team_games.groupby(['TEAM_ABBREVIATION', 'SEASON'])['WIN_FLAG'].transform(
-        lambda x: x.expanding().mean().shift(1)
-    ).fillna(0.00) # Give them a 0.00 win pct for the very first game of the season
-    
-    # 4. Merge this new feature back into our main Golden Table
-    df = df.merge(team_games[['TEAM_ABBREVIATION', 'GAME_DATE', 'TEAM_WIN_PCT']], 
-                  on=['TEAM_ABBREVIATION', 'GAME_DATE'], 
-                  how='left')
-    
-    # 6. Drop rows with missing lag features (e.g., first game of the season)
-    df = df.dropna(subset=[f'FPTS_{config.ROLLING_WINDOW_SHORT}G_AVG', 'FPTS_SEASON_AVG'])
+def add_team_features(df, team_games):
+    """Team and opponent context (win %, pace, fantasy points allowed), joined onto player rows by integer key."""
+    return join_team_context(df, team_games)
+
+def finalize_features(df):
+    """Drops rows missing lag features, then the leaky stats and metadata."""
+    # Drop rows with missing lag features (e.g., first game of the season)
+    df = df.dropna(subset=[window_feature('FANTASY_PTS', min(config.ROLLING_WINDOWS)), season_feature('FANTASY_PTS')])
+
+    # Safely drop only the columns that actually exist in the dataframe
+    cols_to_drop = LEAKY_BOX_SCORE_STATS + USELESS_METADATA
+    cols_to_drop = [col for col in cols_to_drop if col in df.columns]
+    return df.drop(columns=cols_to_drop)
+
+@instrumented('feature_build')
+def engineer_features(incremental=None, streaming=None):
+    """
+    Builds the Golden Table (training_features.csv) from every season of gamelogs.
+    With incremental=True, only games newer than the saved feature state are
+    processed and appended (same features up to row order and float rounding);
+    anything the state can't vouch for falls back to this full rebuild. With streaming=True the full rebuild runs out of core
+    (src/features/streaming.py), with the same result.
+    """
+    if incremental is None:
+        incremental = config.INCREMENTAL_FEATURES
+    if streaming is None:
+        streaming = config.STREAMING_FEATURES
+
+    if incremental:
+        # Imported here: incremental builds on the stage functions above
+        from src.features.incremental import update_features
+        if update_features():
+            return
+
+    if streaming:
+        from src.features.streaming import stream_features
+        stream_features()
+        return
+
+    print("🚀 Starting WNBA Feature Engineering Pipeline...")
+
+    # 1. Load ALL Available Historical Data
+    with stage('load') as timer:
+        df, file_rows = read_gamelog_files(gamelog_files())
+        timer.rows_out = len(df)
+    raw_df = df[['PLAYER_ID', 'GAME_DATE']].copy()
+
+    # 2. Apply Dynamic Scoring Rules (The Target)
+    # Every ruleset in config/scoring is scored in one pass -> FANTASY_PTS_<system>
+    # FANTASY_PTS stays the DEFAULT_SCORING_SYSTEM target
+    with stage('scoring', rows_in=len(df)) as timer:
+        df = score_fantasy_points(df)
+        timer.rows_out = len(df)
+
+    # Team-game table: built once per team per game from ALL player rows (before filtering),
+    # with MATCHUP parsed into OPP_TEAM_ID and season-to-date team/opponent context
+    with stage('team_games', rows_in=len(df)) as timer:
+        team_games = add_team_context(build_team_games(df))
+        timer.rows_out = len(team_games)
+
+    # 3. Filter the Noise (Min Games Threshold)
+    df = filter_min_games(df)
+
+    # 4. Sort chronologically to prevent data leakage (GAME_DATE was parsed on load)
+    df = df.sort_values(by=['PLAYER_ID', 'GAME_DATE'])
 
     # ==========================================
-    # 7. THE CLEAN-UP PHASE (Dropping the Noise)
+    # 5. FEATURE ENGINEERING BLOCK
+    # ==========================================
+    print("🧠 Engineering advanced predictive features...")
+    with stage('rolling_features', rows_in=len(df)) as timer:
+        df = add_player_features(df)
+        timer.rows_out = len(df)
+
+    # E. Team & Opponent Context (Rolling Win Percentage, Pace, Fantasy Points Allowed)
+    print("📈 Joining chronological team and opponent context...")
+    with stage('team_merge', rows_in=len(df)) as timer:
+        df = add_team_features(df, team_games)
+        timer.rows_out = len(df)
+
+    # Snapshot per-player/per-team state so tomorrow's run only touches new games
+    from src.features.incremental import save_feature_state
+    save_feature_state(df, raw_df, file_rows, team_games)
+
+    # ==========================================
+    # 6-7. THE CLEAN-UP PHASE (Dropping the Noise)
     # ==========================================
     print("🧹 Cleaning up raw stats and non-predictive columns...")
-    
-    # We drop the raw stats because they happen DURING the game. 
-    # If the model sees them, it's cheating (Data Leakage).
-    leaky_box_score_stats = [
-        'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FGM', 'FGA', 'FG_PCT', 
-        'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'PF', 
-        'PLUS_MINUS', 'MIN'
-    ]
-    
-    # We drop metadata that has no mathematical value to the algorithm
-    useless_metadata = ['TEAM_ABBREVIATION', 'TEAM_NAME', 'MATCHUP', 'WL', 'VIDEO_AVAILABLE', 'scraped_at', 'SCRAPED_AT']
-    
-    cols_to_drop = leaky_box_score_stats + useless_metadata
-    
-    # Safely drop only the columns that actually exist in the dataframe
-    cols_to_drop = [col for col in cols_to_drop if col in df.columns]
-    df = df.drop(columns=cols_to_drop)
+    df = finalize_features(df)
+
+    # 8. Save the "Golden Table" (season-partitioned Parquet + CSV export)
+    with stage('save', rows_in=len(df)):
+        output_path = storage.save_golden_table(df)
 
-    # 8. Save the "Golden Table"
-    output_path = config.PROCESSED_DATA_DIR / "training_features.csv"
-    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
-    df.to_csv(output_path, index=False)
+        # 9. Refresh the point-in-time feature store (sorted, memory-mapped as-of index)
+        build_feature_store(df)
     
     print(f"✅ Feature Engineering Complete! Baseline dataset saved to: {output_path}")
     print(f"📊 Final Dataset Shape: {df.shape}")
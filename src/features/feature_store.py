@@ -0,0 +1,580 @@
+import os
+import sys
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+from src.features.rolling import window_feature, ewm_feature, season_feature
+from src.features.team_context import (
+    TEAM_CONTEXT_COLUMNS, TEAM_RUNNING_STATS, OPPONENT_FEATURES, context_from_state
+)
+from src.features.scoring import is_target_column
+
+# Bump whenever the on-disk layout changes
+STORE_VERSION = 1
+
+# Composite sort key: ID * DAY_SPAN + days since 1970-01-01.
+# One int64 per row keeps (ID, GAME_DATE) lexicographic order, so a single
+# np.searchsorted answers an as-of lookup.
+DAY_SPAN = 1 << 20
+
+# Identity/date columns the keys are built from (never stored as features)
+KEY_COLUMNS = ['PLAYER_ID', 'GAME_DATE']
+
+# Columns that describe the team's game rather than the player's (team/date index)
+TEAM_COLUMNS = TEAM_CONTEXT_COLUMNS
+
+def feature_store_dir():
+    return config.PROCESSED_DATA_DIR / config.FEATURE_STORE_NAME
+
+def _days(dates):
+    """Dates (anything pandas understands) -> int64 days since the epoch."""
+    return pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+def _keys(ids, days):
+    return np.asarray(ids, dtype=np.int64) * DAY_SPAN + np.asarray(days, dtype=np.int64)
+
+def _target_columns(df):
+    return [col for col in df.columns if is_target_column(col)]
+
+def _store_columns(df):
+    """(feature columns, target columns): every numeric non-key column, targets apart."""
+    target_cols = _target_columns(df)
+    feature_cols = [
+        col for col in df.select_dtypes(include=['number']).columns
+        if col not in KEY_COLUMNS + target_cols
+    ]
+    return feature_cols, target_cols
+
+def _start_store():
+    """Empty temp dir next to the store; _finish_store() swaps it in."""
+    store_dir = feature_store_dir()
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+    return tmp_dir
+
+def _finish_store(tmp_dir, fingerprint, rows, feature_cols, target_cols):
+    with open(tmp_dir / "meta.json", 'w') as file:
+        json.dump({
+            'version': STORE_VERSION,
+            'golden_table_fingerprint': fingerprint,
+            'rows': int(rows),
+            'feature_columns': feature_cols,
+            'target_columns': target_cols,
+        }, file, indent=2)
+
+    # Written to a temp dir and swapped in, so open readers never see a half-built store
+    store_dir = feature_store_dir()
+    if store_dir.exists():
+        shutil.rmtree(store_dir)
+    os.replace(tmp_dir, store_dir)
+    print(f"✅ Feature store ready: {rows} rows x {len(feature_cols)} features -> {store_dir}")
+
+def build_feature_store(df=None):
+    """
+    Writes the feature store from the Golden Table:
+    - player_keys.npy: sorted (PLAYER_ID, GAME_DATE) keys, one per row
+    - features.npy / targets.npy: the numeric feature and target columns, same row order
+    - team_keys.npy / team_rows.npy: sorted (TEAM_ID, GAME_DATE) keys -> a row of that team game
+    Everything is plain .npy so readers memory-map it instead of parsing.
+    """
+    print("🗄️ Building the point-in-time feature store...")
+    fingerprint = storage.golden_table_fingerprint()
+    if df is None:
+        df = storage.load_golden_table()
+
+    df = df.sort_values(by=KEY_COLUMNS, kind='stable').reset_index(drop=True)
+    days = _days(df['GAME_DATE'])
+    player_keys = _keys(df['PLAYER_ID'], days)
+    feature_cols, target_cols = _store_columns(df)
+
+    # Team games: keep the first player row of each (TEAM_ID, GAME_DATE)
+    team_keys = _keys(df['TEAM_ID'], days)
+    team_order = np.argsort(team_keys, kind='stable')
+    unique_keys, first = np.unique(team_keys[team_order], return_index=True)
+
+    tmp_dir = _start_store()
+    np.save(tmp_dir / "player_keys.npy", player_keys)
+    np.save(tmp_dir / "features.npy", df[feature_cols].to_numpy(dtype=np.float64))
+    np.save(tmp_dir / "targets.npy", df[target_cols].to_numpy(dtype=np.float64))
+    np.save(tmp_dir / "team_keys.npy", unique_keys)
+    np.save(tmp_dir / "team_rows.npy", team_order[first].astype(np.int64))
+    _finish_store(tmp_dir, fingerprint, len(df), feature_cols, target_cols)
+
+class FeatureStoreWriter:
+    """
+    Writes the same feature store as build_feature_store() one chunk of
+    Golden Table rows at a time, for the streaming build. Chunks must arrive
+    in (PLAYER_ID, GAME_DATE) order. Each chunk is spooled to .npy parts;
+    finish() copies them into memory-mapped arrays of the final size, so
+    only one chunk is ever in memory.
+    """
+    def __init__(self):
+        self.tmp_dir = _start_store()
+        self.parts_dir = self.tmp_dir / "parts"
+        os.makedirs(self.parts_dir)
+        self.feature_cols = None
+        self.target_cols = None
+        self.part_rows = []
+        # Per chunk: its distinct team-game keys and the first global row of each
+        self.team_keys = []
+        self.team_rows = []
+
+    @property
+    def rows(self):
+        return sum(self.part_rows)
+
+    def _part(self, n, name):
+        return self.parts_dir / f"part-{n:05d}-{name}.npy"
+
+    def append(self, df):
+        if self.feature_cols is None:
+            self.feature_cols, self.target_cols = _store_columns(df)
+
+        n = len(self.part_rows)
+        days = _days(df['GAME_DATE'])
+        np.save(self._part(n, "player_keys"), _keys(df['PLAYER_ID'], days))
+        np.save(self._part(n, "features"), df[self.feature_cols].to_numpy(dtype=np.float64))
+        np.save(self._part(n, "targets"), df[self.target_cols].to_numpy(dtype=np.float64))
+
+        keys, first = np.unique(_keys(df['TEAM_ID'], days), return_index=True)
+        self.team_keys.append(keys)
+        self.team_rows.append(first.astype(np.int64) + self.rows)
+        self.part_rows.append(len(df))
+
+    def finish(self):
+        """Assembles the store and swaps it in. Call once the Golden Table is saved (the store records its fingerprint)."""
+        print("🗄️ Assembling the point-in-time feature store...")
+        fingerprint = storage.golden_table_fingerprint()
+        feature_cols, target_cols = self.feature_cols or [], self.target_cols or []
+
+        # 1. Player keys, features and targets: parts copied into the full-size files in order
+        for name, width in [("player_keys", None), ("features", len(feature_cols)), ("targets", len(target_cols))]:
+            shape = (self.rows,) if width is None else (self.rows, width)
+            dtype = np.int64 if width is None else np.float64
+            out = np.lib.format.open_memmap(self.tmp_dir / f"{name}.npy", mode='w+', dtype=dtype, shape=shape)
+            offset = 0
+            for n, rows in enumerate(self.part_rows):
+                out[offset:offset + rows] = np.load(self._part(n, name))
+                offset += rows
+            out.flush()
+            del out
+
+        # 2. Team games: a team game can span chunks, so keep its lowest row overall
+        # (the first row, as in build_feature_store())
+        team_keys = np.concatenate(self.team_keys) if self.team_keys else np.zeros(0, dtype=np.int64)
+        team_rows = np.concatenate(self.team_rows) if self.team_rows else np.zeros(0, dtype=np.int64)
+        order = np.lexsort((team_rows, team_keys))
+        unique_keys, first = np.unique(team_keys[order], return_index=True)
+        np.save(self.tmp_dir / "team_keys.npy", unique_keys)
+        np.save(self.tmp_dir / "team_rows.npy", team_rows[order][first])
+
+        shutil.rmtree(self.parts_dir)
+        _finish_store(self.tmp_dir, fingerprint, self.rows, feature_cols, target_cols)
+
+# --- POST-GAME STATE (dates after a player's last game) ---
+
+def _trailing_mean(values, window):
+    """Mean of the last `window` non-NaN values (NaN if there are none)."""
+    past = [v for v in values[-window:] if not np.isnan(v)]
+    return float(np.mean(past)) if past else np.nan
+
+class PlayerFeatureState:
+    """
+    Every player's latest pre-game state as flat NumPy arrays, built from the
+    incremental feature state (feature_state.json). Feature rows for any
+    upcoming game are a handful of vectorized ops away.
+    """
+    def __init__(self, state):
+        players = state['players']
+        teams = state['teams']
+
+        self.player_ids = np.array([int(pid) for pid in players], dtype=np.int64)
+        self.row_of = {pid: row for row, pid in enumerate(self.player_ids)}
+        self.last_game_date = state['last_game_date']
+
+        records = list(players.values())
+        self.last_day = pd.to_datetime([p['last_game_date'] for p in records]).values.astype('datetime64[D]')
+        self.season = np.array([p['season'] for p in records], dtype=np.int64)
+
+        # Form features carry across seasons; season averages only count within one
+        self.form = {}
+        self.season_avgs = {}
+        for stat in config.ROLLING_STATS:
+            for w in config.ROLLING_WINDOWS:
+                self.form[window_feature(stat, w)] = np.array([_trailing_mean(p['recent'][stat], w) for p in records])
+            for span in config.ROLLING_EWMA_SPANS:
+                sums = np.array([p['ewm'][stat][str(span)] for p in records], dtype=np.float64).reshape(-1, 2)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    self.form[ewm_feature(stat, span)] = np.where(sums[:, 1] > 0, sums[:, 0] / sums[:, 1], np.nan)
+
+            season_sum = np.array([p['season_sum'][stat] for p in records], dtype=np.float64)
+            season_count = np.array([p['season_count'][stat] for p in records], dtype=np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.season_avgs[season_feature(stat)] = np.where(season_count > 0, season_sum / season_count, np.nan)
+
+        # Each player's current team (TEAM_ID feeds the model directly) and every team's running context
+        self.team_id = np.array([p.get('team_id') or 0 for p in records], dtype=np.int64)
+        self.teams = teams
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def rows(self, player_ids):
+        """State row of each player (-1 for players the state has never seen)."""
+        return np.array([self.row_of.get(int(pid), -1) for pid in player_ids], dtype=np.int64)
+
+    def team_context(self, team_ids, season):
+        """TEAM_* context of each team's next game, computed once per distinct team."""
+        unique, inverse = np.unique(np.asarray(team_ids, dtype=np.int64), return_inverse=True)
+        contexts = [context_from_state(self.teams, team_id, season) for team_id in unique]
+        return {
+            name: np.array([context[name] for context in contexts], dtype=np.float64)[inverse]
+            for name in TEAM_RUNNING_STATS
+        }
+
+    def features(self, rows, game_date, is_home, opp_team_ids=None):
+        """
+        Feature columns for each player's next game, computed exactly like the
+        feature build (only games before game_date count). Without opponents
+        the OPP_* features are missing (NaN), as for unknown opponents in training.
+        Returns {name: array}.
+        """
+        game_day = np.datetime64(pd.Timestamp(game_date).date(), 'D')
+        game_year = pd.Timestamp(game_date).year
+
+        days_rest = (game_day - self.last_day[rows]).astype(np.float64)
+        same_season = self.season[rows] == game_year
+
+        columns = {
+            'TEAM_ID': self.team_id[rows].astype(np.float64),
+            'IS_HOME': np.broadcast_to(np.asarray(is_home, dtype=np.float64), rows.shape),
+            'DAYS_REST': days_rest,
+            'IS_BACK_TO_BACK': (days_rest <= 1).astype(np.float64),
+        }
+        columns.update(self.team_context(self.team_id[rows], game_year))
+
+        # Opponent context: the opponent's own TEAM_* values for its next game
+        if opp_team_ids is None:
+            opp_team_ids = np.full(len(rows), -1, dtype=np.int64)
+        opp_team_ids = np.broadcast_to(np.asarray(opp_team_ids, dtype=np.int64), rows.shape)
+        columns['OPP_TEAM_ID'] = opp_team_ids.astype(np.float64)
+        for name, values in self.team_context(opp_team_ids, game_year).items():
+            columns[OPPONENT_FEATURES[name]] = np.where(opp_team_ids >= 0, values, np.nan)
+
+        for name, values in self.form.items():
+            columns[name] = values[rows]
+        # A new season starts the season averages (and team record) from scratch
+        for name, values in self.season_avgs.items():
+            columns[name] = np.where(same_season, values[rows], np.nan)
+        return columns
+
+class FeatureStore:
+    """
+    Read-only, memory-mapped view of the feature store.
+
+    Every Golden Table row holds PRE-game features (built only from earlier
+    games), so the row of a game played on date D is exactly what was known
+    before tip-off on D. Other dates are answered without leakage too:
+    between two stored games of one season, from the next game's pre-game
+    row (it only counts games up to the previous one); after the last stored
+    game, by rolling the saved feature state forward like the prediction
+    server does. Across a season break they are misses: a season's first
+    game has no row (no season average yet), so the next row would count a
+    game played after D. Targets are never returned by the as-of methods;
+    use frame() for training data.
+    """
+    def __init__(self, store_dir=None):
+        store_dir = store_dir or feature_store_dir()
+        with open(store_dir / "meta.json", 'r') as file:
+            self.meta = json.load(file)
+
+        self.feature_columns = self.meta['feature_columns']
+        self.target_columns = self.meta['target_columns']
+        self.player_keys = np.load(store_dir / "player_keys.npy", mmap_mode='r')
+        self.features = np.load(store_dir / "features.npy", mmap_mode='r')
+        self.targets = np.load(store_dir / "targets.npy", mmap_mode='r')
+        self.team_keys = np.load(store_dir / "team_keys.npy", mmap_mode='r')
+        self.team_rows = np.load(store_dir / "team_rows.npy", mmap_mode='r')
+        self._column_index = {col: i for i, col in enumerate(self.feature_columns)}
+        self._player_state = None
+        self._state_loaded = False
+
+    def __len__(self):
+        return len(self.player_keys)
+
+    @staticmethod
+    def _asof_rows(sorted_keys, ids, dates, inclusive):
+        """Binary search: the last key with the same ID on/before (or strictly before) each date."""
+        ids = np.asarray(ids, dtype=np.int64)
+        query = _keys(ids, _days(dates))
+        pos = np.searchsorted(sorted_keys, query, side='right' if inclusive else 'left') - 1
+
+        found = pos >= 0
+        found[found] = sorted_keys[pos[found]] // DAY_SPAN == ids[found]
+        return np.where(found, pos, -1)
+
+    @staticmethod
+    def _match(sorted_keys, ids, dates):
+        """
+        Splits (ID, date) pairs by what the store knows about them. Returns
+        (pos, game_day, after_last): the last key on/before each date, whether
+        that key is a game on the date itself, and whether the date is past
+        the ID's last stored game.
+        """
+        pos = FeatureStore._asof_rows(sorted_keys, ids, dates, inclusive=True)
+        found = pos >= 0
+        key = sorted_keys[np.maximum(pos, 0)] if len(sorted_keys) else np.zeros(len(pos), dtype=np.int64)
+        game_day = found & (key % DAY_SPAN == _days(dates))
+
+        next_key = sorted_keys[np.minimum(pos + 1, len(sorted_keys) - 1)] if len(sorted_keys) else key
+        is_last = (pos + 1 == len(sorted_keys)) | (next_key // DAY_SPAN != key // DAY_SPAN)
+        return pos, game_day, found & ~game_day & is_last
+
+    def state(self):
+        """The saved feature state as a PlayerFeatureState (None without one), loaded on first use."""
+        if not self._state_loaded:
+            # Imported here: incremental imports the feature build, which imports this module
+            from src.features.incremental import load_feature_state
+            state = load_feature_state()
+            self._player_state = PlayerFeatureState(state) if state is not None else None
+            self._state_loaded = True
+        return self._player_state
+
+    def lookup(self, player_ids, dates, inclusive=True):
+        """Row index of each player's latest game on/before each date (-1 if none). O(log n) each."""
+        return self._asof_rows(self.player_keys, player_ids, dates, inclusive)
+
+    def _gather(self, rows, columns):
+        columns = columns or self.feature_columns
+        index = [self._column_index[col] for col in columns]
+        values = np.full((len(rows), len(index)), np.nan)
+        hit = rows >= 0
+        values[hit] = self.features[rows[hit]][:, index]
+        return pd.DataFrame(values, columns=columns)
+
+    def _team_context(self, team_ids, dates):
+        """
+        TEAM_* context of each (team, date) pair as of that date: the pre-game
+        row of the team's game on that date, or of its next stored game when
+        the previous one is in the same season; past its last stored game, the
+        saved team state. NaN otherwise (season breaks, unknown teams).
+        Returns {name: array}.
+        """
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        days = _days(dates)
+        years = pd.to_datetime(days, unit='D').year.to_numpy()
+        context = {name: np.full(len(team_ids), np.nan) for name in TEAM_RUNNING_STATS}
+        if not len(self.team_keys):
+            return context
+
+        pos = np.searchsorted(self.team_keys, _keys(team_ids, days), side='left')
+        next_key = self.team_keys[np.minimum(pos, len(self.team_keys) - 1)]
+        prev_key = self.team_keys[np.maximum(pos - 1, 0)]
+        has_next = (pos < len(self.team_keys)) & (next_key // DAY_SPAN == team_ids)
+        has_prev = (pos > 0) & (prev_key // DAY_SPAN == team_ids)
+
+        # 1. Game on the date, or the next one within a season: its pre-game context only counts games up to the date
+        next_year = pd.to_datetime(next_key % DAY_SPAN, unit='D').year.to_numpy()
+        prev_year = pd.to_datetime(prev_key % DAY_SPAN, unit='D').year.to_numpy()
+        use_next = has_next & ((next_key % DAY_SPAN == days) | (has_prev & (prev_year == next_year)))
+        rows = np.where(use_next, self.team_rows[np.minimum(pos, len(self.team_keys) - 1)], -1)
+        names = [name for name in TEAM_RUNNING_STATS if name in self._column_index]
+        stored = self._gather(rows, names)
+        for name in names:
+            context[name] = stored[name].to_numpy(copy=True)
+
+        # 2. Past the team's last stored game: its running state, once per (team, season)
+        after_last = np.flatnonzero(~has_next & has_prev)
+        state = self.state()
+        if state is not None and len(after_last):
+            pairs, inverse = np.unique(np.column_stack([team_ids[after_last], years[after_last]]), axis=0, return_inverse=True)
+            contexts = [context_from_state(state.teams, team_id, season) for team_id, season in pairs]
+            for name in TEAM_RUNNING_STATS:
+                context[name][after_last] = np.array([c[name] for c in contexts], dtype=np.float64)[inverse.reshape(-1)]
+        return context
+
+    def _pre_game(self, player_ids, dates, rows, between, after_last, is_home, opp_team_ids):
+        """
+        Feature columns of (player, date) pairs with no game on that date,
+        from the player's last stored game on/before it (`rows`):
+        - between two stored games of one season: form and season columns
+          from the next game's pre-game row
+        - after the last stored game: form and season columns rolled forward
+          from the feature state (pairs whose state doesn't match the store stay NaN)
+        DAYS_REST counts from the last game; team and opponent context come
+        from _team_context(). Returns ({column: array}, mask of pairs filled).
+        """
+        n = len(player_ids)
+        days = _days(dates)
+        years = pd.to_datetime(days, unit='D').year.to_numpy()
+        last_day = self.player_keys[np.maximum(rows, 0)] % DAY_SPAN
+        columns = {col: np.full(n, np.nan) for col in self.feature_columns}
+
+        form_cols = [window_feature(stat, w) for stat in config.ROLLING_STATS for w in config.ROLLING_WINDOWS]
+        form_cols += [ewm_feature(stat, span) for stat in config.ROLLING_STATS for span in config.ROLLING_EWMA_SPANS]
+        season_cols = [season_feature(stat) for stat in config.ROLLING_STATS]
+
+        # 1. Between games: the next game's row only counts games up to the last one
+        next_rows = np.where(between, rows + 1, -1)
+        stored = self._gather(next_rows, [col for col in form_cols + season_cols if col in self._column_index])
+        for col in stored.columns:
+            columns[col] = stored[col].to_numpy(copy=True)
+
+        # 2. After the last game: the saved state, if it ends on the same game as the store
+        rolled = after_last.copy()
+        state = self.state()
+        if state is None:
+            rolled[:] = False
+        elif rolled.any():
+            state_rows = state.rows(player_ids)
+            rolled &= state_rows >= 0
+            rolled[rolled] = state.last_day[state_rows[rolled]].astype(np.int64) == last_day[rolled]
+            state_rows = state_rows[rolled]
+            same_season = state.season[state_rows] == years[rolled]
+            for col, values in state.form.items():
+                if col in columns:
+                    columns[col][rolled] = values[state_rows]
+            for col, values in state.season_avgs.items():
+                if col in columns:
+                    columns[col][rolled] = np.where(same_season, values[state_rows], np.nan)
+
+        # 3. Rest, season, home/away and team/opponent context of the game on that date
+        filled = between | rolled
+        team_index = self._column_index.get('TEAM_ID')
+        team_ids = (self.features[np.maximum(rows, 0), team_index].astype(np.int64)
+                    if team_index is not None else np.zeros(n, dtype=np.int64))
+        opp_team_ids = np.broadcast_to(np.asarray(-1 if opp_team_ids is None else opp_team_ids, dtype=np.int64), (n,))
+        days_rest = (days - last_day).astype(np.float64)
+        common = {
+            'TEAM_ID': team_ids.astype(np.float64),
+            'IS_HOME': np.broadcast_to(np.asarray(is_home, dtype=np.float64), (n,)),
+            'DAYS_REST': days_rest,
+            'IS_BACK_TO_BACK': (days_rest <= 1).astype(np.float64),
+            'SEASON': years.astype(np.float64),
+            'OPP_TEAM_ID': opp_team_ids.astype(np.float64),
+        }
+        common.update(self._team_context(team_ids, dates))
+        for name, values in self._team_context(opp_team_ids, dates).items():
+            common[OPPONENT_FEATURES[name]] = np.where(opp_team_ids >= 0, values, np.nan)
+        for col, values in common.items():
+            if col in columns:
+                columns[col] = np.asarray(values, dtype=np.float64).copy()
+
+        for col in columns:
+            columns[col][~filled] = np.nan
+        return columns, filled
+
+    def _asof_features(self, player_ids, dates, columns, is_home, opp_team_ids):
+        """(features DataFrame, last game row on/before each date, mask of pairs answered)."""
+        rows, game_day, after_last = self._match(self.player_keys, player_ids, dates)
+        result = self._gather(np.where(game_day, rows, -1), columns)
+
+        # Between two games of one season (no unstored season opener in the gap)
+        next_key = self.player_keys[np.minimum(rows + 1, len(self) - 1)] if len(self) else rows
+        prev_key = self.player_keys[np.maximum(rows, 0)] if len(self) else rows
+        same_season = (pd.to_datetime(next_key % DAY_SPAN, unit='D').year
+                       == pd.to_datetime(prev_key % DAY_SPAN, unit='D').year)
+        between = (rows >= 0) & ~game_day & ~after_last & np.asarray(same_season)
+        hit = game_day.copy()
+        if (between | after_last).any():
+            values, filled = self._pre_game(player_ids, dates, rows, between, after_last, is_home, opp_team_ids)
+            for col in result.columns:
+                result.loc[filled, col] = values[col][filled]
+            hit |= filled
+        return result, rows, hit
+
+    def asof(self, player_ids, dates, columns=None, is_home=np.nan, opp_team_ids=None):
+        """
+        Pre-game feature rows of each (player, date) pair. `dates` (and
+        is_home / opp_team_ids, which only apply on dates the player has no
+        stored game) is one value for everyone or one per player. ASOF_DATE is
+        the date of the player's last game on/before the date. Misses (no game
+        before the date, or a season break) are NaN.
+        """
+        player_ids = np.asarray(player_ids, dtype=np.int64)
+        dates = np.broadcast_to(np.asarray(dates, dtype='datetime64[ns]'), player_ids.shape)
+        result, rows, hit = self._asof_features(player_ids, dates, columns, is_home, opp_team_ids)
+
+        # Date of the game each row came from (NaT for misses)
+        asof_dates = pd.to_datetime(self.player_keys[np.maximum(rows, 0)] % DAY_SPAN, unit='D').where(hit)
+        result.insert(0, 'ASOF_DATE', asof_dates)
+        result.insert(0, 'PLAYER_ID', player_ids)
+        return result
+
+    def team_asof(self, team_ids, dates, columns=None):
+        """
+        Team-level features (TEAM_COLUMNS) of each (team, date) pair: the
+        stored team game on that date, or else the team's context as of the
+        date (see _team_context(); the opponent is unknown, so OPP_* is NaN).
+        """
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        dates = np.broadcast_to(np.asarray(dates, dtype='datetime64[ns]'), team_ids.shape)
+        pos, game_day, _ = self._match(self.team_keys, team_ids, dates)
+        rows = np.where(game_day, self.team_rows[np.maximum(pos, 0)], -1)
+
+        result = self._gather(rows, columns or [col for col in TEAM_COLUMNS if col in self._column_index])
+        context = self._team_context(team_ids, dates)
+        context['OPP_TEAM_ID'] = np.full(len(team_ids), -1.0)
+        for col in result.columns:
+            if col in context:
+                result.loc[~game_day, col] = context[col][~game_day]
+        result.insert(0, 'TEAM_ID', team_ids)
+        return result
+
+    def asof_join(self, slate, columns=None, player_col='PLAYER_ID', date_col='GAME_DATE'):
+        """
+        Bulk as-of join: appends every player's pre-game features for the
+        slate row's date, on any date (the slate's IS_HOME / OPP_TEAM_ID
+        columns, when it has them, fill in days the player has no stored game).
+        Misses are NaN, as in asof().
+        """
+        player_ids = slate[player_col].to_numpy(dtype=np.int64)
+        dates = slate[date_col].to_numpy(dtype='datetime64[ns]')
+        is_home = slate['IS_HOME'].to_numpy(dtype=np.float64) if 'IS_HOME' in slate else np.nan
+        opp_team_ids = slate['OPP_TEAM_ID'].fillna(-1).to_numpy(dtype=np.int64) if 'OPP_TEAM_ID' in slate else None
+
+        features, _, _ = self._asof_features(player_ids, dates, columns, is_home, opp_team_ids)
+        features.index = slate.index
+        return pd.concat([slate, features], axis=1)
+
+    def frame(self, columns=None, targets=None):
+        """Columns of every row as a DataFrame in (PLAYER_ID, GAME_DATE) order."""
+        df = pd.DataFrame({
+            'PLAYER_ID': self.player_keys // DAY_SPAN,
+            'GAME_DATE': pd.to_datetime(self.player_keys % DAY_SPAN, unit='D'),
+        })
+        rows = np.arange(len(self))
+        df = pd.concat([df, self._gather(rows, columns)], axis=1)
+        for col in self.target_columns if targets is None else targets:
+            df[col] = self.targets[:, self.target_columns.index(col)]
+        return df
+
+def open_feature_store(rebuild_if_stale=True):
+    """Opens the feature store, rebuilding it first if the Golden Table changed since."""
+    meta_path = feature_store_dir() / "meta.json"
+    stale = True
+    if meta_path.exists():
+        with open(meta_path, 'r') as file:
+            meta = json.load(file)
+        stale = (meta.get('version') != STORE_VERSION
+                 or meta.get('golden_table_fingerprint') != storage.golden_table_fingerprint())
+
+    if stale:
+        if not rebuild_if_stale:
+            raise FileNotFoundError(f"❌ Feature store at {feature_store_dir()} is missing or stale.")
+        build_feature_store()
+    return FeatureStore()
+
+if __name__ == "__main__":
+    build_feature_store()
@@ -0,0 +1,335 @@
+import os
+import sys
+import json
+import hashlib
+import pandas as pd
+import numpy as np
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+from src.features.scoring import score_fantasy_points
+from src.features.rolling import (
+    group_row_starts, ewm_sums, rolling_feature_names, window_feature, ewm_feature, season_feature
+)
+from src.features.team_context import build_team_games, join_team_context, team_state_from_games, advance_team_state
+from src.features.build_features import gamelog_files, read_gamelog_files, finalize_features
+from src.instrumentation import stage
+
+# Bump whenever the meaning of the saved state (or of a feature) changes
+STATE_VERSION = 4
+STATE_FILENAME = "feature_state.json"
+
+def _state_signature():
+    """Everything the saved state depends on. Any change forces a full rebuild."""
+    scoring_hashes = {
+        name: hashlib.md5((config.SCORING_DIR / f"{name}.yml").read_bytes()).hexdigest()
+        for name in config.list_scoring_systems()
+    }
+    return {
+        'version': STATE_VERSION,
+        'scoring_systems': scoring_hashes,
+        'default_scoring_system': config.DEFAULT_SCORING_SYSTEM,
+        'rolling': {
+            'stats': config.ROLLING_STATS,
+            'windows': config.ROLLING_WINDOWS,
+            'ewma_spans': config.ROLLING_EWMA_SPANS,
+        },
+        'min_games': config.MIN_GAMES_THRESHOLD,
+    }
+
+def _file_key(path):
+    # Relative to the raw dir: Parquet partitions all share the part-N.parquet basenames
+    return os.path.relpath(path, config.RAW_DATA_DIR)
+
+def _file_fingerprint(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def save_feature_state(df, raw_df, file_rows, team_games):
+    """
+    Snapshots the per-player and per-team state behind every rolling feature.
+    `df` is the feature table before the clean-up phase (all valid player rows,
+    sorted by PLAYER_ID/GAME_DATE), `raw_df` the unfiltered gamelogs,
+    `file_rows` the row count of each gamelog file that was read and
+    `team_games` the team-game table (src/features/team_context.py).
+    """
+    write_feature_state(player_state(df), raw_df['GAME_DATE'].max(), file_rows,
+                        raw_df['PLAYER_ID'].value_counts(), team_games)
+
+def player_state(df):
+    """
+    Per-player state (keyed by str(PLAYER_ID)) from feature rows sorted by
+    PLAYER_ID/GAME_DATE. Each player's entry only needs that player's rows,
+    so streaming builds compute it bucket by bucket.
+    """
+    stats, spans = config.ROLLING_STATS, config.ROLLING_EWMA_SPANS
+    max_window = max(config.ROLLING_WINDOWS, default=0)
+
+    # A. Players: last N values of each rolling stat, EWMA sums, season running sums/counts,
+    # last game date and team
+    last_rows = df.groupby('PLAYER_ID').tail(max_window)
+    recent = {stat: last_rows.groupby('PLAYER_ID')[stat].agg(list) for stat in stats}
+    latest = df.groupby('PLAYER_ID').agg(
+        last_game_date=('GAME_DATE', 'last'),
+        season=('SEASON', 'last'),
+        team=('TEAM_ABBREVIATION', 'last'),
+        team_id=('TEAM_ID', 'last')
+    )
+    season_totals = df[stats].astype(np.float64).groupby([df['PLAYER_ID'], df['SEASON']]).agg(['sum', 'count'])
+
+    # EWMA numerator/denominator through each player's latest game (same kernel as the full build)
+    player_starts = group_row_starts(df['PLAYER_ID'].to_numpy())
+    is_last = np.r_[player_starts[1:] != player_starts[:-1], True]
+    ewm = {
+        (stat, span): np.column_stack(ewm_sums(df[stat].to_numpy(dtype=np.float64), player_starts, span))[is_last]
+        for stat in stats for span in spans
+    }
+
+    players = {}
+    for i, (pid, row) in enumerate(latest.iterrows()):
+        totals = season_totals.loc[(pid, row['season'])]
+        players[str(pid)] = {
+            'last_game_date': row['last_game_date'].strftime('%Y-%m-%d'),
+            'team': row['team'],
+            'team_id': int(row['team_id']),
+            'season': int(row['season']),
+            'recent': {stat: [float(v) for v in recent[stat].get(pid, [])] for stat in stats},
+            'ewm': {stat: {str(span): [float(v) for v in ewm[(stat, span)][i]] for span in spans} for stat in stats},
+            'season_sum': {stat: float(totals[(stat, 'sum')]) for stat in stats},
+            'season_count': {stat: int(totals[(stat, 'count')]) for stat in stats},
+        }
+    return players
+
+def write_feature_state(players, last_game_date, file_rows, player_game_counts, team_games):
+    """
+    Saves the feature state: `players` from player_state(), the latest raw
+    game date, each gamelog file's row count, every player's raw game count
+    (a PLAYER_ID -> count Series) and the team-game table.
+    """
+    # B. Teams: running sums behind the season-to-date team context, latest season only
+    teams = team_state_from_games(team_games)
+
+    state = {
+        'signature': _state_signature(),
+        # Watermark over ALL raw rows, so sub-threshold players' games aren't re-read as new
+        'last_game_date': last_game_date.strftime('%Y-%m-%d'),
+        'files': {
+            _file_key(path): {'fingerprint': _file_fingerprint(path), 'rows': int(rows)}
+            for path, rows in file_rows.items()
+        },
+        'player_game_counts': {str(pid): int(n) for pid, n in player_game_counts.items()},
+        'players': players,
+        'teams': teams,
+    }
+    _write_state(state)
+
+def load_feature_state():
+    """Returns the saved feature state, or None if there isn't one."""
+    state_path = config.PROCESSED_DATA_DIR / STATE_FILENAME
+    if not state_path.exists():
+        return None
+    with open(state_path, 'r') as file:
+        return json.load(file)
+
+def _write_state(state):
+    state_path = config.PROCESSED_DATA_DIR / STATE_FILENAME
+    os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
+    tmp_path = state_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as file:
+        json.dump(state, file)
+    # Atomic swap so a crash never leaves a half-written state behind
+    os.replace(tmp_path, state_path)
+
+def _empty_player():
+    stats, spans = config.ROLLING_STATS, config.ROLLING_EWMA_SPANS
+    return {
+        'last_game_date': None, 'team': None, 'team_id': None, 'season': None,
+        'recent': {stat: [] for stat in stats},
+        'ewm': {stat: {str(span): [0.0, 0.0] for span in spans} for stat in stats},
+        'season_sum': {stat: 0.0 for stat in stats},
+        'season_count': {stat: 0 for stat in stats},
+    }
+
+def _advance_players(new, players):
+    """Computes player features for the new rows (sorted by PLAYER_ID, GAME_DATE) and rolls the state forward."""
+    stats, windows, spans = config.ROLLING_STATS, config.ROLLING_WINDOWS, config.ROLLING_EWMA_SPANS
+    max_window = max(windows, default=0)
+    decays = {span: 1.0 - 2.0 / (span + 1.0) for span in spans}
+
+    features = {name: [] for name in rolling_feature_names()}
+    days_rest = []
+
+    columns = ['PLAYER_ID', 'GAME_DATE', 'SEASON', 'TEAM_ABBREVIATION', 'TEAM_ID'] + stats
+    for pid, game_date, season, team, team_id, *values in zip(*(new[col] for col in columns)):
+        player = players.setdefault(str(pid), _empty_player())
+
+        if player['last_game_date'] is None:
+            days_rest.append(7.0)
+        else:
+            days_rest.append(float((game_date - pd.Timestamp(player['last_game_date'])).days))
+
+        if player['season'] != season:
+            player.update(season=int(season),
+                          season_sum={stat: 0.0 for stat in stats},
+                          season_count={stat: 0 for stat in stats})
+
+        for stat, value in zip(stats, values):
+            value = float(value)
+            valid = not np.isnan(value)
+
+            # Features use only games strictly before this one (the .shift(1) of the full build)
+            recent = player['recent'][stat]
+            for w in windows:
+                past = [v for v in recent[-w:] if not np.isnan(v)]
+                features[window_feature(stat, w)].append(np.mean(past) if past else np.nan)
+
+            for span in spans:
+                num, den = player['ewm'][stat][str(span)]
+                features[ewm_feature(stat, span)].append(num / den if den > 0 else np.nan)
+                player['ewm'][stat][str(span)] = [decays[span] * num + (value if valid else 0.0),
+                                                  decays[span] * den + valid]
+
+            count = player['season_count'][stat]
+            features[season_feature(stat)].append(player['season_sum'][stat] / count if count else np.nan)
+
+            # Roll the state forward past this game
+            player['recent'][stat] = (recent + [value])[-max_window:] if max_window else []
+            if valid:
+                player['season_sum'][stat] += value
+                player['season_count'][stat] += 1
+
+        player['last_game_date'] = game_date.strftime('%Y-%m-%d')
+        player['team'] = team
+        player['team_id'] = int(team_id)
+
+    new['IS_HOME'] = np.where(new['MATCHUP'].str.contains(' vs. '), 1, 0)
+    new['DAYS_REST'] = days_rest
+    new['IS_BACK_TO_BACK'] = np.where(new['DAYS_REST'] <= 1, 1, 0)
+    for name, values in features.items():
+        new[name] = values
+    return new
+
+def update_features():
+    """
+    Appends features for games newer than the saved state to the Golden Table.
+    Returns True when the table is up to date, False when the caller must run a
+    full rebuild instead (no state, changed config, rewritten history, or a
+    player crossing MIN_GAMES_THRESHOLD, which would backfill older rows).
+
+    The result matches a full rebuild up to row order and floating-point
+    rounding: new rows go at the end (a rebuild sorts every row by PLAYER_ID,
+    GAME_DATE), and the trailing means are summed game by game rather than by
+    the rolling kernel's prefix sums, so they can differ in the last bits
+    (~1e-14). The feature store and training matrix sort rows themselves.
+    """
+    print("🚀 Starting Incremental WNBA Feature Update...")
+
+    state = load_feature_state()
+
+    if state is None or not storage.golden_table_exists():
+        print("   ℹ️ No saved feature state. Falling back to a full rebuild.")
+        return False
+
+    if state['signature'] != _state_signature():
+        print("   ℹ️ Scoring/feature config changed since the last build. Falling back to a full rebuild.")
+        return False
+
+    # 1. Only read gamelog files that changed since the last build
+    files = gamelog_files()
+    known_files = state['files']
+    if set(known_files) - {_file_key(path) for path in files}:
+        print("   ⚠️ A previously built gamelog file is gone. Falling back to a full rebuild.")
+        return False
+
+    changed = [
+        path for path in files
+        if known_files.get(_file_key(path), {}).get('fingerprint') != _file_fingerprint(path)
+    ]
+    if not changed:
+        print("✅ Golden Table already up to date. No new gamelogs.")
+        return True
+
+    with stage('load') as timer:
+        df, file_rows = read_gamelog_files(changed)
+        timer.rows_out = len(df)
+    watermark = pd.Timestamp(state['last_game_date'])
+
+    # 2. History must be untouched: each changed file keeps exactly its old rows up to the watermark
+    offset = 0
+    for path in changed:
+        rows = file_rows[path]
+        old_rows = int((df['GAME_DATE'].iloc[offset:offset + rows] <= watermark).sum())
+        offset += rows
+        if old_rows != known_files.get(_file_key(path), {}).get('rows', 0):
+            print(f"   ⚠️ {_file_key(path)} rewrote games on/before {state['last_game_date']}. Falling back to a full rebuild.")
+            return False
+
+    new = df[df['GAME_DATE'] > watermark].copy()
+
+    # 3. A player crossing the Min Games Threshold would need their older rows backfilled
+    old_counts = {int(pid): n for pid, n in state['player_game_counts'].items()}
+    total_counts = dict(old_counts)
+    for pid, n in new['PLAYER_ID'].value_counts().items():
+        total_counts[int(pid)] = total_counts.get(int(pid), 0) + int(n)
+
+    crossed = [
+        pid for pid, n in total_counts.items()
+        if old_counts.get(pid, 0) < config.MIN_GAMES_THRESHOLD <= n
+    ]
+    if crossed:
+        print(f"   ℹ️ {len(crossed)} players crossed the {config.MIN_GAMES_THRESHOLD}-game threshold. Falling back to a full rebuild.")
+        return False
+
+    print(f"📂 {len(new)} new game rows after {state['last_game_date']} across {len(changed)} changed files.")
+
+    if not new.empty:
+        # 4. Score, filter and sort exactly like the full build
+        with stage('scoring', rows_in=len(new)) as timer:
+            new = score_fantasy_points(new)
+            timer.rows_out = len(new)
+        team_games = build_team_games(new)
+        new = new[new['PLAYER_ID'].map(lambda pid: total_counts[int(pid)]) >= config.MIN_GAMES_THRESHOLD].copy()
+        new = new.sort_values(by=['PLAYER_ID', 'GAME_DATE'])
+        new['SEASON'] = new['GAME_DATE'].dt.year
+
+        # 5. Roll the saved state forward one game at a time (new rows only)
+        print("🧠 Rolling per-player and per-team state forward...")
+        with stage('rolling_features', rows_in=len(new)) as timer:
+            new = _advance_players(new, state['players'])
+            timer.rows_out = len(new)
+        with stage('team_merge', rows_in=len(new)) as timer:
+            team_games = advance_team_state(state['teams'], team_games)
+            new = join_team_context(new, team_games)
+            timer.rows_out = len(new)
+        new = finalize_features(new)
+
+        # 6. Append to the Golden Table in its existing column order
+        header = storage.golden_table_columns()
+        if set(header) != set(new.columns):
+            print("   ⚠️ Golden Table columns don't match the new rows. Falling back to a full rebuild.")
+            return False
+        with stage('save', rows_in=len(new)):
+            storage.save_golden_table(new[header], append=True)
+        # The feature store is NOT rebuilt here (that would re-read the whole history every
+        # night): the append changed the Golden Table fingerprint, so open_feature_store()
+        # rebuilds it on first use
+
+    # 7. Persist the advanced state (the watermark covers raw rows even if none survived the filters)
+    state['last_game_date'] = max(watermark, df['GAME_DATE'].max()).strftime('%Y-%m-%d')
+    for path in changed:
+        state['files'][_file_key(path)] = {'fingerprint': _file_fingerprint(path), 'rows': int(file_rows[path])}
+    state['player_game_counts'] = {str(pid): n for pid, n in total_counts.items()}
+    _write_state(state)
+
+    print(f"✅ Incremental Update Complete! Appended {len(new)} rows to the Golden Table.")
+    return True
+
+if __name__ == "__main__":
+    if not update_features():
+        from src.features.build_features import engineer_features
+        engineer_features(incremental=False)
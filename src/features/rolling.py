@@ -0,0 +1,172 @@
+import os
+import sys
+import numpy as np
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+
+# Rolling features of FANTASY_PTS keep their historical FPTS_ prefix
+FEATURE_PREFIXES = {'FANTASY_PTS': 'FPTS'}
+
+def feature_prefix(stat):
+    return FEATURE_PREFIXES.get(stat, stat)
+
+def window_feature(stat, window):
+    return f"{feature_prefix(stat)}_{window}G_AVG"
+
+def ewm_feature(stat, span):
+    return f"{feature_prefix(stat)}_EWM{span}"
+
+def season_feature(stat):
+    return f"{feature_prefix(stat)}_SEASON_AVG"
+
+def rolling_feature_names(stats=None, windows=None, spans=None):
+    """Every column rolling_features() adds, in the order it adds them."""
+    stats = stats or config.ROLLING_STATS
+    windows = config.ROLLING_WINDOWS if windows is None else windows
+    spans = config.ROLLING_EWMA_SPANS if spans is None else spans
+    names = []
+    for stat in stats:
+        names += [window_feature(stat, w) for w in windows]
+        names += [ewm_feature(stat, s) for s in spans]
+        names.append(season_feature(stat))
+    return names
+
+def group_row_starts(*keys):
+    """
+    For rows sorted by `keys`, the index of the first row of each row's group.
+    Every kernel below works off this one array instead of a groupby.
+    """
+    n = len(keys[0])
+    new_group = np.zeros(n, dtype=bool)
+    if n:
+        new_group[0] = True
+    for key in keys:
+        key = np.asarray(key)
+        new_group[1:] |= key[1:] != key[:-1]
+    return np.maximum.accumulate(np.where(new_group, np.arange(n), 0))
+
+def _group_steps(row_starts):
+    """
+    Row indices grouped by position within their group: step k holds the k-th
+    row of every group. Running kernels loop over steps (as long as the
+    longest group), each step vectorized across all groups.
+    """
+    position = np.arange(len(row_starts)) - row_starts
+    order = np.argsort(position, kind='stable')
+    bounds = np.r_[0, np.cumsum(np.bincount(position))]
+    return [order[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+def _prefix_sums(values, row_starts):
+    """
+    Running sums of each group's PREVIOUS non-NaN values and their count, per row.
+    Values are centered on their group's mean first so the running sum stays
+    small; the offset is added back to every mean. Everything is group-local:
+    a row's sums depend only on its own group's rows, never on the rest of
+    the table, so any subset of whole groups (a streaming bucket) reproduces
+    the same bits.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+
+    sums = np.zeros(len(values))
+    counts = np.zeros(len(values), dtype=np.int64)
+    offset = np.zeros(len(values))
+    if not len(values):
+        return sums, counts, offset
+
+    firsts = np.flatnonzero(row_starts == np.arange(len(values)))
+    group_counts = np.add.reduceat(valid.astype(np.int64), firsts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        group_means = np.where(group_counts > 0, np.add.reduceat(x, firsts) / group_counts, 0.0)
+    offset = np.repeat(group_means, np.diff(np.r_[firsts, len(values)]))
+    x = np.where(valid, x - offset, 0.0)
+
+    for rows in _group_steps(row_starts)[1:]:
+        sums[rows] = sums[rows - 1] + x[rows - 1]
+        counts[rows] = counts[rows - 1] + valid[rows - 1]
+    return sums, counts, offset
+
+def shifted_window_mean(values, row_starts, window=None, prefix_sums=None):
+    """
+    Mean of up to `window` PREVIOUS values in each row's group (window=None:
+    every previous value). Same as groupby().transform(lambda x:
+    x.rolling(window, min_periods=1).mean().shift(1)), via segmented running sums.
+    prefix_sums may come from coarser groups that nest row_starts' groups
+    (player sums serve the player-season means).
+    """
+    sums, counts, offset = prefix_sums or _prefix_sums(values, row_starts)
+    rows = np.arange(len(row_starts))
+    lo = row_starts if window is None else np.maximum(row_starts, rows - window)
+
+    total = sums[rows] - sums[lo]
+    n = counts[rows] - counts[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, total / n + offset, np.nan)
+
+def ewm_sums(values, row_starts, span):
+    """
+    Running numerator/denominator of pandas' adjusted EWMA (ewm(span).mean())
+    through each row, inclusive. Vectorized across groups: step k updates the
+    k-th game of every group at once, so the loop is as long as the longest group.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    decay = 1.0 - 2.0 / (span + 1.0)
+
+    num = np.empty(len(values))
+    den = np.empty(len(values))
+    if not len(values):
+        return num, den
+
+    steps = _group_steps(row_starts)
+    first = steps[0]
+    num[first] = x[first]
+    den[first] = valid[first]
+    for rows in steps[1:]:
+        num[rows] = decay * num[rows - 1] + x[rows]
+        den[rows] = decay * den[rows - 1] + valid[rows]
+    return num, den
+
+def shifted_ewm_mean(values, row_starts, span):
+    """EWMA of each row's PREVIOUS values in its group (ewm(span).mean().shift(1))."""
+    num, den = ewm_sums(values, row_starts, span)
+    out = np.full(len(num), np.nan)
+    has_prev = np.arange(len(num)) > row_starts
+    prev = np.flatnonzero(has_prev) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[has_prev] = np.where(den[prev] > 0, num[prev] / den[prev], np.nan)
+    return out
+
+def rolling_features(df, stats=None, windows=None, spans=None):
+    """
+    Computes every configured rolling feature for rows sorted by PLAYER_ID,
+    GAME_DATE (SEASON already set), in one pass per stat:
+    - <STAT>_<N>G_AVG for each of ROLLING_WINDOWS (trailing N-game mean)
+    - <STAT>_EWM<S> for each of ROLLING_EWMA_SPANS
+    - <STAT>_SEASON_AVG (season-to-date mean)
+    Only earlier games count toward a row's value. Returns {column: array}.
+    """
+    stats = stats or config.ROLLING_STATS
+    windows = config.ROLLING_WINDOWS if windows is None else windows
+    spans = config.ROLLING_EWMA_SPANS if spans is None else spans
+
+    player_starts = group_row_starts(df['PLAYER_ID'].to_numpy())
+    season_starts = group_row_starts(df['PLAYER_ID'].to_numpy(), df['SEASON'].to_numpy())
+
+    columns = {}
+    for stat in stats:
+        values = df[stat].to_numpy(dtype=np.float64)
+        sums = _prefix_sums(values, player_starts)
+        for w in windows:
+            columns[window_feature(stat, w)] = shifted_window_mean(values, player_starts, w, sums)
+        for s in spans:
+            columns[ewm_feature(stat, s)] = shifted_ewm_mean(values, player_starts, s)
+        columns[season_feature(stat)] = shifted_window_mean(values, season_starts, None, sums)
+    return columns
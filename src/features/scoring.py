@@ -0,0 +1,86 @@
+import os
+import sys
+import numpy as np
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+
+# Box score columns a scoring system may put a weight on (kept in a fixed order
+# so the weight matrix rows line up with the stat block columns)
+STAT_COLUMNS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG3M']
+
+# Same-game copy of each stat kept in the Golden Table as a component-model target
+COMPONENT_PREFIX = 'TARGET_'
+
+def component_target(stat):
+    return f'{COMPONENT_PREFIX}{stat}'
+
+def is_target_column(col):
+    """FANTASY_PTS, every FANTASY_PTS_<system> and every TARGET_<stat>: same-game targets, never features."""
+    return col == 'FANTASY_PTS' or col.startswith('FANTASY_PTS_') or col.startswith(COMPONENT_PREFIX)
+
+def build_weight_matrix(systems=None):
+    """
+    Stacks the YAML weights of every scoring system into one (stats x systems) matrix.
+    Stats a ruleset doesn't mention get a weight of 0.
+    Returns (stat_columns, system_names, weights).
+    """
+    if systems is None:
+        systems = config.list_scoring_systems()
+
+    if not systems:
+        raise FileNotFoundError(f"❌ No scoring systems found in {config.SCORING_DIR}")
+
+    rulebooks = [config.load_scoring_system(name) for name in systems]
+
+    unknown = sorted({stat for w in rulebooks for stat in w} - set(STAT_COLUMNS))
+    if unknown:
+        raise KeyError(f"❌ Scoring weights reference unsupported stats: {unknown}")
+
+    weights = np.array(
+        [[float(w.get(stat, 0.0)) for w in rulebooks] for stat in STAT_COLUMNS],
+        dtype='float64'
+    )
+    return list(STAT_COLUMNS), list(systems), weights
+
+def score_fantasy_points(df, systems=None):
+    """
+    Scores every game row under every scoring system in a single matrix product.
+    Adds one FANTASY_PTS_<system> column per ruleset, plus FANTASY_PTS for the
+    DEFAULT_SCORING_SYSTEM (the model target) and a TARGET_<stat> copy of every
+    STAT_COLUMNS stat (the component-model targets, see project_components).
+    """
+    stats, systems, weights = build_weight_matrix(systems)
+
+    # Missing optional stats (e.g. FG3M in older exports) simply contribute 0
+    stat_block = df.reindex(columns=stats, fill_value=0).to_numpy(dtype='float64')
+    points = stat_block @ weights
+
+    for i, stat in enumerate(stats):
+        df[component_target(stat)] = stat_block[:, i]
+
+    for j, name in enumerate(systems):
+        df[f'FANTASY_PTS_{name}'] = points[:, j]
+
+    if config.DEFAULT_SCORING_SYSTEM in systems:
+        df['FANTASY_PTS'] = df[f'FANTASY_PTS_{config.DEFAULT_SCORING_SYSTEM}']
+    else:
+        # Caller asked for a subset that skips the default: score it on its own
+        _, _, default_weights = build_weight_matrix([config.DEFAULT_SCORING_SYSTEM])
+        df['FANTASY_PTS'] = stat_block @ default_weights[:, 0]
+
+    return df
+
+def project_components(components, systems=None):
+    """
+    Fantasy points from per-stat predictions: (rows x STAT_COLUMNS) @ the YAML weights.
+    Any ruleset works, including ones added after the component models were trained.
+    Returns {system: array}.
+    """
+    _, systems, weights = build_weight_matrix(systems)
+    points = np.asarray(components, dtype='float64') @ weights
+    return {name: points[:, j] for j, name in enumerate(systems)}
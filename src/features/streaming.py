@@ -0,0 +1,190 @@
+import os
+import sys
+import shutil
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+from src.data.schema import GAMELOG_SCHEMA, read_csv_dtypes, apply_schema, concat_typed
+from src.features.scoring import score_fantasy_points
+from src.features.team_context import TEAM_GAME_INPUTS, aggregate_team_games, finish_team_games, add_team_context
+from src.features.feature_store import FeatureStoreWriter
+from src.features.build_features import gamelog_files, add_player_features, add_team_features, finalize_features
+from src.features.incremental import player_state, write_feature_state
+from src.instrumentation import stage
+
+# Scratch tables under PROCESSED_DATA_DIR, removed once the build is done
+SPOOL_NAME = "feature_spool"
+BUCKET_COL = 'BUCKET'
+ROW_COL = 'ROW_NUMBER'
+
+# Spooled rows keep their numeric dtypes on disk (scores stay float64); only the
+# categoricals come back as strings and are re-applied on read
+SPOOL_DTYPES = {col: dtype for col, dtype in GAMELOG_SCHEMA.items() if dtype == 'category'}
+
+def read_gamelog_chunks(file, columns=None):
+    """Yields one gamelog file in typed chunks of up to STREAMING_CHUNK_ROWS rows (same dtypes as _read_gamelog_file)."""
+    chunk_rows = config.STREAMING_CHUNK_ROWS
+    if file.endswith('.parquet'):
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield apply_schema(batch.to_pandas(), GAMELOG_SCHEMA)
+    else:
+        dtypes = read_csv_dtypes(GAMELOG_SCHEMA, columns)
+        for chunk in pd.read_csv(file, usecols=columns, dtype=dtypes, chunksize=chunk_rows):
+            yield apply_schema(chunk, GAMELOG_SCHEMA)
+
+def count_games(files):
+    """
+    First pass, two columns only: each player's game count, each file's row
+    count and the latest game date. Returns (counts by PLAYER_ID, {file: rows}, date).
+    """
+    chunk_counts, file_rows, last_game_date = [], {}, None
+    for file in files:
+        file_rows[file] = 0
+        for chunk in read_gamelog_chunks(file, columns=['PLAYER_ID', 'GAME_DATE']):
+            file_rows[file] += len(chunk)
+            chunk_counts.append(chunk['PLAYER_ID'].value_counts())
+            chunk_date = chunk['GAME_DATE'].max()
+            if last_game_date is None or chunk_date > last_game_date:
+                last_game_date = chunk_date
+    counts = pd.concat(chunk_counts).groupby(level=0).sum()
+    return counts, file_rows, last_game_date
+
+def assign_buckets(counts):
+    """
+    Players with at least MIN_GAMES_THRESHOLD games -> bucket number. Buckets
+    are contiguous PLAYER_ID ranges of about STREAMING_BUCKET_ROWS rows, so
+    processing them in order yields rows in the in-memory build's order.
+    """
+    valid = counts[counts >= config.MIN_GAMES_THRESHOLD].sort_index()
+    rows_before = valid.cumsum() - valid
+    _, buckets = np.unique((rows_before // config.STREAMING_BUCKET_ROWS).to_numpy(), return_inverse=True)
+    return pd.Series(buckets, index=valid.index)
+
+def spool_gamelogs(files, buckets, team_buckets, spool_dir):
+    """
+    Second pass: scores each chunk and appends it to two on-disk tables:
+    - players/: valid players' rows, partitioned by their bucket
+    - team_games/: every row's TEAM_GAME_INPUTS (before any player filter),
+      hashed by GAME_ID so each game lands whole in one bucket, with its
+      row number in the full table
+    Returns the number of rows read.
+    """
+    row_offset = 0
+    for file in files:
+        for chunk in read_gamelog_chunks(file):
+            chunk = score_fantasy_points(chunk)
+
+            team_rows = chunk[TEAM_GAME_INPUTS].copy()
+            team_rows[ROW_COL] = np.arange(row_offset, row_offset + len(chunk), dtype=np.int64)
+            game_hash = pd.util.hash_pandas_object(chunk['GAME_ID'], index=False).to_numpy()
+            team_rows[BUCKET_COL] = (game_hash % np.uint64(team_buckets)).astype(np.int64)
+            storage.add_parts(team_rows, spool_dir / "team_games", BUCKET_COL)
+
+            bucket = chunk['PLAYER_ID'].map(buckets)
+            keep = bucket.notna().to_numpy()
+            players = chunk[keep].assign(**{BUCKET_COL: bucket[keep].astype(np.int64)})
+            storage.add_parts(players, spool_dir / "players", BUCKET_COL)
+            row_offset += len(chunk)
+    return row_offset
+
+def read_bucket(table_path, bucket):
+    """One spooled bucket, rows in the order they were read (None if the bucket is empty)."""
+    files = storage.partition_files(table_path, [bucket])
+    if not files:
+        return None
+    return storage.read_files(files, dtypes=SPOOL_DTYPES).drop(columns=[BUCKET_COL])
+
+def spooled_team_games(spool_dir, team_buckets):
+    """
+    The team-game table with context, from the game-hashed buckets. Each
+    bucket holds whole games; sorting the aggregates by first row number
+    puts them back in the order build_team_games() would see them.
+    """
+    parts = []
+    for bucket in range(team_buckets):
+        rows = read_bucket(spool_dir / "team_games", bucket)
+        if rows is not None:
+            parts.append(aggregate_team_games(rows, order_col=ROW_COL))
+
+    team_games = concat_typed(parts, SPOOL_DTYPES)
+    team_games = team_games.sort_values(by=ROW_COL, kind='stable').drop(columns=[ROW_COL]).reset_index(drop=True)
+    return add_team_context(finish_team_games(team_games))
+
+def stream_features():
+    """
+    Full Golden Table rebuild with bounded memory, for histories too large
+    to concat: gamelogs are read in chunks and spooled to per-player-range
+    buckets, then each bucket is featurized on its own and appended to the
+    Golden Table and the feature store. Every feature depends only on a player's own rows (plus
+    the league-wide team context, built first), so the result is identical
+    to the in-memory build.
+    """
+    print("🚀 Starting Streaming WNBA Feature Engineering Pipeline...")
+    files = gamelog_files()
+    spool_dir = config.PROCESSED_DATA_DIR / SPOOL_NAME
+    if spool_dir.exists():
+        shutil.rmtree(spool_dir)
+
+    try:
+        # 1. Count every player's games (PLAYER_ID/GAME_DATE only) to size the buckets
+        with stage('load') as timer:
+            counts, file_rows, last_game_date = count_games(files)
+            total_rows = sum(file_rows.values())
+            timer.rows_out = total_rows
+        buckets = assign_buckets(counts)
+        n_buckets = int(buckets.max()) + 1 if len(buckets) else 0
+        team_buckets = max(1, -(-total_rows // config.STREAMING_BUCKET_ROWS))
+        print(f"📂 {total_rows} gamelog rows in {len(files)} files -> {len(buckets)} players in {n_buckets} buckets.")
+
+        # 2. Score and spool every chunk (team inputs by game, player rows by bucket)
+        with stage('spool', rows_in=total_rows) as timer:
+            timer.rows_out = spool_gamelogs(files, buckets, team_buckets, spool_dir)
+
+        # 3. League-wide team and opponent context (one row per team per game: small)
+        with stage('team_games', rows_in=total_rows) as timer:
+            team_games = spooled_team_games(spool_dir, team_buckets)
+            timer.rows_out = len(team_games)
+
+        # 4. One bucket at a time: features, state, then straight into the Golden Table and feature store
+        print(f"🧠 Engineering features bucket by bucket ({n_buckets} buckets)...")
+        players = {}
+        rows_out = 0
+        storage.start_golden_table()
+        store = FeatureStoreWriter()
+        with stage('buckets', rows_in=int(counts[buckets.index].sum())) as timer:
+            for bucket in range(n_buckets):
+                df = read_bucket(spool_dir / "players", bucket)
+                if df is None:
+                    continue
+                df = df.sort_values(by=['PLAYER_ID', 'GAME_DATE'])
+                df = add_player_features(df)
+                df = add_team_features(df, team_games)
+                players.update(player_state(df))
+
+                df = finalize_features(df)
+                storage.write_golden_rows(df)
+                store.append(df)
+                rows_out += len(df)
+            timer.rows_out = rows_out
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+    # 5. Swap the new Golden Table in, then the state and feature store that describe it
+    with stage('save', rows_in=rows_out):
+        output_path = storage.finish_golden_table()
+        write_feature_state(players, last_game_date, file_rows, counts, team_games)
+        store.finish()
+
+    print(f"✅ Streaming Feature Engineering Complete! Baseline dataset saved to: {output_path}")
+    print(f"📊 Final Dataset Rows: {rows_out}")
+
+if __name__ == "__main__":
+    stream_features()
@@ -0,0 +1,191 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.features.rolling import group_row_starts, shifted_window_mean
+
+# Season-to-date team context: feature -> per-team-game value it averages
+TEAM_RUNNING_STATS = {
+    'TEAM_WIN_PCT': 'WIN_FLAG',
+    'TEAM_PACE_AVG': 'POSSESSIONS',             # pace proxy: FGA + 0.44*FTA - OREB + TOV
+    'TEAM_FPTS_ALLOWED_AVG': 'FPTS_ALLOWED',    # fantasy points the team's opponents scored
+}
+
+# Value before a team's first game of the season
+SEASON_START_VALUES = {'TEAM_WIN_PCT': 0.00}
+
+# The same context seen from the other bench: TEAM_WIN_PCT -> OPP_WIN_PCT, ...
+OPPONENT_FEATURES = {name: 'OPP_' + name[len('TEAM_'):] for name in TEAM_RUNNING_STATS}
+
+# Every column join_team_context() adds to the player rows
+TEAM_CONTEXT_COLUMNS = list(TEAM_RUNNING_STATS) + ['OPP_TEAM_ID'] + list(OPPONENT_FEATURES.values())
+
+MATCHUP_PATTERN = r'^(?P<team>\S+) (?:vs\.|@) (?P<opp>\S+)$'
+
+def game_key(game_ids, team_ids):
+    """(GAME_ID, TEAM_ID) as an integer pair index: the join key between team games and player rows."""
+    game_ids = pd.to_numeric(pd.Series(game_ids), errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+    team_ids = np.asarray(team_ids, dtype=np.int64)
+    return pd.MultiIndex.from_arrays([game_ids, team_ids])
+
+def parse_opponents(matchups, abbreviations, team_ids):
+    """
+    OPP_TEAM_ID for each MATCHUP ('LVA vs. SEA' / 'LVA @ SEA'), parsed once per
+    distinct matchup string and mapped through the abbreviation -> TEAM_ID pairs
+    seen in the data. Unknown opponents get -1.
+    """
+    abbreviation_ids = dict(zip(abbreviations, team_ids))
+    codes, uniques = pd.factorize(pd.Series(matchups))
+    parsed = pd.Series(uniques).str.extract(MATCHUP_PATTERN)
+    opp_ids = parsed['opp'].map(abbreviation_ids).fillna(-1).to_numpy(dtype=np.int64)
+    return np.where(codes >= 0, opp_ids[codes], -1)
+
+# Player-row columns a team-game table is built from
+TEAM_GAME_INPUTS = ['GAME_ID', 'TEAM_ID', 'GAME_DATE', 'TEAM_ABBREVIATION', 'MATCHUP', 'WL',
+                    'FGA', 'FTA', 'OREB', 'TOV', 'FANTASY_PTS']
+
+def build_team_games(df):
+    """
+    Collapses scored player rows (before any player filtering, so every
+    player's minutes count) into one row per team per game.
+    """
+    return finish_team_games(aggregate_team_games(df))
+
+def aggregate_team_games(df, order_col=None):
+    """
+    The per-game half of build_team_games(): one row per (GAME_ID, TEAM_ID),
+    in order of first appearance. Any subset of rows holding whole games
+    aggregates the same; order_col keeps each game's first value of that
+    column, so subsets can be put back in full-table order.
+    """
+    # Box score stats load as float32 (src/data/schema.py): widen before mixing in 0.44
+    box = df[['FGA', 'FTA', 'OREB', 'TOV']].astype(np.float64)
+    players = df.assign(
+        WIN_FLAG=np.where(df['WL'] == 'W', 1, 0),
+        POSSESSIONS=box['FGA'] + 0.44 * box['FTA'] - box['OREB'] + box['TOV'],
+    )
+    aggregations = dict(
+        GAME_DATE=('GAME_DATE', 'first'),
+        TEAM_ABBREVIATION=('TEAM_ABBREVIATION', 'first'),
+        MATCHUP=('MATCHUP', 'first'),
+        WIN_FLAG=('WIN_FLAG', 'first'),
+        POSSESSIONS=('POSSESSIONS', 'sum'),
+        FANTASY_PTS=('FANTASY_PTS', 'sum'),
+    )
+    if order_col is not None:
+        aggregations[order_col] = (order_col, 'first')
+    return players.groupby(['GAME_ID', 'TEAM_ID'], sort=False).agg(**aggregations).reset_index()
+
+def finish_team_games(team_games):
+    """Season, opponent and fantasy points allowed for aggregated team games, sorted by TEAM_ID, GAME_DATE."""
+    team_games['SEASON'] = team_games['GAME_DATE'].dt.year
+    team_games['TEAM_ID'] = team_games['TEAM_ID'].astype(np.int64)
+
+    # 1. Opponent, parsed from MATCHUP once per distinct string
+    team_games['OPP_TEAM_ID'] = parse_opponents(
+        team_games['MATCHUP'], team_games['TEAM_ABBREVIATION'], team_games['TEAM_ID']
+    )
+
+    # 2. Fantasy points allowed = what the opponent's players scored in the same game
+    keys = game_key(team_games['GAME_ID'], team_games['TEAM_ID'])
+    opp_rows = keys.get_indexer(game_key(team_games['GAME_ID'], team_games['OPP_TEAM_ID']))
+    team_games['FPTS_ALLOWED'] = np.where(opp_rows >= 0, team_games['FANTASY_PTS'].to_numpy()[opp_rows], np.nan)
+
+    return team_games.sort_values(by=['TEAM_ID', 'GAME_DATE'], kind='stable').reset_index(drop=True)
+
+def add_team_context(team_games):
+    """
+    Season-to-date context for every team game (prior games only), then the
+    opponent's context for the same game. Expects build_team_games() order.
+    """
+    season_starts = group_row_starts(team_games['TEAM_ID'].to_numpy(), team_games['SEASON'].to_numpy())
+    for name, stat in TEAM_RUNNING_STATS.items():
+        values = shifted_window_mean(team_games[stat].to_numpy(dtype=np.float64), season_starts)
+        if name in SEASON_START_VALUES:
+            values = np.where(np.isnan(values), SEASON_START_VALUES[name], values)
+        team_games[name] = values
+    return add_opponent_context(team_games)
+
+def add_opponent_context(team_games):
+    """Copies each opponent's TEAM_* context onto the team's row of the same game (integer-key lookup)."""
+    keys = game_key(team_games['GAME_ID'], team_games['TEAM_ID'])
+    opp_rows = keys.get_indexer(game_key(team_games['GAME_ID'], team_games['OPP_TEAM_ID']))
+    for name, opp_name in OPPONENT_FEATURES.items():
+        team_games[opp_name] = np.where(opp_rows >= 0, team_games[name].to_numpy()[opp_rows], np.nan)
+    return team_games
+
+def join_team_context(df, team_games):
+    """Adds TEAM_CONTEXT_COLUMNS to player rows via the (GAME_ID, TEAM_ID) integer key."""
+    rows = game_key(team_games['GAME_ID'], team_games['TEAM_ID']).get_indexer(game_key(df['GAME_ID'], df['TEAM_ID']))
+    for name in TEAM_CONTEXT_COLUMNS:
+        values = team_games[name].to_numpy()
+        df[name] = np.where(rows >= 0, values[rows], np.nan)
+    df['OPP_TEAM_ID'] = df['OPP_TEAM_ID'].fillna(-1).astype(np.int64)
+    return df
+
+# --- RUNNING TEAM STATE (incremental builds and the prediction server) ---
+
+def empty_team_state(season):
+    return {
+        'season': int(season),
+        'sums': {stat: 0.0 for stat in TEAM_RUNNING_STATS.values()},
+        'counts': {stat: 0 for stat in TEAM_RUNNING_STATS.values()},
+    }
+
+def team_state_from_games(team_games):
+    """Each team's running sums/counts for its latest season, keyed by str(TEAM_ID)."""
+    latest = team_games.groupby('TEAM_ID')['SEASON'].transform('max') == team_games['SEASON']
+    stats = list(TEAM_RUNNING_STATS.values())
+    totals = team_games[latest].groupby(['TEAM_ID', 'SEASON'])[stats].agg(['sum', 'count'])
+
+    teams = {}
+    for (team_id, season), row in totals.iterrows():
+        teams[str(team_id)] = {
+            'season': int(season),
+            'sums': {stat: float(row[(stat, 'sum')]) for stat in stats},
+            'counts': {stat: int(row[(stat, 'count')]) for stat in stats},
+        }
+    return teams
+
+def context_from_state(teams, team_id, season):
+    """TEAM_* context of a team's next game in `season`, from its running state."""
+    record = teams.get(str(int(team_id)))
+    if record is None or record['season'] != season:
+        record = empty_team_state(season)
+
+    context = {}
+    for name, stat in TEAM_RUNNING_STATS.items():
+        count = record['counts'][stat]
+        context[name] = record['sums'][stat] / count if count else SEASON_START_VALUES.get(name, np.nan)
+    return context
+
+def advance_team_state(teams, team_games):
+    """
+    Context for new team games (sorted by TEAM_ID, GAME_DATE) from the saved
+    state, rolling the state forward one game at a time. Adds the TEAM_* and
+    OPP_* columns like add_team_context().
+    """
+    stats = list(TEAM_RUNNING_STATS.values())
+    context = {name: [] for name in TEAM_RUNNING_STATS}
+
+    for team_id, season, *values in zip(team_games['TEAM_ID'], team_games['SEASON'], *(team_games[s] for s in stats)):
+        for name, value in context_from_state(teams, team_id, season).items():
+            context[name].append(value)
+
+        record = teams.get(str(int(team_id)))
+        if record is None or record['season'] != season:
+            record = teams[str(int(team_id))] = empty_team_state(season)
+        for stat, value in zip(stats, values):
+            if not np.isnan(value):
+                record['sums'][stat] += float(value)
+                record['counts'][stat] += 1
+
+    for name, values in context.items():
+        team_games[name] = values
+    return add_opponent_context(team_games)
@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, RSS columns stay empty
+    resource = None
+
+logger = logging.getLogger("wnba.stages")
+
+# Records finished outside an MLflow run, logged into the next one that asks
+_pending = []
+_pending_lock = threading.Lock()
+_local = threading.local()
+
+def _max_rss_mb():
+    """The process' peak resident set size so far (ru_maxrss is KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+def _configure_logger():
+    """JSON-lines file handler on STAGE_LOG_PATH, attached once."""
+    if logger.handlers or not config.STAGE_LOG_PATH:
+        return
+    os.makedirs(os.path.dirname(config.STAGE_LOG_PATH), exist_ok=True)
+    handler = logging.FileHandler(config.STAGE_LOG_PATH)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+class StageRecord:
+    """What one `with stage(...)` block measured. Set rows_out inside the block when it's known."""
+    def __init__(self, name, rows_in=None, parent=None):
+        self.name = name
+        self.parent = parent
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_s = None
+        self.cpu_s = None
+        self.peak_rss_mb = None
+        self.rss_growth_mb = None
+        self.profile_path = None
+        self.profiling = False
+
+    def as_dict(self):
+        record = {
+            'stage': self.name,
+            'parent': self.parent,
+            'pid': os.getpid(),
+            'finished_at': datetime.now().isoformat(timespec='milliseconds'),
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'peak_rss_mb': self.peak_rss_mb,
+            'rss_growth_mb': self.rss_growth_mb,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+        }
+        if self.wall_s:
+            if self.rows_in is not None:
+                record['rows_in_per_s'] = self.rows_in / self.wall_s
+            if self.rows_out is not None:
+                record['rows_out_per_s'] = self.rows_out / self.wall_s
+        if self.profile_path:
+            record['profile'] = self.profile_path
+        return record
+
+def _metric_name(stage_name, metric):
+    return f"stage_{stage_name.replace('.', '_')}_{metric}"
+
+def _tracker_run():
+    """The open src/models/tracking.py run of this thread, if that module is in use."""
+    tracking = sys.modules.get('src.models.tracking')
+    return tracking.active_run() if tracking is not None else None
+
+def _log_to_mlflow(records):
+    metrics, tags = {}, {}
+    for record in records:
+        for metric in ('wall_s', 'cpu_s', 'peak_rss_mb', 'rows_in_per_s', 'rows_out_per_s'):
+            if record.get(metric) is not None:
+                metrics[_metric_name(record['stage'], metric)] = record[metric]
+        if record.get('profile'):
+            tags[f"stage_{record['stage']}_profile"] = record['profile']
+    # Batched through the tracker when one is logging this run, else straight to the fluent run
+    run = _tracker_run()
+    if run is not None:
+        run.log_metrics(metrics)
+        run.set_tags(tags)
+        return
+    import mlflow
+    if metrics:
+        mlflow.log_metrics(metrics)
+    if tags:
+        mlflow.set_tags(tags)
+
+def log_pending_stages():
+    """Logs every stage that finished before the current MLflow (or tracker) run started (e.g. the data load)."""
+    with _pending_lock:
+        records, _pending[:] = list(_pending), []
+    if records:
+        _log_to_mlflow(records)
+
+def _publish(record):
+    """Structured log line + status print + MLflow (straight into the active run, or parked until one starts)."""
+    _configure_logger()
+    data = record.as_dict()
+    logger.info(json.dumps(data))
+
+    rows = f" | {data['rows_out_per_s']:,.0f} rows/s" if data.get('rows_out_per_s') else ""
+    rss = f" | peak RSS {data['peak_rss_mb']:.0f} MB" if data['peak_rss_mb'] is not None else ""
+    print(f"   ⏱️ [{record.name}] {data['wall_s']:.2f}s wall, {data['cpu_s']:.2f}s CPU{rows}{rss}")
+
+    # Only talk to MLflow from processes that already use it (the feature build never imports it)
+    mlflow = sys.modules.get('mlflow')
+    if _tracker_run() is not None or (mlflow is not None and mlflow.active_run() is not None):
+        _log_to_mlflow([data])
+    else:
+        with _pending_lock:
+            _pending.append(data)
+
+def _dump_profile(profiler, name):
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    path = config.PROFILE_DIR / f"{name}_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.prof"
+    profiler.dump_stats(path)
+    return os.fspath(path)
+
+@contextmanager
+def stage(name, rows_in=None):
+    """
+    Times one pipeline stage: wall + CPU time, peak RSS and rows in/out per
+    second, published as a JSON log line (STAGE_LOG_PATH) and MLflow metrics.
+    With PROFILE_STAGES on, the stage runs under cProfile and the .prof dump
+    (snakeviz, pstats, flameprof) is kept when it takes over PROFILE_THRESHOLD_S.
+
+        with stage('scoring', rows_in=len(df)) as s:
+            df = score_fantasy_points(df)
+            s.rows_out = len(df)
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    record = StageRecord(name, rows_in, parent=stack[-1].name if stack else None)
+
+    # cProfile allows one active profiler per thread: nested stages share the outer one
+    profiler = None
+    if config.PROFILE_STAGES and not any(outer.profiling for outer in stack):
+        import cProfile
+        profiler = cProfile.Profile()
+        record.profiling = True
+
+    stack.append(record)
+    rss_start = _max_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler:
+            profiler.disable()
+        record.wall_s = time.perf_counter() - wall_start
+        record.cpu_s = time.process_time() - cpu_start
+        record.peak_rss_mb = _max_rss_mb()
+        if rss_start is not None:
+            record.rss_growth_mb = record.peak_rss_mb - rss_start
+        stack.pop()
+
+        if profiler and record.wall_s >= config.PROFILE_THRESHOLD_S:
+            record.profile_path = _dump_profile(profiler, name)
+        _publish(record)
+
+def instrumented(name=None):
+    """Decorator form of stage(): rows_in from the first argument, rows_out from the result (when they have a len)."""
+    def decorator(fn):
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rows_in = len(args[0]) if args and hasattr(args[0], '__len__') and not isinstance(args[0], (str, bytes, dict)) else None
+            with stage(stage_name, rows_in=rows_in) as record:
+                result = fn(*args, **kwargs)
+                if hasattr(result, '__len__') and not isinstance(result, (str, bytes, dict, tuple)):
+                    record.rows_out = len(result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import pandas as pd
+import numpy as np
+import xgboost as xgb
+from dotenv import load_dotenv
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+from src.features.rolling import group_row_starts, shifted_window_mean
+from src.instrumentation import stage, log_pending_stages
+from src.models.tracking import Tracker
+from src.models.dataset import load_training_data, native_params
+
+load_dotenv()
+
+# Baseline name -> prediction column (same three as evaluate_baseline.py)
+BASELINES = {
+    "Baseline_Last_Game": "PRED_LAST_GAME",
+    "Baseline_3G_Rolling": "FPTS_3G_AVG",
+    "Baseline_Season_To_Date": "PRED_SEASON_AVG",
+}
+
+def baseline_predictions(data):
+    """
+    The point-in-time baseline predictions (each uses only earlier games) for
+    every row of the training matrix, in its (league-date) row order.
+    Returns {prediction column: float64 array}.
+    """
+    # Per-player order: rows are date-sorted, so a stable sort by player keeps each player's games chronological
+    order = np.argsort(data.player_ids, kind='stable')
+    players = np.asarray(data.player_ids)[order]
+    fpts = np.asarray(data.y, dtype=np.float64)[order]
+    years = np.asarray(data.dates)[order].astype('datetime64[Y]')
+
+    player_starts = group_row_starts(players)
+    last_game = np.r_[np.nan, fpts[:-1]]
+    last_game[player_starts == np.arange(len(fpts))] = np.nan
+
+    season_starts = group_row_starts(players, years)
+    season_avg = shifted_window_mean(fpts, season_starts)
+
+    predictions = {'FPTS_3G_AVG': np.asarray(data.feature('FPTS_3G_AVG'), dtype=np.float64)}
+    for col, values in (('PRED_LAST_GAME', last_game), ('PRED_SEASON_AVG', season_avg)):
+        predictions[col] = np.empty(len(fpts))
+        predictions[col][order] = values
+    return predictions
+
+def build_backtest_matrix(data):
+    """
+    Every array the backtest needs, in league-date order: X (float32 features),
+    y, baseline predictions and the game dates. Starts from the shared training
+    matrix (same features as train.py, already sorted) and keeps the rows every
+    baseline can predict. Every fold afterwards is a contiguous slice (a view, no copies).
+    """
+    predictions = baseline_predictions(data)
+    keep = ~np.isnan(data.y)
+    for values in predictions.values():
+        keep &= ~np.isnan(values)
+
+    return {
+        'X': np.ascontiguousarray(data.X[keep]),
+        'y': np.asarray(data.y[keep], dtype=np.float32),
+        'baselines': {name: predictions[col][keep].astype(np.float32) for name, col in BASELINES.items()},
+        'dates': np.asarray(data.dates[keep]),
+        'feature_names': list(data.feature_names),
+    }
+
+def walk_forward_windows(dates, freq=None, min_train_rows=None):
+    """
+    Expanding-window folds over sorted game dates.
+    Returns [(window_start, train_end, test_end), ...] where rows [0, train_end)
+    train and rows [train_end, test_end) are the next game-day ('D') or week ('W').
+    """
+    freq = freq or config.BACKTEST_FREQ
+    min_train_rows = config.BACKTEST_MIN_TRAIN_ROWS if min_train_rows is None else min_train_rows
+
+    periods = pd.DatetimeIndex(dates).to_period(freq)
+    # Row offsets where a new period begins (dates are sorted, so periods are contiguous)
+    starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+    ends = np.r_[starts[1:], len(dates)]
+
+    return [
+        (periods[start].start_time, start, end)
+        for start, end in zip(starts, ends)
+        if start >= min_train_rows
+    ]
+
+def _scores(y_true, y_pred):
+    errors = y_pred - y_true
+    return float(np.mean(np.abs(errors))), float(np.sqrt(np.mean(errors ** 2)))
+
+def run_backtest(matrix, refit=None):
+    """
+    Walks forward through the season, retraining XGBoost on everything before
+    each window and scoring it (plus the baselines) on that window.
+    refit='retrain' refits from scratch every step; refit='update' keeps boosting
+    the previous model on just the newest window, with a full refit every
+    BACKTEST_RETRAIN_EVERY steps.
+    Returns one row per (window, model) with MAE/RMSE.
+    """
+    refit = refit or config.BACKTEST_REFIT
+    if refit not in ('retrain', 'update'):
+        raise ValueError(f"❌ Unknown BACKTEST_REFIT '{refit}'. Use 'retrain' or 'update'.")
+
+    X, y, dates = matrix['X'], matrix['y'], matrix['dates']
+    windows = walk_forward_windows(dates)
+    if not windows:
+        raise ValueError(f"❌ Not enough rows for a backtest (need more than {config.BACKTEST_MIN_TRAIN_ROWS}).")
+
+    params = native_params(config.MODEL_PARAMS)
+    n_rounds = config.MODEL_PARAMS['n_estimators']
+    booster, trained_until = None, 0
+    rows = []
+
+    for step, (window_start, train_end, test_end) in enumerate(windows):
+        start_time = time.time()
+
+        # Contiguous slices: views into the one matrix, nothing is copied
+        if refit == 'retrain' or booster is None or step % config.BACKTEST_RETRAIN_EVERY == 0:
+            dtrain = xgb.DMatrix(X[:train_end], label=y[:train_end], feature_names=matrix['feature_names'])
+            booster = xgb.train(params, dtrain, num_boost_round=n_rounds)
+        else:
+            dtrain = xgb.DMatrix(X[trained_until:train_end], label=y[trained_until:train_end], feature_names=matrix['feature_names'])
+            booster = xgb.train(params, dtrain, num_boost_round=config.BACKTEST_UPDATE_ROUNDS, xgb_model=booster)
+        trained_until = train_end
+
+        y_test = y[train_end:test_end]
+        preds = booster.predict(xgb.DMatrix(X[train_end:test_end], feature_names=matrix['feature_names']))
+        predictions = {'XGBoost': preds}
+        predictions.update({name: pred[train_end:test_end] for name, pred in matrix['baselines'].items()})
+
+        for model_name, pred in predictions.items():
+            mae, rmse = _scores(y_test, pred)
+            rows.append({
+                'window': step,
+                'window_start': window_start,
+                'n_train': int(train_end),
+                'n_test': int(test_end - train_end),
+                'model': model_name,
+                'mae': mae,
+                'rmse': rmse,
+            })
+
+        xgb_mae = rows[-len(predictions)]['mae']
+        print(f"   🗓️ {window_start:%Y-%m-%d}: train={train_end} test={test_end - train_end} "
+              f"XGBoost MAE={xgb_mae:.2f} ({time.time() - start_time:.1f}s)")
+
+    return pd.DataFrame(rows)
+
+def summarize_backtest(results):
+    """Per-model MAE/RMSE over all windows, weighted by window size."""
+    weighted = results.assign(abs_err=results['mae'] * results['n_test'],
+                              sq_err=results['rmse'] ** 2 * results['n_test'])
+    summary = weighted.groupby('model')[['abs_err', 'sq_err', 'n_test']].sum()
+    summary['mae'] = summary['abs_err'] / summary['n_test']
+    summary['rmse'] = np.sqrt(summary['sq_err'] / summary['n_test'])
+    return summary[['mae', 'rmse']].sort_values('mae')
+
+def backtest():
+    print("🚀 Initiating Walk-Forward Backtest...")
+
+    # 1. Setup MLflow Tracking (batched, sent from a background thread)
+    tracker = Tracker("03_WNBA_Backtests")
+
+    # 2. Map the shared training matrix and add the baselines once
+    with stage('load') as timer:
+        matrix = build_backtest_matrix(load_training_data())
+        timer.rows_out = len(matrix['y'])
+    print(f"📊 {len(matrix['y'])} games, {len(matrix['feature_names'])} features. "
+          f"Stepping by {'week' if config.BACKTEST_FREQ == 'W' else 'game-day'} ({config.BACKTEST_REFIT}).")
+
+    # 3. Walk forward
+    with stage('walk_forward', rows_in=len(matrix['y'])):
+        results = run_backtest(matrix)
+    summary = summarize_backtest(results)
+
+    # 4. Save the per-window table
+    output_path = storage.save_frame(results, config.PROCESSED_DATA_DIR / "backtest_results.parquet")
+
+    print("-" * 30)
+    for model_name, row in summary.iterrows():
+        print(f"🏆 {model_name}: MAE {row['mae']:.2f} | RMSE {row['rmse']:.2f}")
+    print("-" * 30)
+
+    # 5. Log one run per model, with the per-window scores as metric steps
+    with tracker:
+        for model_name, model_rows in results.groupby('model'):
+            with tracker.start_run(f"backtest_{model_name}") as run:
+                if model_name == 'XGBoost':
+                    # The load/walk-forward timings belong to the model's run
+                    log_pending_stages()
+                run.log_params({
+                    'freq': config.BACKTEST_FREQ,
+                    'refit': config.BACKTEST_REFIT,
+                    'min_train_rows': config.BACKTEST_MIN_TRAIN_ROWS,
+                    'n_windows': len(model_rows),
+                })
+                for row in model_rows.itertuples(index=False):
+                    run.log_metrics({"window_mae": row.mae, "window_rmse": row.rmse}, step=row.window)
+                run.log_metrics({"backtest_mae": summary.loc[model_name, 'mae'], "backtest_rmse": summary.loc[model_name, 'rmse']})
+                run.set_tag("model_type", "xgboost" if model_name == 'XGBoost' else "baseline")
+
+    print(f"✅ Backtest Complete! Per-window results saved to {output_path}")
+
+if __name__ == "__main__":
+    backtest()
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import numpy as np
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+
+# Bump whenever the .npz layout changes
+COMPILED_VERSION = 1
+
+# Objectives whose prediction is the raw margin (base_score + leaf sum)
+IDENTITY_OBJECTIVES = {'reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror', 'reg:quantileerror'}
+
+def compiled_path(model_path):
+    """<model>.npz next to a saved <model>.ubj."""
+    return os.path.splitext(os.fspath(model_path))[0] + ".npz"
+
+def _base_score(learner):
+    # XGBoost 2+ stores it as a vector string, e.g. '[3.2E1]'
+    return float(learner['learner_model_param']['base_score'].strip('[]').split(',')[0])
+
+def _tree_depth(tree):
+    left, right = tree['left_children'], tree['right_children']
+    depth, stack = 0, [(0, 0)]
+    while stack:
+        node, level = stack.pop()
+        if left[node] == -1:
+            depth = max(depth, level)
+        else:
+            stack += [(left[node], level + 1), (right[node], level + 1)]
+    return depth
+
+def flatten_booster(booster):
+    """
+    Every tree of a trained booster laid out as a complete binary tree of the
+    ensemble's depth D (heap order: node i's children are 2i+1 and 2i+2), so
+    evaluating a level is index arithmetic instead of child-pointer lookups.
+    Leaves shallower than D are padded with always-left splits and their value
+    copied to every bottom slot below them. Needs the booster itself, so this
+    is the only place xgboost is involved.
+    Returns {name: array} (see CompiledEnsemble).
+    """
+    learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+    objective = learner['objective']['name']
+    if objective not in IDENTITY_OBJECTIVES:
+        raise ValueError(f"❌ Can't compile objective '{objective}': only {sorted(IDENTITY_OBJECTIVES)} are supported.")
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise ValueError(f"❌ Can't compile a '{learner['gradient_booster']['name']}' booster (gbtree only).")
+
+    trees = learner['gradient_booster']['model']['trees']
+    if any(any(tree['split_type']) for tree in trees):
+        raise ValueError("❌ Can't compile categorical splits.")
+    depth = max((_tree_depth(tree) for tree in trees), default=0)
+    if depth > config.COMPILED_MAX_DEPTH:
+        raise ValueError(f"❌ Trees {depth} levels deep exceed COMPILED_MAX_DEPTH ({config.COMPILED_MAX_DEPTH}); serve this model with xgboost.")
+
+    n_splits, n_leaves = (1 << depth) - 1, 1 << depth
+    # Padding splits send everything left: +inf threshold, missing goes left too
+    feature = np.zeros((len(trees), n_splits), dtype=np.int32)
+    threshold = np.full((len(trees), n_splits), np.inf, dtype=np.float32)
+    default_left = np.ones((len(trees), n_splits), dtype=bool)
+    leaf_value = np.zeros((len(trees), n_leaves), dtype=np.float32)
+
+    for t, tree in enumerate(trees):
+        left, right = tree['left_children'], tree['right_children']
+        stack = [(0, 0, 0)]
+        while stack:
+            node, slot, level = stack.pop()
+            if left[node] == -1:
+                # A leaf's split_conditions entry holds its (already learning-rate scaled) value
+                span = 1 << (depth - level)
+                first = slot * span + span - 1 - n_splits
+                leaf_value[t, first:first + span] = tree['split_conditions'][node]
+                continue
+            feature[t, slot] = tree['split_indices'][node]
+            threshold[t, slot] = tree['split_conditions'][node]
+            default_left[t, slot] = bool(tree['default_left'][node])
+            stack += [(left[node], 2 * slot + 1, level + 1), (right[node], 2 * slot + 2, level + 1)]
+
+    return {
+        'version': np.int32(COMPILED_VERSION),
+        'base_score': np.float64(_base_score(learner)),
+        'feature_names': np.asarray(learner.get('feature_names') or [], dtype=str),
+        'depth': np.int32(depth),
+        'feature': feature,
+        'threshold': threshold,
+        'default_left': default_left,
+        'leaf_value': leaf_value,
+    }
+
+def export_booster(booster, path):
+    """Writes the flattened booster to `path` (.npz, written atomically). Returns the path."""
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + ".tmp.npz"
+    np.savez(tmp_path, **flatten_booster(booster))
+    os.replace(tmp_path, path)
+    return path
+
+def save_arrays(arrays, directory):
+    """
+    Writes flattened arrays as one .npy file each under `directory`, so
+    CompiledEnsemble.load(directory, mmap=True) maps them instead of reading them.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), values)
+    return directory
+
+def export_next_to(booster, model_path):
+    """
+    Compiles a booster just saved at model_path into <model>.npz. Models the
+    compiler can't handle are reported and left to xgboost (returns None).
+    """
+    try:
+        return export_booster(booster, compiled_path(model_path))
+    except ValueError as e:
+        print(f"⚠️ Not compiled for serving: {e}")
+        return None
+
+class CompiledEnsemble:
+    """
+    A flattened XGBoost tree ensemble evaluated with NumPy only: no xgboost,
+    no DMatrix, loads in milliseconds. Drop-in for the booster calls the
+    prediction server makes (feature_names, inplace_predict).
+
+    Every row walks every tree at once: a (rows x trees) array of heap slots
+    advances one level per step, so a batch costs `depth` vectorized steps.
+    """
+    def __init__(self, arrays):
+        if int(arrays['version']) != COMPILED_VERSION:
+            raise ValueError(f"❌ Compiled model version {int(arrays['version'])} != {COMPILED_VERSION}; re-export it.")
+        self.base_score = float(arrays['base_score'])
+        self.feature_names = [str(name) for name in arrays['feature_names']] or None
+        self.depth = int(arrays['depth'])
+        self.num_trees, n_splits = arrays['feature'].shape
+
+        # Flat arrays + per-tree offsets: one gather per array per level
+        self.feature = arrays['feature'].ravel()
+        self.threshold = arrays['threshold'].ravel()
+        self.default_left = arrays['default_left'].ravel()
+        self.leaf_value = arrays['leaf_value'].ravel()
+        self.split_offsets = (np.arange(self.num_trees, dtype=np.int64) * n_splits)[None, :]
+        self.leaf_offsets = (np.arange(self.num_trees, dtype=np.int64) << self.depth)[None, :] - n_splits
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """From an exported .npz, or a save_arrays directory (memory-mapped read-only with mmap=True)."""
+        path = os.fspath(path)
+        if os.path.isdir(path):
+            mmap_mode = 'r' if mmap else None
+            return cls({
+                name[:-len(".npy")]: np.load(os.path.join(path, name), mmap_mode=mmap_mode)
+                for name in os.listdir(path) if name.endswith(".npy")
+            })
+        with np.load(path) as arrays:
+            return cls({name: arrays[name] for name in arrays.files})
+
+    def inplace_predict(self, X, batch_rows=4096):
+        """Predictions for a 2-D array of features (NaN = missing), in feature_names order."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError(f"❌ Expected a 2-D feature array, got shape {X.shape}")
+        predictions = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), batch_rows):
+            predictions[start:start + batch_rows] = self._predict_batch(X[start:start + batch_rows])
+        return predictions
+
+    def _predict_batch(self, X):
+        values = np.ascontiguousarray(X).ravel()
+        row_starts = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+        slots = np.zeros((len(X), self.num_trees), dtype=np.int64)
+        for _ in range(self.depth):
+            node = self.split_offsets + slots
+            x = values[row_starts + self.feature[node]]
+            # XGBoost: x < threshold goes left, missing follows the learned default
+            go_left = (x < self.threshold[node]) | (np.isnan(x) & self.default_left[node])
+            slots = 2 * slots + 2 - go_left
+        return self.base_score + self.leaf_value[self.leaf_offsets + slots].sum(axis=1, dtype=np.float64)
+
+def export_local_models():
+    """Compiles the server's local model(s): SERVE_MODEL_PATH and any component models."""
+    import xgboost as xgb
+
+    model_paths = [config.SERVE_MODEL_PATH]
+    if os.path.isdir(config.COMPONENT_MODEL_DIR):
+        model_paths += sorted(
+            os.path.join(config.COMPONENT_MODEL_DIR, name)
+            for name in os.listdir(config.COMPONENT_MODEL_DIR) if name.endswith('.ubj')
+        )
+
+    exported = []
+    for model_path in model_paths:
+        if not os.path.exists(model_path):
+            continue
+        path = export_booster(xgb.Booster(model_file=os.fspath(model_path)), compiled_path(model_path))
+        print(f"✅ Compiled {os.path.basename(os.fspath(model_path))} -> {path}")
+        exported.append(path)
+    if not exported:
+        print(f"❌ No trained model at {config.SERVE_MODEL_PATH}. Run src/models/train.py first.")
+    return exported
+
+if __name__ == "__main__":
+    export_local_models()
@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import shutil
+import threading
+import numpy as np
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+from src.features.scoring import is_target_column
+
+# Bump whenever the on-disk layout or the feature selection changes
+MATRIX_VERSION = 1
+
+TARGET_COL = 'FANTASY_PTS'
+
+# Metadata columns that are never features
+ID_COLUMNS = ['PLAYER_ID', 'GAME_DATE', 'SEASON']
+
+# Chronological Train-Test Split (80/20)
+TRAIN_FRACTION = 0.8
+
+# QuantileDMatrix per (matrix, rows, ref), built once per process
+_DMATRICES = {}
+_DMATRIX_LOCK = threading.Lock()
+
+def training_matrix_dir():
+    return config.PROCESSED_DATA_DIR / config.TRAINING_MATRIX_NAME
+
+def feature_columns(df):
+    """The model's features: every numeric Golden Table column except ids/dates and same-game targets."""
+    return [
+        col for col in df.select_dtypes(include=['number']).columns
+        if col not in ID_COLUMNS + [TARGET_COL] and not is_target_column(col)
+    ]
+
+def build_training_matrix(df=None):
+    """
+    Writes the training matrix from the Golden Table, sorted by (GAME_DATE, PLAYER_ID):
+    - X.npy: float32 features
+    - y.npy / targets.npy: FANTASY_PTS and every other target column (float64)
+    - dates.npy / player_ids.npy: the row keys (for walk-forward folds and baselines)
+    Plain .npy so every reader memory-maps it instead of parsing and sorting again.
+    """
+    print("🗄️ Building the training matrix...")
+    fingerprint = storage.golden_table_fingerprint()
+    if df is None:
+        df = storage.load_golden_table()
+
+    # Sort chronologically (the whole league, not by player); player breaks ties so reruns agree
+    df = df.sort_values(by=['GAME_DATE', 'PLAYER_ID'], kind='stable').reset_index(drop=True)
+    feature_cols = feature_columns(df)
+    target_cols = [col for col in df.columns if is_target_column(col)]
+
+    matrix_dir = training_matrix_dir()
+    tmp_dir = matrix_dir.with_name(matrix_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    np.save(tmp_dir / "X.npy", np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.float32)))
+    np.save(tmp_dir / "y.npy", df[TARGET_COL].to_numpy(dtype=np.float64))
+    np.save(tmp_dir / "targets.npy", df[target_cols].to_numpy(dtype=np.float64))
+    np.save(tmp_dir / "dates.npy", df['GAME_DATE'].to_numpy(dtype='datetime64[ns]'))
+    np.save(tmp_dir / "player_ids.npy", df['PLAYER_ID'].to_numpy(dtype=np.int64))
+    with open(tmp_dir / "meta.json", 'w') as file:
+        json.dump({
+            'version': MATRIX_VERSION,
+            'golden_table_fingerprint': fingerprint,
+            'rows': int(len(df)),
+            'split_idx': int(len(df) * TRAIN_FRACTION),
+            'feature_columns': feature_cols,
+            'target_columns': target_cols,
+        }, file, indent=2)
+
+    if matrix_dir.exists():
+        shutil.rmtree(matrix_dir)
+    os.replace(tmp_dir, matrix_dir)
+    print(f"✅ Training matrix ready: {len(df)} rows x {len(feature_cols)} features -> {matrix_dir}")
+
+class TrainingData:
+    """
+    Read-only, memory-mapped training matrix shared by train, tune and the
+    backtester. Rows are in league-date order, so the train/test split (and
+    any walk-forward fold) is a contiguous slice: a view, never a copy.
+    """
+    def __init__(self, matrix_dir=None):
+        matrix_dir = matrix_dir or training_matrix_dir()
+        with open(matrix_dir / "meta.json", 'r') as file:
+            self.meta = json.load(file)
+
+        self.feature_names = self.meta['feature_columns']
+        self.target_names = self.meta['target_columns']
+        self.split_idx = self.meta['split_idx']
+        self.X = np.load(matrix_dir / "X.npy", mmap_mode='r')
+        self.y = np.load(matrix_dir / "y.npy", mmap_mode='r')
+        self.targets = np.load(matrix_dir / "targets.npy", mmap_mode='r')
+        self.dates = np.load(matrix_dir / "dates.npy", mmap_mode='r')
+        self.player_ids = np.load(matrix_dir / "player_ids.npy", mmap_mode='r')
+
+    def __len__(self):
+        return len(self.y)
+
+    @property
+    def X_train(self):
+        return self.X[:self.split_idx]
+
+    @property
+    def X_test(self):
+        return self.X[self.split_idx:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.split_idx]
+
+    @property
+    def y_test(self):
+        return self.y[self.split_idx:]
+
+    def target(self, name=TARGET_COL):
+        """One target column over every row (FANTASY_PTS, FANTASY_PTS_<system> or TARGET_<stat>)."""
+        if name == TARGET_COL:
+            return self.y
+        return self.targets[:, self.target_names.index(name)]
+
+    def feature(self, name):
+        return self.X[:, self.feature_names.index(name)]
+
+    def frame(self, start=0, stop=None):
+        """Rows [start, stop) as a DataFrame of features (model signatures, notebooks)."""
+        import pandas as pd
+        return pd.DataFrame(np.asarray(self.X[start:stop]), columns=self.feature_names)
+
+    def dmatrix(self, start=0, stop=None, label=None, ref=None, max_bin=256):
+        """
+        QuantileDMatrix of rows [start, stop), quantized ONCE per process and
+        reused by every later fit on the same rows (component models, tuning
+        trials). label (a full-length array, e.g. self.y) is set on every call.
+        Validation/test folds pass the training DMatrix as ref to share its bins.
+        """
+        import xgboost as xgb
+
+        stop = len(self) if stop is None else stop
+        key = (self.meta['golden_table_fingerprint'], start, stop, id(ref), max_bin)
+        with _DMATRIX_LOCK:
+            dmatrix = _DMATRICES.get(key)
+            if dmatrix is None:
+                dmatrix = xgb.QuantileDMatrix(
+                    self.X[start:stop], feature_names=self.feature_names, max_bin=max_bin, ref=ref
+                )
+                _DMATRICES[key] = dmatrix
+        if label is not None:
+            dmatrix.set_label(np.asarray(label[start:stop], dtype=np.float32))
+        return dmatrix
+
+def load_training_data(rebuild_if_stale=True):
+    """Opens the training matrix, rebuilding it first if the Golden Table changed since."""
+    meta_path = training_matrix_dir() / "meta.json"
+    stale = True
+    if meta_path.exists():
+        with open(meta_path, 'r') as file:
+            meta = json.load(file)
+        stale = (meta.get('version') != MATRIX_VERSION
+                 or meta.get('golden_table_fingerprint') != storage.golden_table_fingerprint())
+
+    if stale:
+        if not rebuild_if_stale:
+            raise FileNotFoundError(f"❌ Training matrix at {training_matrix_dir()} is missing or stale.")
+        build_training_matrix()
+    return TrainingData()
+
+def native_params(params):
+    """sklearn-style XGBRegressor params (config.MODEL_PARAMS) -> native xgb.train names. n_estimators is the round count."""
+    renames = {'random_state': 'seed', 'n_jobs': 'nthread'}
+    native = {renames.get(k, k): v for k, v in params.items() if k != 'n_estimators' and v is not None}
+    native.setdefault('tree_method', 'hist')
+    return native
+
+def as_regressor(booster):
+    """Wraps a trained booster in an XGBRegressor, the flavor every logged MLflow model has used."""
+    import xgboost as xgb
+    model = xgb.XGBRegressor()
+    model.load_model(bytearray(booster.save_raw(raw_format='ubj')))
+    return model
+
+if __name__ == "__main__":
+    build_training_matrix()
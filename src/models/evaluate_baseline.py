@@ -1,52 +1,51 @@
 import os
 import sys
-import pandas as pd
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-import mlflow
 from dotenv import load_dotenv
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from src import config
+from src.features.feature_store import open_feature_store
+from src.features.rolling import group_row_starts, shifted_window_mean
+from src.instrumentation import stage, log_pending_stages
+from src.models.tracking import Tracker
 
 load_dotenv()
 
-def evaluate_baselines():
-    print("📊 Initiating Baseline Evaluation Pipeline...")
-
-    # 1. Setup MLflow Tracking
-    os.environ["MLFLOW_TRACKING_USERNAME"] = os.getenv("MLFLOW_TRACKING_USERNAME")
-    os.environ["MLFLOW_TRACKING_PASSWORD"] = os.getenv("MLFLOW_TRACKING_PASSWORD")
-    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI"))
-    
-    # Create a dedicated experiment just for baselines
-    mlflow.set_experiment("01_WNBA_Baselines")
+# Baseline run name -> prediction column
+BASELINES = {
+    "Baseline_Last_Game": "PRED_LAST_GAME",
+    "Baseline_3G_Rolling": "FPTS_3G_AVG",
+    "Baseline_Season_To_Date": "PRED_SEASON_AVG"
+}
 
-    # 2. Load the Golden Table
-    data_path = config.PROCESSED_DATA_DIR / "training_features.csv"
-    df = pd.read_csv(data_path)
-    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
+def baseline_test_set():
+    """Loads the features, computes every baseline prediction and returns the chronological 20% test split."""
+    # Load from the feature store: memory-mapped, already in (PLAYER_ID, GAME_DATE) order,
+    # so the per-player shifts below see each player's games chronologically
+    with stage('load') as timer:
+        df = open_feature_store().frame(columns=['FPTS_3G_AVG'], targets=['FANTASY_PTS'])
+        timer.rows_out = len(df)
 
-    # 3. Calculate the new baselines dynamically
+    # A. Calculate the new baselines dynamically
     print("🧮 Calculating baseline predictions...")
     
-    # Baseline 1: Last Game (Shift 1)
-    df['PRED_LAST_GAME'] = df.groupby('PLAYER_ID')['FANTASY_PTS'].shift(1)
-    
-    # Baseline 2: Season-to-Date Average
-    # Extract the year to group by season, then take an expanding mean
-    df['SEASON'] = df['GAME_DATE'].dt.year
-    df['PRED_SEASON_AVG'] = df.groupby(['PLAYER_ID', 'SEASON'])['FANTASY_PTS'].transform(
-        lambda x: x.expanding().mean().shift(1)
-    )
+    with stage('predict', rows_in=len(df)):
+        # Baseline 1: Last Game (Shift 1)
+        df['PRED_LAST_GAME'] = df.groupby('PLAYER_ID')['FANTASY_PTS'].shift(1)
+
+        # Baseline 2: Season-to-Date Average
+        # Extract the year to group by season, then take an expanding mean
+        df['SEASON'] = df['GAME_DATE'].dt.year
+        season_starts = group_row_starts(df['PLAYER_ID'].to_numpy(), df['SEASON'].to_numpy())
+        df['PRED_SEASON_AVG'] = shifted_window_mean(df['FANTASY_PTS'].to_numpy(), season_starts)
     
     # Baseline 3: 3-Game Average (Already exists from build_features.py)
     # df['FPTS_3G_AVG'] 
 
-    # 4. Clean and Split the Data
+    # B. Clean and Split the Data
     # Drop rows where we couldn't calculate a baseline (e.g., the very first game of the season)
     df = df.dropna(subset=['PRED_LAST_GAME', 'PRED_SEASON_AVG', 'FPTS_3G_AVG', 'FANTASY_PTS'])
 
@@ -55,38 +54,43 @@ def evaluate_baselines():
     df = df.sort_values(by='GAME_DATE')
     
     split_idx = int(len(df) * 0.8)
-    test_df = df.iloc[split_idx:].copy()
-    
+    return df.iloc[split_idx:].copy()
+
+def score_baselines(test_df):
+    """MAE and RMSE of every baseline on the test split: {run_name: (mae, rmse)}."""
+    # Plain NumPy: importing sklearn.metrics alone costs more than this whole job's scoring
+    scores = {}
+    actual = test_df['FANTASY_PTS'].to_numpy(dtype=np.float64)
+    for run_name, col_name in BASELINES.items():
+        errors = test_df[col_name].to_numpy(dtype=np.float64) - actual
+        scores[run_name] = (float(np.mean(np.abs(errors))), float(np.sqrt(np.mean(errors ** 2))))
+    return scores
+
+def evaluate_baselines():
+    print("📊 Initiating Baseline Evaluation Pipeline...")
+
+    # 1. Load the features and build the baselines + test split
+    test_df = baseline_test_set()
     print(f"⏱️ Evaluating on {len(test_df)} test games (Chronological Split).")
 
-    # 5. Define our baselines to loop through
-    baselines = {
-        "Baseline_Last_Game": "PRED_LAST_GAME",
-        "Baseline_3G_Rolling": "FPTS_3G_AVG",
-        "Baseline_Season_To_Date": "PRED_SEASON_AVG"
-    }
-
-    # 6. Evaluate and Log to DagsHub
-    for run_name, col_name in baselines.items():
-        with mlflow.start_run(run_name=run_name):
-            
-            mae = mean_absolute_error(test_df['FANTASY_PTS'], test_df[col_name])
-            rmse = np.sqrt(mean_squared_error(test_df['FANTASY_PTS'], test_df[col_name]))
-            
-            print("-" * 30)
-            print(f"🏆 {run_name}")
-            print(f"📉 MAE:  {mae:.2f}")
-            print(f"📉 RMSE: {rmse:.2f}")
-            
-            # Log metrics
-            mlflow.log_metric("test_mae", mae)
-            mlflow.log_metric("test_rmse", rmse)
-            
-            # Tag it so it's easy to filter in the UI
-            mlflow.set_tag("model_type", "baseline")
+    # 2. Setup MLflow Tracking (a dedicated experiment just for baselines; mlflow loads here, after the real work)
+    tracker = Tracker("01_WNBA_Baselines")
+
+    # 3. Evaluate and Log to DagsHub (one batch per run, sent in the background)
+    with tracker:
+        for run_name, (mae, rmse) in score_baselines(test_df).items():
+            with tracker.start_run(run_name, tags={"model_type": "baseline"}) as run:
+                # The load/predict timings finished before any run: the first baseline's run takes them
+                log_pending_stages()
+                print("-" * 30)
+                print(f"🏆 {run_name}")
+                print(f"📉 MAE:  {mae:.2f}")
+                print(f"📉 RMSE: {rmse:.2f}")
+
+                run.log_metrics({"test_mae": mae, "test_rmse": rmse})
 
     print("-" * 30)
     print("✅ All baselines logged to DagsHub!")
 
 if __name__ == "__main__":
-    evaluate_baselines()
\ No newline at end of file
+    evaluate_baselines()
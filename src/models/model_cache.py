@@ -0,0 +1,266 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.models.compiled import CompiledEnsemble, flatten_booster, save_arrays
+
+# Entry kinds: one FANTASY_PTS model ('model') or one model per box score stat ('components')
+SINGLE_MODEL_NAME = "model"
+
+def parse_run_uri(model_uri):
+    """'runs:/<run_id>/<artifact>' -> (run_id, artifact); (None, None) for any other URI."""
+    if not model_uri or not model_uri.startswith("runs:/"):
+        return None, None
+    run_id, _, artifact = model_uri[len("runs:/"):].strip('/').partition('/')
+    return run_id, artifact or SINGLE_MODEL_NAME
+
+def artifact_hash(raw_models):
+    """sha256 over every model's name and native UBJ bytes (sorted by name)."""
+    digest = hashlib.sha256()
+    for name in sorted(raw_models):
+        digest.update(name.encode('utf-8') + b"\0")
+        digest.update(raw_models[name])
+    return digest.hexdigest()
+
+def _write_json(path, payload):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(payload, file, indent=2)
+    os.replace(tmp_path, path)
+
+def _read_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+class ModelCache:
+    """
+    Local, content-addressed store of trained models.
+
+        objects/<sha256>/<name>.ubj        native XGBoost booster(s)
+        objects/<sha256>/<name>.compiled/  the same model flattened to .npy files (memory-mapped on load)
+        objects/<sha256>/meta.json         run ID, feature list, scoring system
+        index.json                         run ID -> hash, plus size/last use of every entry
+        champion.json                      the entry the prediction server loads
+
+    The same bytes from two runs share one entry. Least recently used entries
+    are evicted past MODEL_CACHE_MAX_MB; the champion never is.
+    """
+    def __init__(self, cache_dir=None, max_mb=None):
+        self.cache_dir = os.fspath(cache_dir or config.MODEL_CACHE_DIR)
+        self.max_bytes = (config.MODEL_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.champion_path = os.path.join(self.cache_dir, "champion.json")
+        self.lock = threading.Lock()
+
+    # --- INDEX ---
+
+    def _index(self):
+        return _read_json(self.index_path, {'runs': {}, 'entries': {}})
+
+    def entry_dir(self, key):
+        return os.path.join(self.objects_dir, key)
+
+    def meta(self, key):
+        """The entry's meta.json, or None if it isn't cached."""
+        return _read_json(os.path.join(self.entry_dir(key), "meta.json"))
+
+    def lookup(self, run_id):
+        """Hash of the entry cached for a run, or None."""
+        key = self._index()['runs'].get(run_id)
+        return key if key and os.path.isdir(self.entry_dir(key)) else None
+
+    def entries(self):
+        """Every cached entry's meta, most recently used first."""
+        index = self._index()
+        order = sorted(index['entries'], key=lambda key: index['entries'][key]['last_used'], reverse=True)
+        return [meta for meta in (self.meta(key) for key in order) if meta is not None]
+
+    def _touch(self, key):
+        with self.lock:
+            index = self._index()
+            if key in index['entries']:
+                index['entries'][key]['last_used'] = time.time()
+                _write_json(self.index_path, index)
+
+    # --- WRITE ---
+
+    def put(self, boosters, run_id=None, scoring_system=None, source=None):
+        """
+        Caches trained booster(s): {name: xgb.Booster}. A single model goes in
+        as {'model': booster}, component models as {stat: booster}. Returns the hash.
+        """
+        raw_models = {name: bytes(booster.save_raw(raw_format='ubj')) for name, booster in boosters.items()}
+        key = artifact_hash(raw_models)
+        feature_names = next(iter(boosters.values())).feature_names
+
+        with self.lock:
+            target = self.entry_dir(key)
+            if not os.path.isdir(target):
+                tmp_dir = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                os.makedirs(tmp_dir)
+                for name, raw in raw_models.items():
+                    with open(os.path.join(tmp_dir, f"{name}.ubj"), 'wb') as file:
+                        file.write(raw)
+                    try:
+                        save_arrays(flatten_booster(boosters[name]), os.path.join(tmp_dir, f"{name}.compiled"))
+                    except ValueError as e:
+                        print(f"⚠️ {name} not compiled for serving: {e}")
+                _write_json(os.path.join(tmp_dir, "meta.json"), {
+                    'hash': key,
+                    'run_id': run_id,
+                    'kind': 'model' if list(raw_models) == [SINGLE_MODEL_NAME] else 'components',
+                    'models': sorted(raw_models),
+                    'feature_names': list(feature_names or []),
+                    # None for component models: they serve every scoring system
+                    'scoring_system': scoring_system,
+                    'source': source,
+                    'cached_at': time.time(),
+                })
+                os.replace(tmp_dir, target)
+
+            index = self._index()
+            if run_id:
+                index['runs'][run_id] = key
+            index['entries'][key] = {'size': _dir_size(target), 'last_used': time.time()}
+            _write_json(self.index_path, index)
+            self._evict(index, keep=key)
+        return key
+
+    def _evict(self, index, keep=None):
+        """Drops least recently used entries (never the champion or `keep`) until the cache fits max_bytes."""
+        champion = (self.champion() or {}).get('hash')
+        total = sum(entry['size'] for entry in index['entries'].values())
+        for key in sorted(index['entries'], key=lambda key: index['entries'][key]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key in (champion, keep):
+                continue
+            total -= index['entries'].pop(key)['size']
+            index['runs'] = {run_id: k for run_id, k in index['runs'].items() if k != key}
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            print(f"🧹 Evicted cached model {key[:12]} (cache over {self.max_bytes / (1024 * 1024):g} MB)")
+        _write_json(self.index_path, index)
+
+    def pull(self, run_id):
+        """
+        The cached entry for an MLflow run, downloading it once if needed:
+        'model', or 'model_<STAT>' for every component when the run logged them.
+        Returns the hash.
+        """
+        key = self.lookup(run_id)
+        if key is not None:
+            return key
+
+        import mlflow.xgboost
+        from mlflow.tracking import MlflowClient
+        from src.models.tracking import setup_mlflow
+        from src.features.scoring import STAT_COLUMNS
+
+        setup_mlflow("WNBA_Fantasy_Predictor")
+        params = MlflowClient().get_run(run_id).data.params
+        print(f"⬇️  Downloading run {run_id} into the local model cache...")
+        if params.get('components'):
+            boosters = {
+                stat: mlflow.xgboost.load_model(f"runs:/{run_id}/model_{stat}").get_booster()
+                for stat in STAT_COLUMNS
+            }
+        else:
+            boosters = {SINGLE_MODEL_NAME: mlflow.xgboost.load_model(f"runs:/{run_id}/model").get_booster()}
+        return self.put(boosters, run_id=run_id, scoring_system=params.get('scoring_system'), source=f"runs:/{run_id}")
+
+    # --- CHAMPION ---
+
+    def champion(self):
+        """{'hash', 'run_id', 'promoted_at'} of the current champion, or None."""
+        return _read_json(self.champion_path)
+
+    def promote(self, key_or_run_id):
+        """Points the champion at a cached entry (by hash or run ID). Returns the hash."""
+        key = self.lookup(key_or_run_id) or key_or_run_id
+        meta = self.meta(key)
+        if meta is None:
+            raise KeyError(f"❌ Nothing cached for '{key_or_run_id}'. Pull the run first (model_cache.py pull <run_id>).")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _write_json(self.champion_path, {'hash': key, 'run_id': meta['run_id'], 'promoted_at': time.time()})
+        print(f"👑 Champion is now {key[:12]} (run {meta['run_id']})")
+        return key
+
+    # --- READ ---
+
+    def load(self, key):
+        """
+        Loads a cached entry: {name: model}. Compiled models are memory-mapped
+        (read-only, shared between processes); the rest go through xgboost.
+        """
+        meta = self.meta(key)
+        if meta is None:
+            raise KeyError(f"❌ No cached model {key}")
+        models = {}
+        for name in meta['models']:
+            compiled_dir = os.path.join(self.entry_dir(key), f"{name}.compiled")
+            if config.SERVE_COMPILED and os.path.isdir(compiled_dir):
+                models[name] = CompiledEnsemble.load(compiled_dir, mmap=True)
+            else:
+                import xgboost as xgb
+                models[name] = xgb.Booster(model_file=os.path.join(self.entry_dir(key), f"{name}.ubj"))
+        self._touch(key)
+        return models
+
+    def load_champion(self):
+        """(meta, {name: model}) of the champion, or (None, None) without one."""
+        champion = self.champion()
+        if champion is None or self.meta(champion['hash']) is None:
+            return None, None
+        return self.meta(champion['hash']), self.load(champion['hash'])
+
+def cache_trained_models(boosters, run_id, scoring_system=None):
+    """train.py's hook: caches freshly trained booster(s) under their run and, with MODEL_CACHE_AUTO_PROMOTE, crowns them."""
+    cache = ModelCache()
+    key = cache.put(boosters, run_id=run_id, scoring_system=scoring_system, source=f"runs:/{run_id}")
+    print(f"🗄️  Cached as {key[:12]} in {cache.cache_dir}")
+    if config.MODEL_CACHE_AUTO_PROMOTE:
+        cache.promote(key)
+    return key
+
+def main(argv):
+    """
+    python src/models/model_cache.py list
+    python src/models/model_cache.py pull <run_id> [--promote]
+    python src/models/model_cache.py promote <run_id | hash>
+    """
+    cache = ModelCache()
+    command = argv[0] if argv else 'list'
+    if command == 'list':
+        champion = (cache.champion() or {}).get('hash')
+        for meta in cache.entries():
+            marker = "👑" if meta['hash'] == champion else "  "
+            print(f"{marker} {meta['hash'][:12]}  run {meta['run_id']}  {meta['kind']} ({len(meta['models'])})  "
+                  f"{len(meta['feature_names'])} features  scoring: {meta['scoring_system'] or 'any'}")
+    elif command == 'pull' and len(argv) > 1:
+        key = cache.pull(argv[1])
+        if '--promote' in argv:
+            cache.promote(key)
+    elif command == 'promote' and len(argv) > 1:
+        cache.promote(argv[1])
+    else:
+        print(main.__doc__)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
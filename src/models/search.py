@@ -0,0 +1,266 @@
+import os
+import sys
+import math
+import time
+import multiprocessing
+import numpy as np
+import xgboost as xgb
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.models.dataset import load_training_data
+
+# Optional: only needed for TUNE_STRATEGY = 'tpe'
+try:
+    import optuna
+except ImportError:
+    optuna = None
+
+# Per-worker DMatrices (built once per process by the pool initializer)
+_FOLDS = None
+
+def validation_split(n_train):
+    """
+    Carves the chronological tail of the training split off as the early-stopping
+    fold: rows [0, fit_end) fit, rows [fit_end, n_train) validate. Returns fit_end.
+    """
+    n_val = max(1, int(n_train * config.TUNE_VALIDATION_FRACTION))
+    return n_train - n_val
+
+def sample_params(rng, space=None):
+    """Draws one configuration from TUNE_SEARCH_SPACE ('int', 'float' or 'log' ranges)."""
+    space = space or config.TUNE_SEARCH_SPACE
+    params = {}
+    for name, (kind, low, high) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+def booster_params(params, n_jobs):
+    """sklearn-style names -> native xgb.train parameters (n_estimators becomes the round budget)."""
+    native = {k: v for k, v in params.items() if k != 'n_estimators'}
+    native.update({
+        'objective': 'reg:squarederror',
+        'eval_metric': 'mae',
+        'tree_method': 'hist',
+        'device': config.TUNE_DEVICE,
+        'nthread': n_jobs,
+        'seed': config.TUNE_SEED,
+    })
+    return native
+
+def trial_pool(n_workers, initializer):
+    """
+    Process pool for tuning trials. Workers start from a clean interpreter
+    (forkserver, or spawn where that's missing) rather than a fork of this
+    process, which by now runs threads (the MLflow tracker, XGBoost's OpenMP
+    pool) that a fork can leave deadlocked. They re-import config, so the
+    settings changed at runtime (--strategy, benchmark paths) are sent along.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    settings = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context(method),
+                               initializer=_init_pool_worker, initargs=(settings, initializer))
+
+def _init_pool_worker(settings, initializer):
+    for name, value in settings.items():
+        setattr(config, name, value)
+    initializer()
+
+def _init_fold_worker(data=None):
+    """Quantizes the fit fold once (the validation fold shares its bins); workers map the matrix from disk."""
+    global _FOLDS
+    data = data or load_training_data(rebuild_if_stale=False)
+    fit_end = validation_split(data.split_idx)
+    dfit = data.dmatrix(0, fit_end, label=data.y)
+    _FOLDS = {
+        'fit': dfit,
+        'val': data.dmatrix(fit_end, data.split_idx, label=data.y, ref=dfit),
+        'X_test': data.X_test,
+        'y_test': np.asarray(data.y_test),
+    }
+
+def _score_test(booster, best_iteration):
+    preds = booster.inplace_predict(_FOLDS['X_test'], iteration_range=(0, best_iteration + 1))
+    y_test = _FOLDS['y_test']
+    return mean_absolute_error(y_test, preds), float(np.sqrt(mean_squared_error(y_test, preds))), preds
+
+def _train_rung(i, params, n_jobs, rounds, history, booster_raw):
+    """
+    Continues one configuration up to `rounds` boosting rounds (resuming from
+    booster_raw) and returns its validation curve so far.
+    """
+    start_time = time.time()
+    booster = None
+    if booster_raw is not None:
+        booster = xgb.Booster(model_file=bytearray(booster_raw))
+
+    evals_result = {}
+    booster = xgb.train(
+        booster_params(params, n_jobs),
+        _FOLDS['fit'],
+        num_boost_round=rounds - len(history),
+        evals=[(_FOLDS['val'], 'val')],
+        evals_result=evals_result,
+        xgb_model=booster,
+        verbose_eval=False
+    )
+    history = history + list(evals_result['val']['mae'])
+    best_iteration = int(np.argmin(history))
+    test_mae, test_rmse, _ = _score_test(booster, best_iteration)
+
+    return {
+        'index': i,
+        'history': history,
+        'best_iteration': best_iteration,
+        'val_mae': float(history[best_iteration]),
+        'test_mae': test_mae,
+        'test_rmse': test_rmse,
+        'duration': time.time() - start_time,
+        'booster': bytes(booster.save_raw(raw_format='ubj')),
+    }
+
+def rung_budgets():
+    """Boosting-round budgets per rung: TUNE_MIN_ROUNDS * eta^k, ending at TUNE_MAX_ROUNDS."""
+    budgets = []
+    rounds = config.TUNE_MIN_ROUNDS
+    while rounds < config.TUNE_MAX_ROUNDS:
+        budgets.append(rounds)
+        rounds *= config.TUNE_HALVING_ETA
+    budgets.append(config.TUNE_MAX_ROUNDS)
+    return budgets
+
+def successive_halving(data, n_workers, threads_per_trial):
+    """
+    Successive halving on boosting rounds: TUNE_N_CANDIDATES random configs all
+    get the first rung's budget, then only the best 1/eta (by validation MAE)
+    keep training to the next rung. Configs whose validation MAE hasn't improved
+    for TUNE_EARLY_STOPPING_ROUNDS are frozen where they are.
+    Returns one record per configuration (where it stopped, its scores, booster).
+    """
+    rng = np.random.default_rng(config.TUNE_SEED)
+    candidates = [sample_params(rng) for _ in range(config.TUNE_N_CANDIDATES)]
+
+    records = {i: {'index': i, 'params': params, 'history': [], 'booster': None, 'rung': 0, 'duration': 0.0}
+               for i, params in enumerate(candidates)}
+    alive = list(records)
+    budgets = rung_budgets()
+
+    with trial_pool(n_workers, _init_fold_worker) as pool:
+        for rung, rounds in enumerate(budgets):
+            # Frozen configs (early-stopped) keep their score but train no further
+            to_train = [i for i in alive
+                        if len(records[i]['history']) - 1 - records[i].get('best_iteration', 0) < config.TUNE_EARLY_STOPPING_ROUNDS]
+            print(f"🪜 Rung {rung + 1}/{len(budgets)}: {len(alive)} configs at {rounds} rounds ({len(to_train)} still training)...")
+
+            futures = [
+                pool.submit(_train_rung, i, records[i]['params'], threads_per_trial, rounds,
+                            records[i]['history'], records[i]['booster'])
+                for i in to_train
+            ]
+            for future in futures:
+                result = future.result()
+                record = records[result['index']]
+                record.update({k: v for k, v in result.items() if k != 'duration'}, rung=rung + 1)
+                record['duration'] += result['duration']
+
+            if rung == len(budgets) - 1:
+                break
+
+            # Promote the best 1/eta (index breaks ties, so reruns agree)
+            n_keep = max(1, math.ceil(len(alive) / config.TUNE_HALVING_ETA))
+            alive = sorted(alive, key=lambda i: (records[i]['val_mae'], i))[:n_keep]
+
+    for record in records.values():
+        record['n_estimators'] = record['best_iteration'] + 1
+        record['status'] = 'finalist' if record['index'] in alive else f"stopped_rung_{record['rung']}"
+    return [records[i] for i in sorted(records)]
+
+class _PruningCallback(xgb.callback.TrainingCallback):
+    """Reports validation MAE to Optuna every few rounds and stops unpromising trials."""
+    def __init__(self, trial, every=10):
+        self.trial = trial
+        self.every = every
+
+    def after_iteration(self, model, epoch, evals_log):
+        if epoch % self.every == 0:
+            self.trial.report(evals_log['val']['mae'][-1], step=epoch)
+            if self.trial.should_prune():
+                raise optuna.TrialPruned()
+        return False
+
+def tpe_search(data, n_workers, threads_per_trial):
+    """
+    Bayesian (TPE) search over TUNE_SEARCH_SPACE with a Hyperband pruner on
+    boosting rounds and early stopping on the chronological validation fold.
+    Trials run on threads (XGBoost releases the GIL while training).
+    Returns one record per trial, pruned ones included.
+    """
+    if optuna is None:
+        raise ImportError("❌ TUNE_STRATEGY='tpe' needs optuna (pip install optuna).")
+
+    _init_fold_worker(data)
+    boosters = {}
+
+    def objective(trial):
+        params = {}
+        for name, (kind, low, high) in config.TUNE_SEARCH_SPACE.items():
+            if kind == 'int':
+                params[name] = trial.suggest_int(name, low, high)
+            else:
+                params[name] = trial.suggest_float(name, low, high, log=(kind == 'log'))
+
+        start_time = time.time()
+        booster = xgb.train(
+            booster_params(params, threads_per_trial),
+            _FOLDS['fit'],
+            num_boost_round=config.TUNE_MAX_ROUNDS,
+            evals=[(_FOLDS['val'], 'val')],
+            early_stopping_rounds=config.TUNE_EARLY_STOPPING_ROUNDS,
+            callbacks=[_PruningCallback(trial)],
+            verbose_eval=False
+        )
+        test_mae, test_rmse, _ = _score_test(booster, booster.best_iteration)
+        trial.set_user_attr('n_estimators', booster.best_iteration + 1)
+        trial.set_user_attr('test_mae', test_mae)
+        trial.set_user_attr('test_rmse', test_rmse)
+        trial.set_user_attr('duration', time.time() - start_time)
+        boosters[trial.number] = bytes(booster.save_raw(raw_format='ubj'))
+        return booster.best_score
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(
+        direction='minimize',
+        sampler=optuna.samplers.TPESampler(seed=config.TUNE_SEED),
+        pruner=optuna.pruners.HyperbandPruner(
+            min_resource=config.TUNE_MIN_ROUNDS,
+            max_resource=config.TUNE_MAX_ROUNDS,
+            reduction_factor=config.TUNE_HALVING_ETA
+        )
+    )
+    study.optimize(objective, n_trials=config.TUNE_TPE_TRIALS, n_jobs=n_workers)
+
+    records = []
+    for trial in study.trials:
+        attrs = trial.user_attrs
+        records.append({
+            'index': trial.number,
+            'params': trial.params,
+            'status': trial.state.name.lower(),
+            'val_mae': trial.value if trial.value is not None else float('nan'),
+            'n_estimators': attrs.get('n_estimators'),
+            'test_mae': attrs.get('test_mae', float('nan')),
+            'test_rmse': attrs.get('test_rmse', float('nan')),
+            'duration': attrs.get('duration', 0.0),
+            'booster': boosters.get(trial.number),
+        })
+    return records
@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.features import incremental
+from src.features.feature_store import PlayerFeatureState
+from src.features.scoring import STAT_COLUMNS, build_weight_matrix
+from src.models.compiled import CompiledEnsemble, compiled_path
+from src.models.model_cache import ModelCache, SINGLE_MODEL_NAME, parse_run_uri
+
+def _load_model_file(model_path):
+    """
+    The NumPy-compiled twin of a saved model when SERVE_COMPILED is on and it is
+    at least as new as the .ubj; otherwise the xgboost booster (imported only then).
+    """
+    compiled = compiled_path(model_path)
+    if config.SERVE_COMPILED and os.path.exists(compiled) and (
+        not os.path.exists(model_path) or os.path.getmtime(compiled) >= os.path.getmtime(model_path)
+    ):
+        return CompiledEnsemble.load(compiled)
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"❌ No model at {model_path}. Run src/models/train.py first (or set WNBA_MODEL_URI).")
+
+    import xgboost as xgb
+    return xgb.Booster(model_file=os.fspath(model_path))
+
+def load_booster(model_uri=None, model_path=None):
+    """
+    Loads the model once: from an MLflow model URI if one is set (runs:/ URIs
+    through the local model cache, so only the first load downloads), else the
+    local file (its compiled .npz when available, see _load_model_file).
+    """
+    model_uri = model_uri or config.SERVE_MODEL_URI
+    run_id, artifact = parse_run_uri(model_uri)
+    if run_id and artifact == SINGLE_MODEL_NAME:
+        cache = ModelCache()
+        return cache.load(cache.pull(run_id))[SINGLE_MODEL_NAME]
+    if model_uri:
+        import mlflow.xgboost
+        return mlflow.xgboost.load_model(model_uri).get_booster()
+    return _load_model_file(model_path or config.SERVE_MODEL_PATH)
+
+def load_component_boosters(model_dir=None):
+    """Loads the per-stat models train.py saves with COMPONENT_MODELS on. Returns {stat: model} in STAT_COLUMNS order."""
+    model_dir = model_dir or config.COMPONENT_MODEL_DIR
+    paths = {stat: os.path.join(model_dir, f"{stat}.ubj") for stat in STAT_COLUMNS}
+    missing = [stat for stat, path in paths.items() if not (os.path.exists(path) or os.path.exists(compiled_path(path)))]
+    if missing:
+        raise FileNotFoundError(f"❌ No component models for {missing} in {model_dir}. Run src/models/train.py with WNBA_COMPONENT_MODELS=1 first.")
+    return {stat: _load_model_file(path) for stat, path in paths.items()}
+
+def load_production_models():
+    """
+    (booster, components) to serve: WNBA_MODEL_URI if set, else the model
+    cache's champion (a memory-mapped local read), else the files train.py
+    saved next to SERVE_MODEL_PATH / in COMPONENT_MODEL_DIR.
+    """
+    if not config.SERVE_MODEL_URI:
+        meta, models = ModelCache().load_champion()
+        if meta is not None:
+            print(f"👑 Serving champion {meta['hash'][:12]} (run {meta['run_id']}) from the model cache")
+            if meta['kind'] == 'components':
+                return None, {stat: models[stat] for stat in STAT_COLUMNS}
+            return models[SINGLE_MODEL_NAME], None
+        if config.COMPONENT_MODELS:
+            return None, load_component_boosters()
+    return load_booster(), None
+
+def check_per_player(name, values, n_players):
+    """is_home / opp_team_ids: one value for everyone or exactly one per player."""
+    if values is not None and np.ndim(values) and len(values) != n_players:
+        raise ValueError(f"❌ {name} has {len(values)} values for {n_players} players (send one value, or one per player)")
+
+class PredictionService:
+    """
+    Warm model + in-memory player state. The state reloads itself whenever the
+    feature build (full or incremental) rewrites feature_state.json, so new
+    gamelogs show up without restarting the server.
+    With component models (COMPONENT_MODELS), every request can pick its
+    scoring system: the per-stat predictions are projected onto its YAML weights.
+    """
+    def __init__(self, booster=None, components=None):
+        if booster is None and components is None:
+            booster, components = load_production_models()
+        self.components = components
+        self.booster = None if components else booster
+
+        models = list(components.values()) if components else [self.booster]
+        self.feature_names = models[0].feature_names
+        if not self.feature_names:
+            raise ValueError("❌ The model was saved without feature names; retrain it with src/models/train.py.")
+        if any(model.feature_names != self.feature_names for model in models):
+            raise ValueError("❌ The component models were trained on different features; retrain them together.")
+
+        # Scoring system -> (YAML mtime, weight vector); a new or edited file is picked up on its next request
+        self.weights = {}
+
+        self.state_path = config.PROCESSED_DATA_DIR / incremental.STATE_FILENAME
+        self.state = None
+        self.state_mtime = None
+        self.lock = threading.Lock()
+        self.reload_state()
+
+    def reload_state(self):
+        """Rebuilds the player arrays from the saved feature state."""
+        mtime = os.stat(self.state_path).st_mtime_ns if self.state_path.exists() else None
+        state = incremental.load_feature_state()
+        if state is None:
+            raise FileNotFoundError(f"❌ No feature state at {self.state_path}. Run src/features/build_features.py first.")
+
+        player_state = PlayerFeatureState(state)
+        missing = set(self.feature_names) - set(player_state.features(player_state.rows([]), '2000-01-01', 0))
+        if missing:
+            raise ValueError(f"❌ The server can't compute model features: {sorted(missing)}")
+
+        with self.lock:
+            self.state, self.state_mtime = player_state, mtime
+        print(f"🔄 Loaded state for {len(player_state)} players (games through {player_state.last_game_date}).")
+
+    def _refresh_if_stale(self):
+        mtime = os.stat(self.state_path).st_mtime_ns if self.state_path.exists() else None
+        if mtime != self.state_mtime:
+            self.reload_state()
+
+    def scoring_weights(self, system):
+        """The system's STAT_COLUMNS weights, re-read only when its YAML file changes."""
+        path = config.SCORING_DIR / f"{system}.yml"
+        mtime = os.stat(path).st_mtime_ns if path.exists() else None
+        cached = self.weights.get(system)
+        if cached is None or cached[0] != mtime:
+            _, _, weights = build_weight_matrix([system])
+            cached = self.weights[system] = (mtime, weights[:, 0])
+        return cached[1]
+
+    def predict(self, player_ids, game_date, is_home, opp_team_ids=None, scoring=None):
+        """
+        Projected fantasy points for a slate of players on one date.
+        is_home (and opp_team_ids, optional) is one value for everyone or one
+        per player. Unknown players get None.
+        scoring picks the ruleset (default DEFAULT_SCORING_SYSTEM); anything
+        else needs component models.
+        """
+        scoring = scoring or config.DEFAULT_SCORING_SYSTEM
+        if not self.components and scoring != config.DEFAULT_SCORING_SYSTEM:
+            raise ValueError(f"❌ This model only predicts '{config.DEFAULT_SCORING_SYSTEM}'. "
+                             "Train component models (WNBA_COMPONENT_MODELS=1) to serve other scoring systems.")
+        weights = self.scoring_weights(scoring) if self.components else None
+
+        check_per_player('is_home', is_home, len(player_ids))
+        check_per_player('opp_team_ids', opp_team_ids, len(player_ids))
+
+        self._refresh_if_stale()
+        state = self.state
+
+        rows = state.rows(player_ids)
+        known = rows >= 0
+        is_home = np.asarray(is_home, dtype=np.float64)
+        if is_home.ndim:
+            is_home = is_home[known]
+        if opp_team_ids is not None:
+            opp_team_ids = np.asarray(opp_team_ids, dtype=np.int64)
+            if opp_team_ids.ndim:
+                opp_team_ids = opp_team_ids[known]
+
+        columns = state.features(rows[known], game_date, is_home, opp_team_ids)
+        X = np.column_stack([columns[name] for name in self.feature_names]).astype(np.float32)
+
+        predictions = np.full(len(rows), np.nan)
+        if len(X) and self.components:
+            components = np.column_stack([self.components[stat].inplace_predict(X) for stat in STAT_COLUMNS])
+            predictions[known] = components.astype(np.float64) @ weights
+        elif len(X):
+            predictions[known] = self.booster.inplace_predict(X)
+        return [None if np.isnan(p) else float(p) for p in predictions]
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    POST /predict  {"player_ids": [...], "game_date": "YYYY-MM-DD", "is_home": true | [..],
+                    "opp_team_ids": 1611661319 | [..] (optional),
+                    "scoring": "nba_default" (optional, component models only)}
+    POST /reload   re-reads the feature state now
+    GET  /health
+    """
+    service = None
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/health':
+            state = self.service.state
+            self._send_json(200, {'status': 'ok', 'players': len(state), 'games_through': state.last_game_date})
+        else:
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path == '/reload':
+            self.service.reload_state()
+            self._send_json(200, {'status': 'reloaded', 'players': len(self.service.state)})
+            return
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            player_ids = request['player_ids']
+            game_date = request['game_date']
+            is_home = request.get('is_home', 0)
+            opp_team_ids = request.get('opp_team_ids')
+            scoring = request.get('scoring') or config.DEFAULT_SCORING_SYSTEM
+            if not isinstance(player_ids, list):
+                raise ValueError("player_ids must be a list")
+            check_per_player('is_home', is_home, len(player_ids))
+            check_per_player('opp_team_ids', opp_team_ids, len(player_ids))
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': f"Bad request: {e}"})
+            return
+
+        start_time = time.perf_counter()
+        try:
+            predictions = self.service.predict(player_ids, game_date, is_home, opp_team_ids, scoring)
+        except (ValueError, FileNotFoundError, KeyError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        self._send_json(200, {
+            'game_date': game_date,
+            'scoring': scoring,
+            'predictions': [{'player_id': pid, 'fantasy_pts': pred} for pid, pred in zip(player_ids, predictions)],
+            'latency_ms': round((time.perf_counter() - start_time) * 1000, 3),
+        })
+
+    def log_message(self, format, *args):
+        # Keep the console for our own status lines
+        pass
+
+def serve(host=None, port=None):
+    print("🚀 Starting WNBA Fantasy Prediction Server...")
+    service = PredictionService()
+    PredictionHandler.service = service
+
+    host = host or config.SERVE_HOST
+    port = port or config.SERVE_PORT
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    kind = f"{len(service.components)} component models" if service.components else "model"
+    print(f"✅ Serving {len(service.feature_names)}-feature {kind} on http://{host}:{port} (POST /predict)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    serve()
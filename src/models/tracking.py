@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import queue
+import threading
+from contextlib import contextmanager
+
+# Path magic
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.instrumentation import stage
+
+# MLflow's log_batch limits (mlflow.utils.validation)
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+
+# Runs opened by Tracker.start_run in this thread (innermost last)
+_local = threading.local()
+
+def setup_mlflow(experiment_name):
+    """
+    Points MLflow at MLFLOW_TRACKING_URI from .env (DagsHub, or a local
+    file:/sqlite: store offline) and selects the experiment.
+    Credentials are only exported when they're set.
+    """
+    import mlflow
+    for name in ("MLFLOW_TRACKING_USERNAME", "MLFLOW_TRACKING_PASSWORD"):
+        value = os.getenv(name)
+        if value is not None:
+            os.environ[name] = value
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
+    if tracking_uri:
+        if "://" not in tracking_uri or tracking_uri.startswith("file:"):
+            # MLflow 3 refuses the ./mlruns file store unless told otherwise
+            os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+        mlflow.set_tracking_uri(tracking_uri)
+    return mlflow.set_experiment(experiment_name)
+
+def active_run():
+    """The innermost Tracker run open in this thread, or None."""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+class RunLogger:
+    """
+    Buffers one run's params, metrics and tags. Nothing is sent until the
+    buffer fills (TRACKING_BATCH_SIZE) or the run ends; then it all goes out
+    as log_batch calls on the tracker's background thread.
+    """
+    def __init__(self, tracker, run_id):
+        self.tracker = tracker
+        self.run_id = run_id
+        self.params, self.metrics, self.tags = {}, [], {}
+
+    def log_param(self, key, value):
+        self.params[key] = str(value)
+
+    def log_params(self, params):
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def log_metric(self, key, value, step=None):
+        from mlflow.entities import Metric
+        self.metrics.append(Metric(key, float(value), int(time.time() * 1000), step or 0))
+        if len(self.metrics) >= config.TRACKING_BATCH_SIZE:
+            self.flush()
+
+    def log_metrics(self, metrics, step=None):
+        for key, value in metrics.items():
+            self.log_metric(key, value, step)
+
+    def set_tag(self, key, value):
+        self.tags[key] = str(value)
+
+    def set_tags(self, tags):
+        for key, value in tags.items():
+            self.set_tag(key, value)
+
+    def log_model(self, log_fn):
+        """
+        Queues an artifact upload, e.g. lambda: mlflow.xgboost.log_model(model, "model").
+        log_fn runs on the background thread with this run active, after
+        everything logged so far.
+        """
+        self.flush()
+        self.tracker._submit(('artifact', self.run_id, log_fn))
+
+    def flush(self):
+        """Hands the buffered entries to the background thread, in MLflow-sized batches."""
+        from mlflow.entities import Param, RunTag
+        params = [Param(key, value) for key, value in self.params.items()]
+        tags = [RunTag(key, value) for key, value in self.tags.items()]
+        metrics = self.metrics
+        self.params, self.metrics, self.tags = {}, [], {}
+
+        while params or tags or metrics:
+            batch_params, params = params[:MAX_PARAMS_TAGS_PER_BATCH], params[MAX_PARAMS_TAGS_PER_BATCH:]
+            batch_tags, tags = tags[:MAX_PARAMS_TAGS_PER_BATCH], tags[MAX_PARAMS_TAGS_PER_BATCH:]
+            room = MAX_METRICS_PER_BATCH - len(batch_params) - len(batch_tags)
+            batch_metrics, metrics = metrics[:room], metrics[room:]
+            self.tracker._submit(('batch', self.run_id, (batch_metrics, batch_params, batch_tags)))
+
+class Tracker:
+    """
+    Batched, asynchronous MLflow logging shared by train, tune, the baselines
+    and the backtester. Runs are created up front (their IDs are needed right
+    away); params, metrics, tags, model uploads and run termination queue up
+    and go out in order from one background thread, so training never waits
+    on the tracking server.
+
+        with Tracker("02_WNBA_Hyperparameter_Tuning") as tracker:
+            with tracker.start_run("grid_search_1") as run:
+                run.log_params(params)
+                run.log_metric("test_mae", mae)
+
+    With TRACKING_ASYNC off, every queued call runs inline instead.
+    MLflow itself is only imported (and the server contacted) by the first start_run.
+    """
+    def __init__(self, experiment_name):
+        self.experiment_name = experiment_name
+        self.experiment_id = None
+        self.client = None
+        self.errors = []
+        self.calls = 0
+        self.queue = None
+        self.thread = None
+        if config.TRACKING_ASYNC:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(target=self._worker, name="mlflow-tracker", daemon=True)
+            self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        if self.client is None:
+            from mlflow.tracking import MlflowClient
+            self.experiment_id = setup_mlflow(self.experiment_name).experiment_id
+            self.client = MlflowClient()
+
+    @contextmanager
+    def start_run(self, run_name, tags=None):
+        """Opens a run (one synchronous call) and yields its RunLogger. The run ends FAILED if the block raises."""
+        self._connect()
+        run = self.client.create_run(self.experiment_id, run_name=run_name, tags=tags or {})
+        self.calls += 1
+        logger = RunLogger(self, run.info.run_id)
+
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(logger)
+        status = 'FAILED'
+        try:
+            yield logger
+            status = 'FINISHED'
+        finally:
+            stack.remove(logger)
+            logger.flush()
+            self._submit(('terminate', logger.run_id, status))
+
+    def _submit(self, job):
+        if self.queue is not None:
+            self.queue.put(job)
+        else:
+            self._run_job(job)
+
+    def _run_job(self, job):
+        kind, run_id, payload = job
+        try:
+            if kind == 'batch':
+                metrics, params, tags = payload
+                self.client.log_batch(run_id, metrics=metrics, params=params, tags=tags)
+            elif kind == 'artifact':
+                import mlflow
+                # The fluent run stack is per thread: this never touches the caller's runs
+                with mlflow.start_run(run_id=run_id):
+                    payload()
+            elif kind == 'terminate':
+                self.client.set_terminated(run_id, status=payload)
+            self.calls += 1
+        except Exception as e:
+            self.errors.append((kind, run_id, e))
+            print(f"   ⚠️ MLflow {kind} for run {run_id} failed: {e}")
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            self._run_job(job)
+
+    def close(self):
+        """
+        Waits until everything queued has reached the tracking server. The wait
+        is the 'mlflow_logging' stage: the logging calls themselves only queue.
+        """
+        if self.thread is not None:
+            with stage('mlflow_logging'):
+                self.queue.put(None)
+                self.thread.join()
+            self.thread = None
+        if self.errors:
+            print(f"   ⚠️ {len(self.errors)} MLflow call(s) failed; see the warnings above.")
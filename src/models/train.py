@@ -1,11 +1,8 @@
 import os
 import sys
-import pandas as pd
 import numpy as np
 import xgboost as xgb
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-import mlflow
-from mlflow.models.signature import infer_signature
 from dotenv import load_dotenv
 
 # Path magic
@@ -14,6 +11,12 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src import config
+from src.features.scoring import STAT_COLUMNS, component_target, project_components
+from src.models.compiled import export_next_to
+from src.instrumentation import stage, log_pending_stages
+from src.models.tracking import Tracker
+from src.models.model_cache import SINGLE_MODEL_NAME, cache_trained_models
+from src.models.dataset import load_training_data, native_params, as_regressor
 
 # Force load credentials
 load_dotenv()
@@ -21,69 +24,40 @@ load_dotenv()
 def train_model():
     print("🚀 Initiating XGBoost Model Training Pipeline...")
 
-    # Setup MLflow Tracking
-    tracking_uri = os.getenv("MLFLOW_TRACKING_URI")
-    db_user = os.getenv("MLFLOW_TRACKING_USERNAME")
-    db_pass = os.getenv("MLFLOW_TRACKING_PASSWORD")
-    
-    os.environ["MLFLOW_TRACKING_USERNAME"] = db_user
-    os.environ["MLFLOW_TRACKING_PASSWORD"] = db_pass
-    mlflow.set_tracking_uri(tracking_uri)
-    mlflow.set_experiment("WNBA_Fantasy_Predictor")
-
-    # Load the Golden Table
-    data_path = config.PROCESSED_DATA_DIR / "training_features.csv"
-    df = pd.read_csv(data_path)
-    
-    # Sort chronologically to match our baseline validation strategy
-    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-    df = df.sort_values(by='GAME_DATE')
-    
-    # Define Features (X) and Target (y)
-    target_col = 'FANTASY_PTS'
-    
-    # Only drop the metadata, build_features handled the rest
-    drop_cols = ['PLAYER_ID', 'GAME_DATE', 'SEASON', 'FANTASY_PTS']
-    
-    # Ensure all drop columns actually exist in the dataframe before dropping
-    drop_cols = [col for col in drop_cols if col in df.columns]
-    X = df.drop(columns=drop_cols)
-    y = df[target_col]
-
-    # FAIL-SAFE: Force X to only keep numeric columns (integers and floats)
-    X = X.select_dtypes(include=['number'])
-
-    # 4. Chronological Train-Test Split (80/20)
-    # We don't use random split in sports, otherwise we'd predict yesterday's game using tomorrow's data!
-    split_idx = int(len(df) * 0.8)
-    X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_test = y.iloc[:split_idx], y.iloc[split_idx:]
-    
-    print(f"📊 Training on {len(X_train)} games, Testing on {len(X_test)} games.")
-
-    # 5. Define Model Hyperparameters
-    params = {
-        'objective': 'reg:squarederror',
-        'learning_rate': 0.05,
-        'max_depth': 5,
-        'n_estimators': 100,
-        'random_state': 42
-    }
+    # Setup MLflow Tracking (batched, sent from a background thread)
+    tracker = Tracker("WNBA_Fantasy_Predictor")
+
+    # Memory-mapped, chronologically sorted float32 matrix (built once per Golden Table)
+    with stage('load') as timer:
+        data = load_training_data()
+        timer.rows_out = len(data)
+    X_test, y_test = data.X_test, data.y_test
+    print(f"📊 Training on {data.split_idx} games, Testing on {len(X_test)} games.")
+
+    # 5. Define Model Hyperparameters (shared with the backtester)
+    params = dict(config.MODEL_PARAMS)
 
     # 6. Start the MLflow System of Record
-    with mlflow.start_run(run_name="xgb_baseline_features"):
+    with tracker, tracker.start_run("xgb_baseline_features") as run:
+        # Stage timings from before the run (the load) go on the run too
+        log_pending_stages()
+
         # Log the hyperparameters
-        mlflow.log_params(params)
+        run.log_params(params)
         
         # Log the dataset size
-        mlflow.log_param("train_size", len(X_train))
+        run.log_param("train_size", data.split_idx)
+        run.log_param("scoring_system", config.DEFAULT_SCORING_SYSTEM)
         
         print("🧠 Training XGBoost Regressor...")
-        model = xgb.XGBRegressor(**params)
-        model.fit(X_train, y_train)
+        with stage('fit', rows_in=data.split_idx):
+            dtrain = data.dmatrix(0, data.split_idx, label=data.y)
+            booster = xgb.train(native_params(params), dtrain, num_boost_round=params['n_estimators'])
         
         print("🔮 Generating Predictions...")
-        predictions = model.predict(X_test)
+        with stage('predict', rows_in=len(X_test)) as timer:
+            predictions = booster.inplace_predict(X_test)
+            timer.rows_out = len(predictions)
         
         # 7. Evaluate Performance
         mae = mean_absolute_error(y_test, predictions)
@@ -95,15 +69,26 @@ def train_model():
         print("-" * 30)
         
         # Log the metrics
-        mlflow.log_metric("test_mae", mae)
-        mlflow.log_metric("test_rmse", rmse)
+        run.log_metrics({"test_mae": mae, "test_rmse": rmse})
         
-        # Save the feature signatures to DagsHub
-        signature = infer_signature(X_train, predictions)
-        mlflow.xgboost.log_model(model, "model", signature=signature)
+        # Save the feature signatures to DagsHub (uploaded in the background)
+        # mlflow is only imported once there's something to log
+        import mlflow.xgboost
+        from mlflow.models.signature import infer_signature
+        model = as_regressor(booster)
+        signature = infer_signature(data.frame(0, data.split_idx), predictions)
+        run.log_model(lambda: mlflow.xgboost.log_model(model, "model", signature=signature))
+
+        # Local copy for the prediction server (src/models/serve.py)
+        os.makedirs(config.MODEL_DIR, exist_ok=True)
+        booster.save_model(config.SERVE_MODEL_PATH)
+        # ... and its NumPy-compiled twin, so serving needs neither xgboost nor mlflow
+        export_next_to(booster, config.SERVE_MODEL_PATH)
+        # Content-addressed copy under this run ID (the server's champion by default)
+        cache_trained_models({SINGLE_MODEL_NAME: booster}, run.run_id, config.DEFAULT_SCORING_SYSTEM)
         
         # Add a text tag so you can quickly read the features in the UI
-        mlflow.set_tag("features_used", ", ".join(X_train.columns))
+        run.set_tag("features_used", ", ".join(data.feature_names))
         
         # The Gov-Grade Check
         if mae < 6.77:
@@ -111,5 +96,83 @@ def train_model():
         else:
             print("⚠️ WARNING: Model did not beat the Naive Baseline. Needs more feature engineering.")
 
+def train_component_models():
+    """
+    One XGBoost model per box score stat (scoring.STAT_COLUMNS) on the shared
+    feature matrix. Every scoring system in config/scoring is evaluated from
+    the same predictions: projection = components @ YAML weights.
+    """
+    print("🚀 Initiating Component Model Training (one model per box score stat)...")
+    tracker = Tracker("WNBA_Fantasy_Predictor")
+
+    targets = [component_target(stat) for stat in STAT_COLUMNS]
+    with stage('load') as timer:
+        data = load_training_data()
+        timer.rows_out = len(data)
+    X_test = data.X_test
+    Y_test = np.column_stack([data.target(target)[data.split_idx:] for target in targets])
+    print(f"📊 Training {len(targets)} component models on {data.split_idx} games, Testing on {len(X_test)} games.")
+
+    params = dict(config.MODEL_PARAMS)
+    os.makedirs(config.COMPONENT_MODEL_DIR, exist_ok=True)
+
+    with tracker, tracker.start_run("xgb_component_models") as run:
+        log_pending_stages()
+        run.log_params(params)
+        run.log_param("train_size", data.split_idx)
+        run.log_param("components", ", ".join(STAT_COLUMNS))
+
+        # 1. One regressor per component, all on the same quantized training rows (binned once)
+        boosters = {}
+        with stage('fit', rows_in=data.split_idx * len(targets)):
+            for stat, target in zip(STAT_COLUMNS, targets):
+                print(f"🧠 Training {stat} model...")
+                dtrain = data.dmatrix(0, data.split_idx, label=data.target(target))
+                boosters[stat] = xgb.train(native_params(params), dtrain, num_boost_round=params['n_estimators'])
+
+        with stage('predict', rows_in=len(X_test)) as timer:
+            components = np.column_stack([boosters[stat].inplace_predict(X_test) for stat in STAT_COLUMNS])
+            timer.rows_out = len(components)
+
+        # 2. Per-component accuracy
+        print("-" * 30)
+        for i, stat in enumerate(STAT_COLUMNS):
+            mae = mean_absolute_error(Y_test[:, i], components[:, i])
+            print(f"📉 {stat:<5} MAE: {mae:.2f}")
+            run.log_metric(f"test_mae_{stat}", mae)
+
+        # 3. Every scoring system from the same predictions (actuals scored with the same weights)
+        projected = project_components(components)
+        actual = project_components(Y_test)
+        print("-" * 30)
+        for system, points in projected.items():
+            mae = mean_absolute_error(actual[system], points)
+            rmse = np.sqrt(mean_squared_error(actual[system], points))
+            print(f"📉 {system}: MAE {mae:.2f} | RMSE {rmse:.2f} Fantasy Points")
+            run.log_metrics({f"test_mae_{system}": mae, f"test_rmse_{system}": rmse})
+            # The default ruleset doubles as the run's headline numbers (comparable with train_model)
+            if system == config.DEFAULT_SCORING_SYSTEM:
+                run.log_metrics({"test_mae": mae, "test_rmse": rmse})
+        print("-" * 30)
+
+        # 4. Log + save every component (the server projects them onto any ruleset)
+        import mlflow.xgboost
+        from mlflow.models.signature import infer_signature
+        features = data.frame(0, data.split_idx)
+        for i, stat in enumerate(STAT_COLUMNS):
+            signature = infer_signature(features, components[:, i])
+            run.log_model(lambda model=as_regressor(boosters[stat]), stat=stat, signature=signature:
+                          mlflow.xgboost.log_model(model, f"model_{stat}", signature=signature))
+        for stat, booster in boosters.items():
+            booster.save_model(config.COMPONENT_MODEL_DIR / f"{stat}.ubj")
+            export_next_to(booster, config.COMPONENT_MODEL_DIR / f"{stat}.ubj")
+        print(f"💾 Saved {len(boosters)} component models to {config.COMPONENT_MODEL_DIR}")
+        cache_trained_models(boosters, run.run_id)
+
+        run.set_tag("features_used", ", ".join(data.feature_names))
+
 if __name__ == "__main__":
-    train_model()
\ No newline at end of file
+    if config.COMPONENT_MODELS:
+        train_component_models()
+    else:
+        train_model()
\ No newline at end of file
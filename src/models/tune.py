@@ -1,13 +1,11 @@
 import os
 import sys
-import pandas as pd
 import numpy as np
 import xgboost as xgb
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 from sklearn.model_selection import ParameterGrid
-import mlflow
-from mlflow.models.signature import infer_signature
 from dotenv import load_dotenv
+from concurrent.futures import as_completed
 import time
 import warnings
 # Filter out the specific MLflow schema hint and the artifact_path deprecation
@@ -19,107 +17,167 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from src import config
+from src.models import search
+from src.models.dataset import load_training_data, native_params, as_regressor
+from src.instrumentation import stage, log_pending_stages
+from src.models.tracking import Tracker
 
 load_dotenv()
 
-def tune_hyperparameters():
-    print("🚀 Initiating Automated Grid Search...")
-
-    # 1. Setup MLflow Tracking
-    os.environ["MLFLOW_TRACKING_USERNAME"] = os.getenv("MLFLOW_TRACKING_USERNAME")
-    os.environ["MLFLOW_TRACKING_PASSWORD"] = os.getenv("MLFLOW_TRACKING_PASSWORD")
-    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI"))
+# Per-worker view of the training matrix (memory-mapped once per process, never pickled)
+_TRIAL_DATA = None
+
+def plan_parallelism(n_trials):
+    """
+    Splits the CPU cores between concurrent trials and XGBoost threads per trial.
+    Small tables gain little from many threads per fit, so trials come first:
+    as many workers as cores (capped at the trial count), leftovers go to threads.
+    Returns (n_workers, threads_per_trial).
+    """
+    n_cores = config.TUNE_N_JOBS or os.cpu_count() or 1
+
+    if config.TUNE_DEVICE != 'cpu':
+        # One GPU: trials share it one at a time
+        return 1, n_cores
+
+    threads = config.TUNE_THREADS_PER_TRIAL
+    if threads:
+        return max(1, min(n_trials, n_cores // threads)), threads
+
+    workers = max(1, min(n_trials, n_cores))
+    return workers, max(1, n_cores // workers)
+
+def _init_trial_worker():
+    global _TRIAL_DATA
+    _TRIAL_DATA = load_training_data(rebuild_if_stale=False)
+
+def _run_trial(i, params):
+    """Trains and scores one configuration inside a worker. Returns plain results for the parent to log."""
+    data = _TRIAL_DATA
+
+    start_time = time.time()
+    # The training rows are quantized on this worker's first trial and reused by the rest
+    dtrain = data.dmatrix(0, data.split_idx, label=data.y)
+    booster = xgb.train(native_params(params), dtrain, num_boost_round=params['n_estimators'])
     
-    mlflow.set_experiment("02_WNBA_Hyperparameter_Tuning")
+    # Predict & Evaluate
+    y_test = data.y_test
+    preds = booster.inplace_predict(data.X_test)
+    duration = time.time() - start_time
+
+    return {
+        'index': i,
+        'params': params,
+        'mae': mean_absolute_error(y_test, preds),
+        'rmse': np.sqrt(mean_squared_error(y_test, preds)),
+        'duration': duration,
+        'preds': preds,
+        # Raw booster bytes: the parent rebuilds the model for MLflow
+        'booster': bytes(booster.save_raw(raw_format='ubj')),
+    }
 
-    # 2. Load the Golden Table
-    data_path = config.PROCESSED_DATA_DIR / "training_features.csv"
-    df = pd.read_csv(data_path)
-    
-    # CRITICAL: Sort chronologically to perfectly match the baseline test set
-    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'])
-    df = df.sort_values(by='GAME_DATE')
+def tune_hyperparameters():
+    strategy = config.TUNE_STRATEGY
+    print(f"🚀 Initiating Automated Hyperparameter Search (strategy: {strategy})...")
 
-    #3. Define Features (X) and Target (y)
-    # We only drop the metadata, build_features handled the rest
-    drop_cols = ['PLAYER_ID', 'GAME_DATE', 'SEASON', 'FANTASY_PTS']
-    
-    # Drop string columns and target, keep only features the model should see
-    drop_cols = [col for col in drop_cols if col in df.columns]
-    X = df.drop(columns=drop_cols).select_dtypes(include=['number'])
-    y = df['FANTASY_PTS']
-
-    # Ensure all features are floats to silence MLflow integer warnings
-    X = X.astype('float64')
-
-    # 4. Chronological Train-Test Split (80/20)
-    split_idx = int(len(df) * 0.8)
-    X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_test = y.iloc[:split_idx], y.iloc[split_idx:]
-    
-    print(f"📊 Training on {len(X_train)} games, Testing on {len(X_test)} games.")
+    # 1. Setup MLflow Tracking (batched, sent from a background thread)
+    tracker = Tracker("02_WNBA_Hyperparameter_Tuning")
 
-    # 5. Define the Search Grid (27 Combinations)
+    # 2. The shared training matrix: chronologically sorted float32 features,
+    # the same 80/20 split as train.py (built once per Golden Table, memory-mapped)
+    with stage('load') as timer:
+        data = load_training_data()
+        timer.rows_out = len(data)
+    
+    print(f"📊 Training on {data.split_idx} games, Testing on {len(data.X_test)} games.")
+
+    # 3. Search: exhaustive grid, or an adaptive strategy (see src/models/search.py)
+    with tracker:
+        with stage('search', rows_in=data.split_idx):
+            if strategy == 'grid':
+                best_params, best_metrics = run_grid_search(tracker, data)
+            else:
+                best_params, best_metrics = run_adaptive_search(tracker, data)
+
+        # 4. One summary run for the whole search: the winner plus the load/search stage timings
+        # (they finish outside any trial run, so they'd never reach MLflow otherwise)
+        with tracker.start_run(f"{strategy}_search_summary",
+                               tags={"model_type": "xgboost_tune", "search_strategy": strategy}) as run:
+            log_pending_stages()
+            run.log_params(best_params)
+            run.log_metrics(best_metrics)
+
+def run_grid_search(tracker, data):
+    """
+    The exhaustive 27-point grid, trained in a CPU process pool and logged from the parent.
+    Every trial logs params/metrics; only the best TUNE_LOG_TOP_K upload a model.
+    Returns the winner's (params, test metrics).
+    """
+    # Define the Search Grid (27 Combinations)
     param_grid = {
         'learning_rate': [0.01, 0.05, 0.1],
         'max_depth': [3, 5, 7],
         'n_estimators': [50, 100, 200],
         'objective': ['reg:squarederror'],
-        'random_state': [42]
+        'random_state': [config.TUNE_SEED]
     }
     
     grid = list(ParameterGrid(param_grid))
     print(f"🔬 Testing {len(grid)} different hyperparameter combinations...")
 
-    best_mae = float('inf')
-    best_params = None
+    # Split the cores between parallel trials and XGBoost threads
+    n_workers, threads_per_trial = plan_parallelism(len(grid))
+    print(f"⚙️  Running {n_workers} trials at a time x {threads_per_trial} XGBoost threads each ({config.TUNE_DEVICE}).")
 
-    # 6. The Automated Tuning Loop
-    for i, params in enumerate(grid):
-        
-        # Add GPU parameters to every combination
+    for params in grid:
         params.update({
             'tree_method': 'hist',
-            'device': 'cuda'
+            'device': config.TUNE_DEVICE,
+            'n_jobs': threads_per_trial
         })
 
-        start_time = time.time()
-        print(f"🚀 [{i+1}/{len(grid)}] Training with {params}...")
-
-        print(f"Testing combination {i+1}/{len(grid)}: {params}")
-        
-        with mlflow.start_run(run_name=f"grid_search_{i+1}"):
-            mlflow.log_params(params)
-
-            # Train the specific configuration
-            model = xgb.XGBRegressor(**params)
-            model.fit(X_train, y_train)
-            
-            # Predict & Evaluate
-            preds = model.predict(X_test)
-
-            duration = time.time() - start_time
-            mlflow.log_metric("duration_seconds", duration) # Log to DagsHub
-            
-            print(f"✅ Run {i+1} complete in {duration:.2f}s | MAE: {mae:.4f}")
-
-            mae = mean_absolute_error(y_test, preds)
-            rmse = np.sqrt(mean_squared_error(y_test, preds))
-            
-            # Log the results
-            mlflow.log_metric("test_mae", mae)
-            mlflow.log_metric("test_rmse", rmse)
-            mlflow.set_tag("model_type", "xgboost_tune")
-            
-            # log signatures and models
-            signature = infer_signature(X_train, preds)
-            mlflow.xgboost.log_model(model, "model", signature=signature)
-            mlflow.set_tag("features_used", ", ".join(X_train.columns))
-
-            # Track the reigning champion locally
-            if mae < best_mae:
-                best_mae = mae
-                best_params = params
+    results = {}
+    runs = {}
+
+    # The Automated Tuning Loop (workers train, the parent logs to MLflow)
+    with search.trial_pool(n_workers, _init_trial_worker) as pool:
+        futures = [pool.submit(_run_trial, i, params) for i, params in enumerate(grid)]
+
+        for future in as_completed(futures):
+            result = future.result()
+            i, params, mae, rmse = result['index'], result['params'], result['mae'], result['rmse']
+
+            print(f"✅ Run {i+1}/{len(grid)} complete in {result['duration']:.2f}s | MAE: {mae:.4f} | {params}")
+
+            with tracker.start_run(f"grid_search_{i+1}") as run:
+                run.log_params(params)
+                run.log_metric("duration_seconds", result['duration']) # Log to DagsHub
+
+                # Log the results
+                run.log_metrics({"test_mae": mae, "test_rmse": rmse})
+                run.set_tag("model_type", "xgboost_tune")
+                run.set_tag("features_used", ", ".join(data.feature_names))
+
+            # Keep the booster until the ranking is known (no per-trial model upload)
+            results[i] = result
+            runs[i] = run
+
+    # Rank locally (grid order breaks ties, so reruns agree); only the top K log signatures and models
+    import mlflow.xgboost
+    from mlflow.models.signature import infer_signature
+    ranked = sorted(results.values(), key=lambda r: (r['mae'], r['index']))
+    features = data.frame(0, data.split_idx)
+    for rank, result in enumerate(ranked[:config.TUNE_LOG_TOP_K]):
+        run = runs[result['index']]
+        run.set_tag("model_logged", "true")
+        if rank == 0:
+            run.set_tag("search_winner", "true")
+        model = xgb.XGBRegressor()
+        model.load_model(bytearray(result['booster']))
+        signature = infer_signature(features, result['preds'])
+        run.log_model(lambda model=model, signature=signature: mlflow.xgboost.log_model(model, "model", signature=signature))
+
+    best_mae, best_params = ranked[0]['mae'], ranked[0]['params']
 
     print("-" * 30)
     print("🏆 GRID SEARCH COMPLETE!")
@@ -127,6 +185,69 @@ def tune_hyperparameters():
     print(f"🔥 Best XGBoost MAE: {best_mae:.2f}")
     print(f"🔧 Optimal Parameters: {best_params}")
     print("-" * 30)
+    return best_params, {"test_mae": best_mae, "test_rmse": ranked[0]['rmse']}
+
+def run_adaptive_search(tracker, data):
+    """
+    Successive halving ('halving') or TPE with Hyperband pruning ('tpe') over
+    TUNE_SEARCH_SPACE, early-stopped on a chronological validation fold.
+    Every trial is logged; only the winner (best validation MAE) logs a model.
+    Returns the winner's (params, validation/test metrics).
+    """
+    strategy = config.TUNE_STRATEGY
+    n_trials = config.TUNE_N_CANDIDATES if strategy == 'halving' else config.TUNE_TPE_TRIALS
+    n_workers, threads_per_trial = plan_parallelism(n_trials)
+    print(f"🔬 Adaptive search ({strategy}): {n_trials} candidates, up to {config.TUNE_MAX_ROUNDS} boosting rounds each.")
+    print(f"⚙️  Running {n_workers} trials at a time x {threads_per_trial} XGBoost threads each ({config.TUNE_DEVICE}).")
+
+    start_time = time.time()
+    if strategy == 'halving':
+        records = search.successive_halving(data, n_workers, threads_per_trial)
+    elif strategy == 'tpe':
+        records = search.tpe_search(data, n_workers, threads_per_trial)
+    else:
+        raise ValueError(f"❌ Unknown TUNE_STRATEGY '{strategy}'. Use 'grid', 'halving' or 'tpe'.")
+    print(f"⏱️  Search finished in {time.time() - start_time:.1f}s")
+
+    import mlflow.xgboost
+    from mlflow.models.signature import infer_signature
+
+    # Winner by validation MAE (the test split stays out of model selection)
+    scored = [r for r in records if r['booster'] is not None and not np.isnan(r['val_mae'])]
+    best = min(scored, key=lambda r: (r['val_mae'], r['index']))
+
+    for record in records:
+        with tracker.start_run(f"{strategy}_{record['index']+1}") as run:
+            run.log_params(record['params'])
+            if record['n_estimators'] is not None:
+                run.log_param("n_estimators", record['n_estimators'])
+            run.log_metric("duration_seconds", record['duration'])
+            for metric in ['val_mae', 'test_mae', 'test_rmse']:
+                if not np.isnan(record[metric]):
+                    run.log_metric(metric, record[metric])
+            run.set_tag("model_type", "xgboost_tune")
+            run.set_tag("search_strategy", strategy)
+            run.set_tag("trial_status", record['status'])
+            run.set_tag("features_used", ", ".join(data.feature_names))
+
+            if record is best:
+                run.set_tag("search_winner", "true")
+                run.set_tag("model_logged", "true")
+                # Trees past the early-stopping point never reach the logged model
+                booster = xgb.Booster(model_file=bytearray(record['booster']))[:record['n_estimators']]
+                model = as_regressor(booster)
+                signature = infer_signature(data.frame(0, data.split_idx), booster.inplace_predict(data.X_test))
+                run.log_model(lambda model=model, signature=signature: mlflow.xgboost.log_model(model, "model", signature=signature))
+
+    print("-" * 30)
+    print(f"🏆 ADAPTIVE SEARCH ({strategy.upper()}) COMPLETE!")
+    print(f"✨ Best Target to Beat (Baseline): 6.71 MAE")
+    print(f"🔥 Winner Validation MAE: {best['val_mae']:.2f} | Test MAE: {best['test_mae']:.2f}")
+    print(f"🔧 Optimal Parameters: {best['params']} (n_estimators={best['n_estimators']})")
+    print("-" * 30)
+    return {**best['params'], 'n_estimators': best['n_estimators']}, {
+        metric: best[metric] for metric in ['val_mae', 'test_mae', 'test_rmse'] if not np.isnan(best[metric])
+    }
 
 if __name__ == "__main__":
     tune_hyperparameters()
\ No newline at end of file
@@ -0,0 +1,318 @@
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+# Path magic to import from src
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src import config
+from src.data import storage
+
+# Bump to invalidate every stored fingerprint (e.g. when the hashing changes)
+PIPELINE_STATE_VERSION = 1
+
+# Code every stage runs through (besides its own)
+SHARED_CODE = ['src/config.py', 'src/instrumentation.py', 'src/data/storage.py', 'src/data/schema.py']
+
+class Stage:
+    """
+    One pipeline script: what it reads, what it writes, and what it needs to
+    run after. Paths are resolved at call time (lambdas) so they follow config.
+    volatile=True marks stages that pull from the outside world (the loaders):
+    they always run, and only their downstream can be skipped.
+    """
+    def __init__(self, name, script, deps=(), inputs=None, outputs=None, code=(), volatile=False):
+        self.name = name
+        self.script = script
+        self.deps = list(deps)
+        self.inputs = inputs or (lambda: [])
+        self.outputs = outputs or (lambda: [])
+        self.code = [script] + list(code) + SHARED_CODE
+        self.volatile = volatile
+
+def _frame_files(path):
+    """Parquet file + CSV export of a storage.save_frame() table."""
+    base, _ = os.path.splitext(os.fspath(path))
+    return [base + ".parquet", base + ".csv"]
+
+def _gamelog_files():
+    return [storage.gamelog_table()] + sorted(glob.glob(str(config.RAW_DATA_DIR / "wnba_*_gamelogs.csv")))
+
+def _golden_files():
+    return [storage.golden_table(), config.PROCESSED_DATA_DIR / f"{config.GOLDEN_TABLE_NAME}.csv"]
+
+UNRIVALED_RAW = lambda: config.RAW_DATA_DIR / "unrivaled_2025_stats.csv"
+
+STAGES = [
+    Stage('wnba_loader', 'src/data/wnba_loader.py',
+          outputs=_gamelog_files,
+          code=['src/data/fetcher.py'],
+          volatile=True),
+    Stage('unrivaled_loader', 'src/data/unrivaled_loader.py',
+          outputs=lambda: [UNRIVALED_RAW()],
+          volatile=True),
+    Stage('process_unrivaled', 'src/data/process_unrivaled.py',
+          deps=['unrivaled_loader'],
+          inputs=lambda: [UNRIVALED_RAW()],
+          outputs=lambda: _frame_files(config.MERGE_UNRIVALED_SOURCE)),
+    Stage('merge_players', 'src/data/merge_players.py',
+          deps=['wnba_loader', 'process_unrivaled'],
+          inputs=lambda: _gamelog_files() + _frame_files(config.MERGE_UNRIVALED_SOURCE) + [config.MANUAL_OVERRIDES_PATH],
+          outputs=lambda: _frame_files(config.PLAYER_MAP_OUTPUT) + [config.PLAYER_RESOLUTION_STORE],
+          code=['src/data/entity_resolution.py']),
+    Stage('build_features', 'src/features/build_features.py',
+          deps=['wnba_loader'],
+          inputs=lambda: _gamelog_files() + [config.SCORING_DIR],
+          outputs=lambda: _golden_files() + [
+              config.PROCESSED_DATA_DIR / "feature_state.json",
+              config.PROCESSED_DATA_DIR / config.FEATURE_STORE_NAME,
+          ],
+          code=['src/features/*.py']),
+    Stage('evaluate_baseline', 'src/models/evaluate_baseline.py',
+          deps=['build_features'],
+          inputs=_golden_files,
+          code=['src/features/*.py', 'src/models/tracking.py']),
+    Stage('train', 'src/models/train.py',
+          deps=['build_features'],
+          inputs=_golden_files,
+          outputs=lambda: [config.COMPONENT_MODEL_DIR if config.COMPONENT_MODELS else config.SERVE_MODEL_PATH],
+          code=['src/features/scoring.py', 'src/models/dataset.py', 'src/models/compiled.py', 'src/models/tracking.py', 'src/models/model_cache.py']),
+]
+
+# --- FINGERPRINTS ---
+
+class ContentHasher:
+    """
+    md5 of files and directory trees, memoized on (size, mtime) across runs,
+    so unchanged multi-season tables are never re-read.
+    """
+    def __init__(self, cache=None):
+        self.cache = cache or {}
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.cache.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['md5']
+
+        digest = hashlib.md5()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        self.cache[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def path_hash(self, path):
+        """Hash of a file, of every file under a directory (by relative path), or 'missing'."""
+        path = os.fspath(path)
+        if os.path.isfile(path):
+            return self.file_hash(path)
+        if not os.path.isdir(path):
+            return 'missing'
+
+        digest = hashlib.md5()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith('.tmp'):
+                    continue
+                full = os.path.join(root, name)
+                digest.update(f"{os.path.relpath(full, path)}:{self.file_hash(full)};".encode('utf-8'))
+        return digest.hexdigest()
+
+def config_snapshot():
+    """Every UPPERCASE setting in src/config.py, as text (paths, lists, dicts and all)."""
+    return json.dumps(
+        {name: repr(getattr(config, name)) for name in dir(config) if name.isupper()},
+        sort_keys=True,
+    )
+
+def stage_fingerprint(stage, hasher):
+    """Hash of the stage's code, the whole config and the contents of its inputs."""
+    digest = hashlib.md5(f"{PIPELINE_STATE_VERSION}:{stage.name};".encode('utf-8'))
+    for pattern in stage.code:
+        for path in sorted(glob.glob(os.path.join(project_root, pattern))):
+            digest.update(f"code:{os.path.relpath(path, project_root)}:{hasher.file_hash(path)};".encode('utf-8'))
+    digest.update(config_snapshot().encode('utf-8'))
+    for path in stage.inputs():
+        digest.update(f"input:{os.fspath(path)}:{hasher.path_hash(path)};".encode('utf-8'))
+    return digest.hexdigest()
+
+def output_hashes(stage, hasher):
+    return {os.fspath(path): hasher.path_hash(path) for path in stage.outputs()}
+
+# --- STATE ---
+
+def load_pipeline_state():
+    if not os.path.exists(config.PIPELINE_STATE_PATH):
+        return {'version': PIPELINE_STATE_VERSION, 'stages': {}, 'hash_cache': {}}
+    with open(config.PIPELINE_STATE_PATH, 'r') as file:
+        state = json.load(file)
+    if state.get('version') != PIPELINE_STATE_VERSION:
+        return {'version': PIPELINE_STATE_VERSION, 'stages': {}, 'hash_cache': {}}
+    return state
+
+def save_pipeline_state(state):
+    os.makedirs(os.path.dirname(config.PIPELINE_STATE_PATH), exist_ok=True)
+    tmp_path = f"{config.PIPELINE_STATE_PATH}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, config.PIPELINE_STATE_PATH)
+
+# --- RUNNER ---
+
+def _run_script(stage):
+    """Runs one stage's script in its own process, its output captured to a log file."""
+    os.makedirs(config.PIPELINE_LOG_DIR, exist_ok=True)
+    log_path = config.PIPELINE_LOG_DIR / f"{stage.name}.log"
+    start_time = time.perf_counter()
+    with open(log_path, 'w') as log:
+        result = subprocess.run([sys.executable, os.path.join(project_root, stage.script)],
+                                cwd=project_root, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start_time, log_path
+
+def select_stages(targets=None):
+    """The requested stages plus everything upstream of them, in declaration order."""
+    by_name = {stage.name: stage for stage in STAGES}
+    if not targets:
+        return list(STAGES)
+
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise ValueError(f"❌ Unknown stages: {sorted(unknown)}. Choose from {list(by_name)}.")
+    needed, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in needed:
+            needed.add(name)
+            todo.extend(by_name[name].deps)
+    return [stage for stage in STAGES if stage.name in needed]
+
+def run_pipeline(targets=None, force=False, skip_volatile=False, dry_run=False, workers=None):
+    """
+    Runs the stage DAG. A stage starts once all of its deps are finished and
+    is skipped when its fingerprint (code + config + input contents) matches
+    the last successful run and its outputs are untouched. Independent
+    branches (WNBA vs Unrivaled) run side by side.
+    Returns {stage name: 'ran' | 'skipped' | 'failed' | 'blocked'}.
+    """
+    stages = select_stages(targets)
+    selected = {stage.name for stage in stages}
+    state = load_pipeline_state()
+    hasher = ContentHasher(state.get('hash_cache'))
+    workers = workers or config.PIPELINE_WORKERS
+
+    status = {}
+    pending = list(stages)
+    running = {}
+
+    def ready(stage):
+        return all(status.get(dep) in ('ran', 'skipped') for dep in stage.deps if dep in selected)
+
+    def blocked(stage):
+        return any(status.get(dep) in ('failed', 'blocked') for dep in stage.deps if dep in selected)
+
+    def up_to_date(stage, fingerprint):
+        record = state['stages'].get(stage.name)
+        return (record is not None
+                and record['fingerprint'] == fingerprint
+                and record['outputs'] == output_hashes(stage, hasher))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # 1. Settle every stage whose deps are done: skip it, or launch it
+            settled = len(pending)
+            for stage in list(pending):
+                if blocked(stage):
+                    status[stage.name] = 'blocked'
+                    pending.remove(stage)
+                    print(f"⛔ {stage.name}: blocked by a failed upstream stage")
+                    continue
+                if not ready(stage):
+                    continue
+                pending.remove(stage)
+
+                if stage.volatile and skip_volatile:
+                    status[stage.name] = 'skipped'
+                    print(f"⏭️  {stage.name}: external source, skipped (--no-ingest)")
+                    continue
+
+                fingerprint = stage_fingerprint(stage, hasher)
+                if not force and not stage.volatile and up_to_date(stage, fingerprint):
+                    status[stage.name] = 'skipped'
+                    print(f"✅ {stage.name}: up to date")
+                    continue
+
+                if dry_run:
+                    # Pretend it ran so the rest of the plan unfolds
+                    status[stage.name] = 'ran'
+                    print(f"📝 {stage.name}: would run")
+                    continue
+
+                print(f"▶️  {stage.name}: running...")
+                running[pool.submit(_run_script, stage)] = (stage, fingerprint)
+
+            if not running:
+                if len(pending) == settled and pending:
+                    raise RuntimeError(f"❌ Stages can never start (dependency cycle?): {[s.name for s in pending]}")
+                continue
+
+            # 2. Wait for the next stage to finish and record it
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, fingerprint = running.pop(future)
+                returncode, duration, log_path = future.result()
+                if returncode != 0:
+                    status[stage.name] = 'failed'
+                    print(f"❌ {stage.name}: failed after {duration:.1f}s (exit {returncode}). Log: {log_path}")
+                    continue
+
+                status[stage.name] = 'ran'
+                state['stages'][stage.name] = {
+                    'fingerprint': fingerprint,
+                    'outputs': output_hashes(stage, hasher),
+                    'finished_at': datetime.now().isoformat(timespec='seconds'),
+                    'duration_s': round(duration, 3),
+                }
+                state['hash_cache'] = hasher.cache
+                save_pipeline_state(state)
+                print(f"🏁 {stage.name}: done in {duration:.1f}s. Log: {log_path}")
+
+    state['hash_cache'] = hasher.cache
+    if not dry_run:
+        save_pipeline_state(state)
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the WNBA pipeline, skipping stages whose inputs haven't changed.")
+    parser.add_argument('stages', nargs='*', help="Target stages (their upstream comes along). Default: all.")
+    parser.add_argument('--force', action='store_true', help="Ignore fingerprints and run every selected stage")
+    parser.add_argument('--no-ingest', action='store_true', help="Don't hit the WNBA/Unrivaled sites; use the data on disk")
+    parser.add_argument('--dry-run', action='store_true', help="Only show what would run")
+    parser.add_argument('--workers', type=int, default=None, help="Stages run at once (default: PIPELINE_WORKERS)")
+    args = parser.parse_args()
+
+    print("🚀 Starting the WNBA pipeline...")
+    start_time = time.perf_counter()
+    status = run_pipeline(args.stages, force=args.force, skip_volatile=args.no_ingest,
+                          dry_run=args.dry_run, workers=args.workers)
+
+    counts = {outcome: sum(1 for s in status.values() if s == outcome) for outcome in ('ran', 'skipped', 'failed', 'blocked')}
+    print("-" * 30)
+    print(f"📊 {counts['ran']} ran, {counts['skipped']} skipped, {counts['failed']} failed, "
+          f"{counts['blocked']} blocked in {time.perf_counter() - start_time:.1f}s")
+    if counts['failed'] or counts['blocked']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()